@@ -1,6 +1,9 @@
 import sys
 
-from integration_tests.tracking.tracker_integration_test import TrackerTest
+from integration_tests.tracking.map_contention_benchmark import MapContentionBenchmark
+from integration_tests.tracking.tracker_benchmark import TrackerBenchmarkSuite
+from integration_tests.airmar.nmea_parser_benchmark import NmeaParserBenchmark
+from integration_tests.airmar.pipeline_benchmark import AirmarPipelineBenchmark
 #from integration_tests.controls.controls_integration_test import ControlsTest
 
 if __name__ == "__main__":
@@ -9,6 +12,16 @@ if __name__ == "__main__":
     if test_type == 'controls':
         integration_test = ControlsTest()
     elif test_type == 'tracker':
+        # imported here as it sets up a Qt matplotlib backend (not needed by headless benchmarks)
+        from integration_tests.tracking.tracker_integration_test import TrackerTest
         integration_test = TrackerTest()
+    elif test_type == 'map_contention':
+        integration_test = MapContentionBenchmark()
+    elif test_type == 'tracker_benchmark':
+        integration_test = TrackerBenchmarkSuite(sys.argv[2:])
+    elif test_type == 'nmea_parser_benchmark':
+        integration_test = NmeaParserBenchmark(sys.argv[2:])
+    elif test_type == 'airmar_pipeline_benchmark':
+        integration_test = AirmarPipelineBenchmark(sys.argv[2:])
 
     integration_test.run()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+from time import perf_counter
+
+import parse
+
+from src.airmar.airmar_exceptions import InvalidSentenceException
+from src.airmar.nmeaparser.nmea_parser import NmeaParser
+
+STREAM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'airmar_stream.nmea')
+
+class LegacyNmeaParser(NmeaParser):
+    """ NmeaParser.parse as implemented with the parse library, kept as the benchmark baseline """
+
+    def parse(self, sentence, separator=','):
+        parsed = parse.parse(self.nmea_format, sentence)
+        if parsed is None:
+            raise InvalidSentenceException()
+
+        body = parsed[0]
+        checksum = parsed[1]
+        if self.checksum(body) == checksum:
+            return [None if field == '' else field for field in body.split(separator)]
+        raise InvalidSentenceException() # Chksum did not match
+
+    def checksum(self, sentence):
+        checksum = 0
+        # XOR all characters in string
+        for c in sentence:
+            checksum = checksum ^ ord(c)
+
+        return '{:02x}'.format(checksum).upper()
+
+
+class NmeaParserBenchmark():
+    """
+    Parses a recorded Airmar stream with the current parser and the parse library baseline, checks that both return
+    the same fields (and reject the same sentences) and reports time per sentence.
+    """
+
+    def __init__(self, argv=None):
+        """Initializes nmea parser benchmark
+        Inputs:
+            argv -- command line arguments (defaults to sys.argv[1:])
+        """
+        parser = argparse.ArgumentParser(description='Benchmarks NmeaParser.parse on a recorded Airmar stream')
+        parser.add_argument('--stream', default=STREAM_PATH, help='file of nmea sentences, one per line')
+        parser.add_argument('--repeat', type=int, default=20, help='number of passes over stream')
+        self.args = parser.parse_args(argv)
+
+    def run(self):
+        """Runs benchmark and prints results as json"""
+        with open(self.args.stream, 'r', newline='') as stream:
+            sentences = stream.readlines()
+
+        parsers = {'parse_library': LegacyNmeaParser(), 'fast_path': NmeaParser()}
+        outputs = {name: [self._parse(parser, sentence) for sentence in sentences]
+                   for name, parser in parsers.items()}
+        mismatches = sum(1 for old, new in zip(outputs['parse_library'], outputs['fast_path']) if old != new)
+
+        results = {'sentences': len(sentences), 'repeat': self.args.repeat, 'mismatches': mismatches,
+                   'invalid': sum(1 for fields in outputs['fast_path'] if fields is None)}
+        for name, parser in parsers.items():
+            start = perf_counter()
+            for _ in range(self.args.repeat):
+                for sentence in sentences:
+                    self._parse(parser, sentence)
+            elapsed = perf_counter() - start
+            results[name] = {'us_per_sentence': 1e6 * elapsed / (self.args.repeat * len(sentences)),
+                             'sentences_per_s': self.args.repeat * len(sentences) / elapsed}
+        results['speedup'] = results['parse_library']['us_per_sentence'] / results['fast_path']['us_per_sentence']
+
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return results
+
+    @staticmethod
+    def _parse(parser, sentence):
+        """Returns parsed fields, or None if sentence is invalid"""
+        try:
+            return parser.parse(sentence)
+        except InvalidSentenceException:
+            return None
+
+
+if __name__ == '__main__':
+    NmeaParserBenchmark().run()
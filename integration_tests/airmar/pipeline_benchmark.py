@@ -0,0 +1,108 @@
+import argparse
+import json
+import sys
+from time import perf_counter
+
+from pubsub import pub
+
+from integration_tests.airmar.nmea_parser_benchmark import STREAM_PATH
+from src.airmar.airmar_receiver import AirmarReceiver
+from src.broadcaster.broadcaster import BroadcasterType, make_broadcaster
+from src.hardware.capture import ReplayDevice, read_capture
+from src.utils.clock import SimulatedClock, set_clock
+from tests.mock_bbio import Adafruit_BBIO
+
+
+class LogCounter():
+    """Counts messages the receiver would log"""
+
+    def __init__(self):
+        self.messages = 0
+
+    def write_msg(self, author, msg):
+        self.messages += 1
+
+
+class AirmarPipelineBenchmark():
+    """
+    Replays an airmar capture through AirmarReceiver -> NmeaParser -> AirmarProcessor -> pubsub as fast as possible
+    and reports throughput and how many times faster than real time the pipeline runs. A simulated clock follows the
+    capture's timestamps, so publish intervals merge sentences as they would have live.
+    """
+
+    def __init__(self, argv=None):
+        """Initializes pipeline benchmark
+        Inputs:
+            argv -- command line arguments (defaults to sys.argv[1:])
+        """
+        parser = argparse.ArgumentParser(description='Benchmarks airmar pipeline on a replayed capture')
+        parser.add_argument('--capture', help='capture file recorded by a RECORD port (defaults to the sample '
+                                              'airmar stream at one burst of sentences per second)')
+        parser.add_argument('--repeat', type=int, default=20, help='number of passes over capture')
+        parser.add_argument('--publish-interval', type=float, default=0.)
+        self.args = parser.parse_args(argv)
+
+    def run(self):
+        """Runs benchmark and prints results as json"""
+        records = read_capture(self.args.capture) if self.args.capture else self._sample_records()
+        duration = records[-1][0] - records[0][0] if records else 0.
+
+        messages = [0]
+        def count_message(topicObj=pub.AUTO_TOPIC, **msgData):
+            messages[0] += 1
+        pub.subscribe(count_message, pub.ALL_TOPICS)
+
+        logger = LogCounter()
+        receiver = None
+        elapsed = 0.
+        clock = SimulatedClock()
+        prev_clock = set_clock(clock)
+        try:
+            for _ in range(self.args.repeat):
+                device = ReplayDevice(speed=0, records=records)
+                receiver = AirmarReceiver(broadcaster=make_broadcaster(BroadcasterType.Messenger), logger=logger,
+                                          mock_bbio=Adafruit_BBIO, mock_port=device)
+                receiver.processor.publish_interval = self.args.publish_interval
+                receiver.port.open()
+
+                start = perf_counter()
+                while not device.finished:
+                    clock.set_time(records[device.index][0])
+                    receiver.drain_airmar_data()
+                receiver.processor.flush(force=True)
+                elapsed += perf_counter() - start
+        finally:
+            set_clock(prev_clock)
+            pub.unsubscribe(count_message, pub.ALL_TOPICS)
+
+        sentences = receiver.sentences_read * self.args.repeat if receiver else 0
+        results = {'sentences': sentences, 'capture_s': duration * self.args.repeat, 'elapsed_s': elapsed,
+                   'sentences_per_s': sentences / max(elapsed, 1e-12),
+                   'times_real_time': duration * self.args.repeat / max(elapsed, 1e-12),
+                   'messages_published': messages[0], 'messages_per_sentence': messages[0] / max(sentences, 1),
+                   'sentences_logged': logger.messages}
+
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return results
+
+    @staticmethod
+    def _sample_records():
+        """Returns sample airmar stream as capture records, one read per burst of sentences each second"""
+        with open(STREAM_PATH, 'rb') as stream:
+            lines = stream.readlines()
+
+        records, burst = [], []
+        for line in lines:
+            # each burst starts with a GPGGA fix
+            if line.startswith(b"$GPGGA") and burst:
+                records.append((float(len(records)), b"".join(burst)))
+                burst = []
+            burst.append(line)
+        if burst:
+            records.append((float(len(records)), b"".join(burst)))
+        return records
+
+
+if __name__ == '__main__':
+    AirmarPipelineBenchmark().run()
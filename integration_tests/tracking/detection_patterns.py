@@ -0,0 +1,161 @@
+from random import Random
+
+from src.tracking.classification_types import ObjectType
+
+# patterns: static, circle_CCW, circle_CW, circle_CCW_radial_out, circle_CW_radial_out, radial_out
+PATTERN_NAMES = ['static', 'circle_CCW', 'circle_CW', 'circle_CCW_radial_out', 'circle_CW_radial_out', 'radial_out']
+PATTERN_RNG_RATES = [0, 0, 0, 0.05, 0.05, 0.075]
+PATTERN_BEARING_RATES = [0, 0.0375, -0.0375, 0.025, -0.025, 0]
+
+class DetectionPatterns():
+    """
+    Generates moving detections for tracker tests. Detections follow the static, circling and radial-out patterns
+    (assigned round robin), and frames can be trimmed to a look aperture that sweeps back and forth.
+    """
+
+    def __init__(self, num_detections=18, frame_bounds=[(10, 175), (-180, 180)], seed=None):
+        """Initializes detection patterns
+        Inputs:
+            num_detections -- number of detections to create
+            frame_bounds -- range and bearing bounds to spawn detections within
+            seed -- seed of random number generator (None for unseeded)
+        """
+        self.random = Random(seed)
+        self.frame_bounds = frame_bounds
+
+        # rates of each detection (patterns repeat every len(PATTERN_NAMES) detections)
+        self.rng_rate_list = [PATTERN_RNG_RATES[ii % len(PATTERN_NAMES)] for ii in range(num_detections)]
+        self.bearing_rate_list = [PATTERN_BEARING_RATES[ii % len(PATTERN_NAMES)] for ii in range(num_detections)]
+
+        # set look frame parameters
+        self.look_frame = 'aperture'     #'full'
+        self.look_rng = (0, 150)        # initial (and perm) range range of look aperture
+        self.look_bearing = (-70, 70)   # initial bearing range of look aperture
+        self.look_sweep = (-30, 30)     # sweeps so that the center of the aperture goes between these two points
+        self.pan_direction = 1          # direction of pan (+1 = CW, -1 = CCW)
+
+        # detection parameters
+        self.detect_mode = 'regular' #'constant' #'random'
+        self.detect_probability = 0.6
+
+        self.spawn_detections(num_detections)
+
+    def spawn_detections(self, n_dets):
+        """
+        Creates n_dets random detections
+        Inputs:
+            n_dets -- number of detections to create
+        Side Effects:
+            self.epoch_frame -- set to new detections (rng, bearing, type)
+        """
+        # initialize epoch frame
+        epoch_frame = [0] * n_dets
+
+        # generate random detections
+        for ii in range(n_dets):
+            rand_rng = self.random.uniform(*self.frame_bounds[0])
+            rand_bearing = self.random.uniform(*self.frame_bounds[1])
+            rand_type = ObjectType(self.random.randint(0, 2))
+
+            # place in epoch_frame
+            epoch_frame[ii] = (rand_rng, rand_bearing, rand_type)
+
+        # save off epoch_frame
+        self.epoch_frame = epoch_frame
+
+    def move_detections(self, dt):
+        """
+        Moves detections along their patterns by dt seconds (plus small random deltas)
+        Inputs:
+            dt -- time (in s) since detections were last moved
+        Side Effects:
+            self.epoch_frame -- updated with moved detections
+        """
+        # loop through detections
+        for ii in range(len(self.epoch_frame)):
+            # get rng and bearing rate
+            rng_rate, bearing_rate = self.rng_rate_list[ii], self.bearing_rate_list[ii]
+
+            # adjust bearing rate based on distance from origin
+            bearing_rate /= 0.5 * self.epoch_frame[ii][0]
+
+            # generate deltas
+            rand_dr = self.random.uniform(-0.01, 0.01)
+            rand_dtheta = self.random.uniform(-0.001, 0.001)
+
+            dr = (rand_dr + rng_rate) * dt
+            dtheta = (rand_dtheta + bearing_rate) * dt
+
+            # fix wraparound
+            theta = self.epoch_frame[ii][1] + dtheta
+            rng = self.epoch_frame[ii][0] + dr
+            if theta > 180:
+                theta = -180 + (theta % 180)
+
+            if rng < 0:
+                rng *= -1
+                theta %= -180
+
+            # update detection with deltas
+            self.epoch_frame[ii] = (rng, theta, self.epoch_frame[ii][2])
+
+    def visible_frame(self, send_counter=0):
+        """
+        Returns detections seen this frame
+        Inputs:
+            send_counter -- frame counter used by 'regular' detect mode (detections sent when 0)
+        Returns:
+            epoch_frame -- list of detections (rng, bearing, type) in look aperture that were detected
+        """
+        idx_list = [1] * len(self.epoch_frame)
+
+        # trim epoch frame to objects in view look aperture
+        for ii, obj in enumerate(self.epoch_frame):
+            if not self.in_view(obj):
+                idx_list[ii] = 0
+
+        if self.detect_mode == 'random':
+            # trim epoch frame using randint (to determine whether or not to send data)
+            for ii in range(len(idx_list)):
+                if self.random.randint(0, 9) >= (self.detect_probability * 10):
+                    idx_list[ii] = 0
+
+        elif self.detect_mode == 'regular':
+            if send_counter != 0:
+                idx_list = [0] * len(idx_list)
+
+        elif self.detect_mode == 'constant':
+            pass
+
+        return [obj for (ii, obj) in zip(idx_list, self.epoch_frame) if ii == 1]
+
+    def in_view(self, det):
+        """
+        Returns whether detection is within look aperture (always True for 'full' look frame)
+        Inputs:
+            det -- detection (rng, bearing, type)
+        """
+        if self.look_frame != 'aperture':
+            return True
+
+        return self.look_rng[0] <= det[0] <= self.look_rng[1] and self.look_bearing[0] <= det[1] <= self.look_bearing[1]
+
+    def pan_aperture(self):
+        """
+        Pans look aperture
+        Side effects:
+            self.look_bearing -- pans look bearing (at 0.5 deg per step)
+        """
+        bearing_rate = 0.5
+        aperture_center = sum(self.look_bearing) / 2.
+        new_ap_center = aperture_center + (bearing_rate * self.pan_direction)
+
+        if new_ap_center > self.look_sweep[1]:
+            new_ap_center = self.look_sweep[1] - (new_ap_center % self.look_sweep[1])
+            self.pan_direction *= -1
+        elif new_ap_center < self.look_sweep[0]:
+            new_ap_center = self.look_sweep[0] - (new_ap_center % self.look_sweep[0])
+            self.pan_direction *= -1
+
+        diff = new_ap_center - aperture_center
+        self.look_bearing = tuple(bear + diff for bear in self.look_bearing[:])
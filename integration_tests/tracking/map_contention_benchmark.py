@@ -0,0 +1,137 @@
+import argparse
+from random import uniform, randint, seed
+from threading import Thread, Lock, Event
+from time import perf_counter, sleep
+
+import numpy as np
+
+from src.tracking.map import Map
+from src.tracking.classification_types import ObjectType
+
+_global_mutex = Lock()
+
+class GlobalLockMap(Map):
+    """
+    Map using the old concurrency model: every Map in the process shares one module-level lock, and readers
+    take that lock and read the live object list.
+    """
+    def __init__(self, boat, toggle_update):
+        super().__init__(boat, toggle_update)
+        self.lock = _global_mutex
+
+    def return_objects(self, bearingRange=[-30,30], timeRange=[0,5000], rngRange=None):
+        self.lock.acquire()
+        object_list = self._return_full_objects(bearingRange, timeRange, rngRange)
+        return_list = [(obj.rng, obj.bearing, obj.objectType, obj.rngRate, obj.bearingRate, obj.confidence)
+                        for obj in object_list]
+        self.lock.release()
+
+        return return_list
+
+
+class BenchmarkBoat():
+    """Stand-in for boat used by map (constant speed)"""
+    def current_speed(self):
+        return 5
+
+
+class MapContentionBenchmark():
+    """
+    Measures how long planner-style readers wait on maps while kalman/smoothing writers run. Each map gets one writer
+    thread (predict, smooth frame, prune in a loop) and several reader threads calling return_objects.
+    """
+    def __init__(self, duration=2., num_maps=2, num_readers=2, num_tracks=50, read_interval=0.001):
+        """Initializes contention benchmark
+        Inputs:
+            duration -- time (in s) to run each model for
+            num_maps -- number of maps running in the process
+            num_readers -- number of reader threads per map
+            num_tracks -- number of detections in each frame
+            read_interval -- time (in s) each reader sleeps between reads
+        """
+        self.duration = duration
+        self.num_maps = num_maps
+        self.num_readers = num_readers
+        self.num_tracks = num_tracks
+        self.read_interval = read_interval
+
+    def run(self):
+        """Runs benchmark for both concurrency models and prints results"""
+        results = {}
+        for name, map_type in (('global lock', GlobalLockMap), ('snapshot', Map)):
+            seed(0)
+            results[name] = self.run_model(map_type)
+
+        print('{:<12} {:>12} {:>12} {:>12} {:>12} {:>14}'.format('model', 'reads/s', 'p50 (us)', 'p99 (us)',
+                                                                'max (us)', 'writes/s'))
+        for name, result in results.items():
+            print('{:<12} {:>12.0f} {:>12.1f} {:>12.1f} {:>12.1f} {:>14.1f}'.format(name, *result))
+
+        return results
+
+    def run_model(self, map_type):
+        """
+        Runs readers and writers against maps of given type
+        Inputs:
+            map_type -- Map class to benchmark
+        Returns:
+            result -- reads per second, p50/p99/max read latency (in us), and write cycles per second
+        """
+        maps = [map_type(BenchmarkBoat(), False) for ii in range(self.num_maps)]
+        stop = Event()
+        read_latencies = [[] for ii in range(self.num_maps * self.num_readers)]
+        write_counts = [0] * self.num_maps
+
+        def write(ii, tracker):
+            frame = self._make_frame()
+            while not stop.is_set():
+                tracker.update_map()
+                tracker.smooth_frame(frame, [(0, 200), (-180, 180)])
+                tracker.prune_objects()
+                frame = self._jitter_frame(frame)
+                write_counts[ii] += 1
+
+        def read(latencies, tracker):
+            while not stop.is_set():
+                start = perf_counter()
+                tracker.return_objects(bearingRange=[-180, 180], rngRange=[0, 200])
+                latencies.append(perf_counter() - start)
+                sleep(self.read_interval)
+
+        threads = [Thread(target=write, args=(ii, tracker)) for ii, tracker in enumerate(maps)]
+        threads += [Thread(target=read, args=(read_latencies[ii], maps[ii % self.num_maps]))
+                    for ii in range(len(read_latencies))]
+
+        for thread in threads:
+            thread.start()
+        stop.wait(self.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        latencies = np.concatenate([np.array(latency_list) for latency_list in read_latencies]) * 1e6
+        if latencies.size == 0:
+            latencies = np.zeros(1)
+
+        return (latencies.size / self.duration, np.percentile(latencies, 50), np.percentile(latencies, 99),
+                latencies.max(), sum(write_counts) / self.duration)
+
+    def _make_frame(self):
+        """Creates frame of random detections"""
+        return [(uniform(10, 175), uniform(-180, 180), ObjectType(randint(0, 2))) for ii in range(self.num_tracks)]
+
+    def _jitter_frame(self, frame):
+        """Moves detections in frame by small random amounts"""
+        return [(rng + uniform(-0.5, 0.5), bearing + uniform(-0.5, 0.5), obj_type) for rng, bearing, obj_type in frame]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares map read latency under global lock and snapshot models')
+    parser.add_argument('--duration', type=float, default=2.)
+    parser.add_argument('--maps', type=int, default=2)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--tracks', type=int, default=50)
+    parser.add_argument('--read-interval', type=float, default=0.001)
+    args = parser.parse_args()
+
+    MapContentionBenchmark(args.duration, args.maps, args.readers, args.tracks, args.read_interval).run()
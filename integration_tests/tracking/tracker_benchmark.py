@@ -0,0 +1,275 @@
+import argparse
+import json
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+import numpy as np
+
+from integration_tests.tracking.detection_patterns import DetectionPatterns
+from integration_tests.tracking.map_contention_benchmark import BenchmarkBoat
+from src.tracking.map import Map
+from src.tracking.object import Object
+from src.utils.clock import SimulatedClock, set_clock
+
+STAGES = ['smooth_frame', 'update_map', 'prune_objects']     # same order as detections arriving between map cycles
+
+class TrackerBenchmark():
+    """
+    Headless tracker benchmark. Drives Map.smooth_frame, update_map and prune_objects with the integration test's
+    detection patterns on a simulated clock (so frames run as fast as the tracker allows) and reports throughput,
+    per stage latency, per frame memory use and track accuracy against the true detection positions.
+    """
+
+    def __init__(self, num_detections=18, num_frames=500, frame_interval=0.25, look_frame='aperture',
+                 detect_mode='regular', match_distance=5., seed=0, trace_allocations=True, num_tracks=0):
+        """Initializes tracker benchmark
+        Inputs:
+            num_detections -- number of true objects generating detections
+            num_tracks -- number of background tracks (never detected) kept in map on top of tracks of true objects
+            num_frames -- number of frames to run
+            frame_interval -- simulated time (in s) between frames
+            look_frame -- 'aperture' (sweeping look aperture) or 'full'
+            detect_mode -- 'regular' (every 4th frame), 'random' or 'constant'
+            match_distance -- distance (in m) within which a track counts as tracking a true object
+            seed -- seed of detection generator
+            trace_allocations -- also run frames under tracemalloc to measure memory use per frame
+        """
+        self.num_detections = num_detections
+        self.num_tracks = num_tracks
+        self.num_frames = num_frames
+        self.frame_interval = frame_interval
+        self.look_frame = look_frame
+        self.detect_mode = detect_mode
+        self.match_distance = match_distance
+        self.seed = seed
+        self.trace_allocations = trace_allocations
+
+    def run(self):
+        """
+        Runs benchmark
+        Returns:
+            results -- dict of config, fps, stage latencies, memory use and accuracy (json serializable)
+        """
+        results = {'config': {'num_detections': self.num_detections, 'num_tracks': self.num_tracks,
+                              'num_frames': self.num_frames,
+                              'frame_interval': self.frame_interval, 'look_frame': self.look_frame,
+                              'detect_mode': self.detect_mode, 'match_distance': self.match_distance,
+                              'seed': self.seed}}
+
+        stage_times, accuracy = self._run_frames(trace=False)
+        frame_times = np.sum([stage_times[stage] for stage in STAGES], axis=0)
+
+        results['fps'] = len(frame_times) / max(frame_times.sum(), 1e-12)
+        results['stages'] = {stage: self._latency_stats(stage_times[stage]) for stage in STAGES}
+        results['stages']['frame'] = self._latency_stats(frame_times)
+        results['accuracy'] = accuracy
+
+        if self.trace_allocations:
+            # tracing slows every allocation, so memory use comes from a second (identical) run
+            results['allocations'] = self._run_frames(trace=True)
+
+        return results
+
+    def _run_frames(self, trace):
+        """
+        Runs frames through a new map
+        Inputs:
+            trace -- True to measure memory use instead of latency
+        Returns:
+            stage_times, accuracy -- per frame stage times (in s) and accuracy stats (if not trace)
+            allocations -- memory stats (if trace): blocks and bytes each frame adds to traced memory (snapshot
+                           diff across the frame), the same diff over the whole run divided by the frame count, and
+                           peak traced bytes of the run
+        """
+        clock = SimulatedClock(start=1000.)
+        prev_clock = set_clock(clock)
+        try:
+            patterns = DetectionPatterns(self.num_detections, seed=self.seed)
+            patterns.look_frame = self.look_frame
+            patterns.detect_mode = self.detect_mode
+            tracker = Map(BenchmarkBoat(), False)
+            background = Random(self.seed)
+            background_tracks = set()
+
+            stage_times = {stage: np.zeros(self.num_frames) for stage in STAGES}
+            errors, coverage, false_tracks, num_tracks = [], [], [], []
+            frame_blocks, frame_bytes = [], []
+
+            if trace:
+                tracemalloc.start()
+                run_snapshot = self._snapshot()
+
+            for ii in range(self.num_frames):
+                clock.advance(self.frame_interval)
+                patterns.move_detections(self.frame_interval)
+                epoch_frame = patterns.visible_frame(ii % 4)
+                self._add_background_tracks(tracker, patterns, background, background_tracks)
+
+                if trace:
+                    frame_snapshot = self._snapshot()
+
+                start = perf_counter()
+                tracker.smooth_frame(epoch_frame, patterns.frame_bounds)
+                smoothed = perf_counter()
+                tracker.update_map()
+                predicted = perf_counter()
+                tracker.prune_objects()
+                pruned = perf_counter()
+
+                if trace:
+                    blocks, size = self._snapshot_diff(frame_snapshot, self._snapshot())
+                    frame_blocks.append(blocks)
+                    frame_bytes.append(size)
+                else:
+                    stage_times['smooth_frame'][ii] = smoothed - start
+                    stage_times['update_map'][ii] = predicted - smoothed
+                    stage_times['prune_objects'][ii] = pruned - predicted
+
+                    truth = [det for det in patterns.epoch_frame if patterns.in_view(det)]
+                    tracks = [obj for obj in tracker.object_list if id(obj) not in background_tracks]
+                    frame_accuracy = self._match_tracks(truth, tracks)
+                    if frame_accuracy[0] is not None:
+                        errors.append(frame_accuracy[0])
+                    coverage.append(frame_accuracy[1])
+                    false_tracks.append(frame_accuracy[2])
+                    num_tracks.append(len(tracks))
+
+                patterns.pan_aperture()
+
+            if trace:
+                run_blocks, run_bytes = self._snapshot_diff(run_snapshot, self._snapshot())
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            if trace:
+                tracemalloc.stop()
+            set_clock(prev_clock)
+
+        if trace:
+            return {'blocks_per_frame_p50': float(np.percentile(frame_blocks, 50)),
+                    'blocks_per_frame_max': float(np.max(frame_blocks)),
+                    'bytes_per_frame_p50': float(np.percentile(frame_bytes, 50)),
+                    'bytes_per_frame_max': float(np.max(frame_bytes)),
+                    'run_blocks_per_frame': run_blocks / self.num_frames,
+                    'run_bytes_per_frame': run_bytes / self.num_frames,
+                    'run_peak_bytes': peak_bytes}
+
+        accuracy = {'mean_position_error_m': float(np.mean(errors)) if errors else None,
+                    'coverage': float(np.mean(coverage)),
+                    'false_tracks_mean': float(np.mean(false_tracks)),
+                    'tracks_mean': float(np.mean(num_tracks))}
+
+        return stage_times, accuracy
+
+    def _match_tracks(self, truth, object_list):
+        """
+        Matches tracks to true object positions
+        Inputs:
+            truth -- list of true detections (rng, bearing, type) in view
+            object_list -- list of tracks in map
+        Returns:
+            mean_error -- mean distance (in m) from each tracked true object to its nearest track (None if none tracked)
+            coverage -- fraction of true objects with a track within match distance
+            false_tracks -- number of tracks not within match distance of any true object
+        """
+        if len(truth) == 0:
+            return None, 1., len(object_list)
+        if len(object_list) == 0:
+            return None, 0., 0
+
+        truth_xy = self._to_cartesian([det[0] for det in truth], [det[1] for det in truth])
+        track_xy = self._to_cartesian([obj.rng for obj in object_list], [obj.bearing for obj in object_list])
+        dists = np.linalg.norm(truth_xy[:, None, :] - track_xy[None, :, :], axis=2)
+
+        nearest_track = dists.min(axis=1)
+        tracked = nearest_track <= self.match_distance
+        mean_error = float(nearest_track[tracked].mean()) if tracked.any() else None
+
+        false_tracks = int(np.sum(dists.min(axis=0) > self.match_distance))
+
+        return mean_error, float(tracked.mean()), false_tracks
+
+    def _add_background_tracks(self, tracker, patterns, background, background_tracks):
+        """
+        Tops map up to num_tracks background tracks (background tracks pruned in the last frame are replaced)
+        Inputs:
+            tracker -- map to add tracks to
+            patterns -- detection patterns (background tracks are spawned within their frame bounds)
+            background -- random number generator of background track positions
+            background_tracks -- ids of background tracks in map (updated with added tracks)
+        """
+        background_tracks &= {id(obj) for obj in tracker.object_list}
+        for ii in range(self.num_tracks - len(background_tracks)):
+            obj = Object(background.uniform(*patterns.frame_bounds[1]), background.uniform(*patterns.frame_bounds[0]))
+            tracker.object_list.append(obj)
+            background_tracks.add(id(obj))
+
+    @staticmethod
+    def _snapshot():
+        """Returns tracemalloc snapshot, leaving out memory allocated by tracemalloc itself"""
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    @staticmethod
+    def _snapshot_diff(before, after):
+        """Returns change in number of blocks and bytes traced between two snapshots"""
+        stats = after.compare_to(before, 'filename')
+        return sum(stat.count_diff for stat in stats), sum(stat.size_diff for stat in stats)
+
+    @staticmethod
+    def _to_cartesian(rng, bearing):
+        """Converts lists of ranges and bearings (in deg) to array of x, y points"""
+        rng, bearing = np.asarray(rng, dtype=np.float64), np.radians(np.asarray(bearing, dtype=np.float64))
+        return np.stack([rng * np.cos(bearing), rng * np.sin(bearing)], axis=1)
+
+    @staticmethod
+    def _latency_stats(times):
+        """Returns p50, p99 and mean (in ms) of times (in s)"""
+        times = np.asarray(times) * 1000.
+        return {'p50_ms': float(np.percentile(times, 50)), 'p99_ms': float(np.percentile(times, 99)),
+                'mean_ms': float(times.mean())}
+
+
+class TrackerBenchmarkSuite():
+    """Runs tracker benchmark for each requested detection and track count and writes results as json"""
+
+    def __init__(self, argv=None):
+        """Initializes benchmark suite
+        Inputs:
+            argv -- command line arguments (defaults to sys.argv[1:])
+        """
+        parser = argparse.ArgumentParser(description='Runs headless tracker benchmark and prints results as json')
+        parser.add_argument('--detections', type=int, nargs='+', default=[18],
+                            help='number of true objects (one run per value)')
+        parser.add_argument('--tracks', type=int, nargs='+', default=[0],
+                            help='number of background tracks kept in map (one run per value, for each detection count)')
+        parser.add_argument('--frames', type=int, default=500)
+        parser.add_argument('--frame-interval', type=float, default=0.25)
+        parser.add_argument('--look-frame', choices=['aperture', 'full'], default='aperture')
+        parser.add_argument('--detect-mode', choices=['regular', 'random', 'constant'], default='regular')
+        parser.add_argument('--match-distance', type=float, default=5.)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--no-allocations', action='store_true', help='skip tracemalloc run')
+        parser.add_argument('--output', help='file to write json results to (defaults to stdout)')
+        self.args = parser.parse_args(argv)
+
+    def run(self):
+        """Runs benchmarks and writes results"""
+        args = self.args
+        results = [TrackerBenchmark(num_detections, args.frames, args.frame_interval, args.look_frame,
+                                    args.detect_mode, args.match_distance, args.seed, not args.no_allocations,
+                                    num_tracks).run()
+                   for num_detections in args.detections for num_tracks in args.tracks]
+
+        if args.output:
+            with open(args.output, 'w') as output_file:
+                json.dump(results, output_file, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+
+        return results
+
+
+if __name__ == '__main__':
+    TrackerBenchmarkSuite().run()
@@ -9,9 +9,9 @@ from matplotlib import pyplot as plt
 from matplotlib.patches import Ellipse
 
 from pubsub import pub
-from random import uniform, randint
 from time import sleep
 
+from integration_tests.tracking.detection_patterns import DetectionPatterns
 from src.tracking.map import Map
 from src.utils.time_in_millis import time_in_millis
 
@@ -63,32 +63,18 @@ class TrackerTest(Thread):
         input('Make plot full screen then press enter')
         self.background = self.fig.canvas.copy_from_bbox(self.polar.bbox)
 
-        # create initial detections
+        # create initial detections (and look aperture)
         num_initial_detections = 18
-        # patterns: static, circle_CCW, circle_CW, circle_CCW_radial_out, circle_CW_radial_out, radial_out
-        self.rng_rate_list = [0, 0, 0, 0.05, 0.05, 0.075] * 3
-        self.bearing_rate_list = [0, 0.0375, -0.0375, 0.025, -0.025, 0] * 3
         self.frame_bounds = [(10, 175), (-180, 180)]
-        self.spawn_detections(num_initial_detections)
-
-        # set look frame parameters
-        self.look_frame = 'aperture'     #'full'
-        self.look_rng = (0, 150)        # initial (and perm) range range of look aperture
-        self.look_bearing = (-70, 70)   # initial bearing range of look aperture
-        self.look_sweep = (-30, 30)     # sweeps so that the center of the aperture goes between these two points
-        self.pan_direction = 1          # direction of pan (+1 = CW, -1 = CCW)
+        self.patterns = DetectionPatterns(num_initial_detections, self.frame_bounds)
         self.look_apertures = []
         self.num_apertures = 1
 
-        # detection parameters
-        self.detect_mode = 'regular' #'constant' #'random'
-        self.detect_probability = 0.6
-
         # start tracker
         self.map.start()
 
-        # initialize old update time (of detection)
-        self.prev_time = [time_in_millis()] * num_initial_detections
+        # initialize old update time (of detections)
+        self.prev_time = time_in_millis()
 
     def run(self):
         """Continually updates detections"""
@@ -105,97 +91,29 @@ class TrackerTest(Thread):
             # update detections
             self.update_detections(loop_counter)
 
-            if self.look_frame == 'aperture':
+            if self.patterns.look_frame == 'aperture':
                 # move aperture
-                self.pan_aperture()
+                self.patterns.pan_aperture()
 
             loop_counter = (loop_counter + 1) % 4
 
     def update_detections(self, send_counter):
         """Updates detections by random dr and dtheta"""
-        # loop through detections
-        for ii in range(len(self.epoch_frame)):
-            # get dt
-            dt = (time_in_millis() - self.prev_time[ii]) / 1000.
-            # get rng and bearing rate
-            rng_rate, bearing_rate = self.rng_rate_list[ii], self.bearing_rate_list[ii]
-
-            # adjust bearing rate based on distance from origin
-            bearing_rate /= 0.5* self.epoch_frame[ii][0]
-
-            # generate deltas
-            rand_dr = uniform(-0.01, 0.01)
-            rand_dtheta = uniform(-0.001, 0.001)
-            
-            dr = (rand_dr + rng_rate) * dt
-            dtheta = (rand_dtheta + bearing_rate) * dt
-
-            # fix wraparound
-            theta = self.epoch_frame[ii][1] + dtheta
-            rng = self.epoch_frame[ii][0] + dr
-            if theta > 180:
-                theta = -180 + (theta % 180)
-
-            if rng < 0:
-                rng *= -1
-                theta %= -180
-
-            # update detection with deltas
-            self.epoch_frame[ii] = (rng, theta, self.epoch_frame[ii][2])
+        # move detections along patterns
+        cur_time = time_in_millis()
+        self.patterns.move_detections((cur_time - self.prev_time) / 1000.)
+        self.prev_time = cur_time
 
         # set detections for plotting
-        self.det_rng_data = [det[0] for det in self.epoch_frame]
-        self.det_bearing_data = [det[1] for det in self.epoch_frame]
-        self.det_type_data = [det[2] for det in self.epoch_frame]
-
-        idx_list = [1] * len(self.epoch_frame)
-
-        if self.look_frame == 'aperture':
-            # trim epoch frame to objects in view look aperture
-            for ii, obj in enumerate(self.epoch_frame):
-                if not self.look_rng[0] <= obj[0] <= self.look_rng[1] or \
-                   not self.look_bearing[0] <= obj[1] <= self.look_bearing[1]:
-                    idx_list[ii] = 0
-
-        if self.detect_mode == 'random':
-            # trim epoch frame using randint (to determine whether or not to send data)
-            for ii in range(len(idx_list)):
-                if randint(0, 9) >= (self.detect_probability * 10):
-                    idx_list[ii] = 0
-
-        elif self.detect_mode == 'regular':
-            if send_counter != 0:
-                idx_list = [0] * len(idx_list)
+        self.det_rng_data = [det[0] for det in self.patterns.epoch_frame]
+        self.det_bearing_data = [det[1] for det in self.patterns.epoch_frame]
+        self.det_type_data = [det[2] for det in self.patterns.epoch_frame]
 
-        elif self.detect_mode == 'constant':
-            pass
-
-        epoch_frame = [obj for (ii, obj) in zip(idx_list, self.epoch_frame) if ii == 1 ]
+        epoch_frame = self.patterns.visible_frame(send_counter)
 
         # update map with detections
         pub.sendMessage('object(s) detected', epoch_frame = epoch_frame, frame_bounds = self.frame_bounds)
 
-    def spawn_detections(self, n_dets):
-        """
-        Creates n_dets random detections and places on Map
-        Inputs:
-            n_dets -- number of detections to create
-        """
-        # initialize epoch frame
-        epoch_frame = [0] * n_dets
-
-        # generate random detections
-        for ii in range(n_dets):
-            rand_rng = uniform(*self.frame_bounds[0])
-            rand_bearing = uniform(*self.frame_bounds[1])
-            rand_type = randint(0, 2)
-            
-            # place in epoch_frame
-            epoch_frame[ii] = (rand_rng, rand_bearing, rand_type)
-
-        # save off epoch_frame
-        self.epoch_frame = epoch_frame
-
     def get_data(self):
         """Gets data from map return_object function"""
         # get data
@@ -239,26 +157,6 @@ class TrackerTest(Thread):
         print("Track List Length: {}".format(len(self.track_conf_data)))
         print('-------------------------------------------------------')
 
-    def pan_aperture(self):
-        """
-        Pans look aperture
-        Side effects:
-            self.look_bearing -- pans look bearing (at 0.5 deg per step)
-        """
-        bearing_rate = 0.5
-        aperture_center = sum(self.look_bearing) / 2.
-        new_ap_center = aperture_center + (bearing_rate * self.pan_direction)
-
-        if new_ap_center > self.look_sweep[1]:
-            new_ap_center = self.look_sweep[1] - (new_ap_center % self.look_sweep[1])
-            self.pan_direction *= -1
-        elif new_ap_center < self.look_sweep[0]:
-            new_ap_center = self.look_sweep[0] - (new_ap_center % self.look_sweep[0])
-            self.pan_direction *= -1
-
-        diff = new_ap_center - aperture_center
-        self.look_bearing = tuple(bear + diff for bear in self.look_bearing[:])
-
     def draw_look_aperture(self):
         """
         Draws look aperture
@@ -273,13 +171,14 @@ class TrackerTest(Thread):
         self.look_apertures = [0] * 3
 
         # create wedge
-        rad_look_bearing = self._deg_2_rad(self.look_bearing)
-        self.look_apertures[0] = self.polar.plot([rad_look_bearing[0]] * 2, [self.look_rng[0], self.look_rng[1]], \
+        look_rng = self.patterns.look_rng
+        rad_look_bearing = self._deg_2_rad(self.patterns.look_bearing)
+        self.look_apertures[0] = self.polar.plot([rad_look_bearing[0]] * 2, [look_rng[0], look_rng[1]], \
                                                   '--', color = 'g', alpha = 0.6)
-        self.look_apertures[1] = self.polar.plot([rad_look_bearing[1]] * 2, [self.look_rng[0], self.look_rng[1]], \
+        self.look_apertures[1] = self.polar.plot([rad_look_bearing[1]] * 2, [look_rng[0], look_rng[1]], \
                                                   '--', color = 'g', alpha = 0.6)
         bearing_sweep = np.arange(rad_look_bearing[0], rad_look_bearing[1], (rad_look_bearing[1] - rad_look_bearing[0]) / 100.)
-        self.look_apertures[2] = self.polar.plot(bearing_sweep, [self.look_rng[1]] * 100, \
+        self.look_apertures[2] = self.polar.plot(bearing_sweep, [look_rng[1]] * 100, \
                                                   '--', color = 'g', alpha = 0.6)
 
         for aperture in self.look_apertures:
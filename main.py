@@ -1,3 +1,5 @@
+import argparse
+
 import src.airmar.airmar_input_thread as airmar
 import src.rc_input.rc_input_thread as rc
 import src.rudder.rudder_listener as rudder
@@ -10,17 +12,56 @@ from src.world.world import World
 
 from src.logging.logger import Logger
 
+import src.airmar.config_reader as airmar_config
+import src.autopilot.config_reader as autopilot_config
+import src.nav.config_reader as nav_config
+import src.rc_input.config_reader as rc_config
+import src.tracking.config_reader as tracking_config
+from src.utils.async_runtime import AsyncRuntime
+from src.utils.clock import SensorClock, set_clock
+from src.utils.config_service import ConfigService, parse_config_value
+
+def start_config_service():
+    """Starts service that pushes values changed in config files to running threads"""
+    config_service = ConfigService()
+    config_service.watch("autopilot", "rudder gain", autopilot_config.read_gain)
+    config_service.watch("autopilot", "autohelm interval", autopilot_config.read_interval)
+    config_service.watch("autopilot", "latitude tolerance", autopilot_config.lat_tol)
+    config_service.watch("autopilot", "longitude tolerance", autopilot_config.long_tol)
+    config_service.watch("nav", "nav interval", nav_config.read_interval)
+    config_service.watch("airmar", "read interval", airmar_config.read_interval)
+    config_service.watch("airmar", "publish interval", airmar_config.read_publish_interval)
+    config_service.watch("rc_input", "read interval", rc_config.read_interval)
+    config_service.watch("tracking", "update_interval",
+                         lambda: parse_config_value(tracking_config.read_map_config()['update_interval']))
+    config_service.start()
+
+    return config_service
+
+def parse_args():
+    """Parses command line arguments"""
+    parser = argparse.ArgumentParser(description="Runs the sailbot")
+    parser.add_argument("--runtime", choices=["threaded", "async"], default="threaded",
+                        help="run airmar, rc input and arduino as threads, or as tasks on one asyncio event loop")
+    return parser.parse_args()
+
 def main():
     """Runs the program."""
+    args = parse_args()
 
     print("Virginia Tech SailBOT\n\n    \"I wish to have no connection with "
           "any ship that does not sail fast\"\n            - John Paul Jones\n\n\n")
 
+    # Time follows gps time read by the airmar, before anything reads the clock
+    if airmar_config.read_gps_clock():
+        set_clock(SensorClock())
+
     # State objects
     boat = Boat()
     world = World()
 
     # Threads
+    config_service = start_config_service()
     airmar_thread = airmar.AirmarInputThread()
     logger = Logger()
     rc_thread = rc.RCInputThread()
@@ -29,13 +70,21 @@ def main():
     arduino_thread = Arduino()
     captain_thread = captain.Captain(boat, world)
 
-    airmar_thread.start()
-    rc_thread.start()
+    if args.runtime == "async":
+        runtime = AsyncRuntime()
+        airmar_thread.schedule(runtime)
+        rc_thread.schedule(runtime)
+        arduino_thread.schedule(runtime)
+        runtime.start()
+    else:
+        airmar_thread.start()
+        rc_thread.start()
+        arduino_thread.start()
     captain_thread.start()
-    arduino_thread.start()
 
     while True:
-        print("Waiting for input:\nd: drop mark\ns: start navigation\ne: end navigation\nc: clear course\n^C: exit program")
+        print("Waiting for input:\nd: drop mark\ns: start navigation\ne: end navigation\nc: clear course\n"
+              "r: reload config\n^C: exit program")
         cmd = input()
         if cmd == 'd':
             captain_thread.drop_mark()
@@ -45,6 +94,8 @@ def main():
             captain_thread.disable()
         elif cmd == 'c':
             captain_thread.clear_course()
+        elif cmd == 'r':
+            config_service.reload()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from threading import Thread
 from time import sleep
 
+from pubsub import pub
+
 from src.airmar.airmar_receiver import AirmarReceiver
-from src.airmar.config_reader import read_interval
+from src.airmar.config_reader import read_drain, read_file_writer, read_interval
 from src.broadcaster.broadcaster import make_broadcaster, BroadcasterType
 
 
@@ -17,7 +19,8 @@ class AirmarInputThread(Thread):
 
         # broadcaster as public attribute
         self.broadcaster = make_broadcaster(
-            broadcaster_type=broadcaster_type, filename=filename)
+            broadcaster_type=broadcaster_type, filename=filename,
+            file_writer=read_file_writer())
         
         # make receiver
         self.receiver = AirmarReceiver(logger=logger,
@@ -25,14 +28,51 @@ class AirmarInputThread(Thread):
                 mock_bbio=mock_bbio, mock_port=mock_port)
 
         self.read_interval = read_interval()
+        self.drain = read_drain()
+        pub.subscribe(self.on_config_changed, "config changed")
+
+    def on_config_changed(self, module, key, value):
+        """Picks up read and publish intervals changed in config while running"""
+        if (module, key) == ("airmar", "read interval"):
+            self.read_interval = value
+        elif (module, key) == ("airmar", "publish interval"):
+            self.receiver.processor.publish_interval = value
 
     def run(self):
         """Starts a regular read interval."""
         while self.is_alive():
             if not self.receiver.is_running:
                 self.receiver.start()
+            if self.drain:
+                self.receiver.drain_airmar_data()
+            else:
                 self.receiver.send_airmar_data()
+            # publish data merged over publish interval once it has passed
+            self.receiver.processor.flush()
             sleep(self.read_interval)
         else:
             # cleanup on thread exit.
-            self.receiver.stop()
\ No newline at end of file
+            self.receiver.stop()
+            self.broadcaster.close()
+
+    def schedule(self, runtime):
+        """
+        Reads airmar on an async runtime instead of running as a thread. Sentences are drained whenever data is
+        waiting on the port (or every read interval if the port can not be watched).
+        Inputs:
+            runtime -- AsyncRuntime to schedule on
+        """
+        self.receiver.start()
+        runtime.watch_port(self.receiver.port, self._on_readable, lambda: self.read_interval, name="airmar read")
+        # publish data merged over publish interval once it has passed
+        runtime.every(lambda: self.read_interval, self.receiver.processor.flush, name="airmar publish")
+        runtime.on_stop(self.receiver.stop)
+        runtime.on_stop(self.broadcaster.close)
+
+    def _on_readable(self):
+        """Sends data waiting on port"""
+        if self.drain:
+            self.receiver.drain_airmar_data()
+        else:
+            self.receiver.send_airmar_data()
+        self.receiver.processor.flush()
\ No newline at end of file
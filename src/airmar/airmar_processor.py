@@ -1,29 +1,42 @@
-import math
+import calendar
 
 from threading import Lock
 
 from src.airmar.airmar_exceptions import InvalidIDException, UnsupportedIDException
-from src.utils.vec import Vec2
+from src.airmar.wind_filter import WindFilter
+from src.airmar.nmeaparser.nmea_sentence import Side
+from src.utils.clock import SensorClock, get_clock
+from src.utils.time_in_millis import time_in_millis
 
 
 class AirmarProcessor:
     """ Processes raw data from airmar and publishes to the specified
     broadcaster """
 
-    def __init__(self, broadcaster, parser):
+    def __init__(self, broadcaster, parser, publish_interval=0, wind_filter=None):
         """ Builds an airmar processor to process raw airmar data.
 
         Keyword Arguments:
         broadcaster -- data broadcast type
         parser -- nmea parser to map raw data.
+        publish_interval -- seconds to merge changed data over before
+            publishing, 0 to publish after every sentence.
+        wind_filter -- dictionary of WindFilter arguments (weight,
+            time_constant, window), None for defaults.
 
         Returns:
         A new airmar processor
         """
         self.parser = parser
         self.broadcaster = broadcaster
+        self.publish_interval = publish_interval
 
         self.data = {}
+        self.records = {}   # sentence id -> typed record, reused per sentence
+        self.dirty = set()  # keys changed since last publish
+        self.wind_filter = wind_filter or {}
+        self.wind_filters = {}  # "apparent"/"true" -> WindFilter
+        self.last_publish = None
 
     def update_airmar_data(self, nmea):
         """ Updates airmar data from given nmea fields. 
@@ -32,122 +45,227 @@ class AirmarProcessor:
         nmea -- A list of fields parsed from an nmea sentence
 
         Side effects:
-        Broadcasts updated processed data.
+        Broadcasts processed data that changed (merged over publish
+        interval, see flush).
 
         Raises:
         InvalidIDException for invalid sentence ids.
         UnsupportedIDException when program does not implement
         interface to parse given nmea fields.
         """
-        raw = {}
         sid = nmea[0]
 
-        self.parser.update_data(data=raw, fields=nmea)
+        record = self.parser.decode(records=self.records, fields=nmea)
         
         if sid == "WIVWR":
-            self._update_wind(raw=raw, sid=sid, 
-                speed_key="wind speed apparent",
-                angle_key="wind angle apparent")
+            self._update_wind(record=record, kind="apparent")
         elif sid == "WIVWT":
-            self._update_wind(raw=raw, sid=sid, 
-                speed_key="wind speed true",
-                angle_key="wind angle true")
+            self._update_wind(record=record, kind="true")
         elif sid == "GPGGA":
-            self._update_boat_gps(raw=raw, sid=sid)
+            self._update_boat_gps(record=record)
         elif sid == "GPVTG":
-            self._update_boat_speed(raw=raw, sid=sid)
+            self._update_boat_speed(record=record)
+        elif sid in ("HCHDT", "HCTHS", "HCHDG"):
+            self._update_compass_heading(record=record, sid=sid)
+        elif sid == "TIROT":
+            self._update_rate_of_turn(record=record)
+        elif sid == "YXXDR":
+            self._update_attitude(record=record)
+        elif sid == "GPZDA":
+            self._update_gps_time(record=record,
+                year=record["year"], month=record["month"], day=record["day"])
+        elif sid == "GPRMC":
+            self._update_gps_date_time(record=record)
         # Other updated processed data goes below
 
-        # Broadcasts processed data via broadcaster
-        self.broadcaster.publish_dictionary(data=self.data)
+        # Broadcasts changed processed data via broadcaster
+        self.flush()
+
+    def flush(self, force=False):
+        """ Publishes processed data changed since last publish, once
+        publish interval has passed since then.
+
+        Keyword Arguments:
+        force -- publish now, even within publish interval
+
+        Side effects:
+        Broadcasts changed keys of processed data, if any.
+        """
+        if not self.dirty:
+            return
+        now = time_in_millis()
+        if not force and self.last_publish is not None and \
+                now - self.last_publish < 1000 * self.publish_interval:
+            return
+
+        self.last_publish = now
+        changed = {key: self.data[key] for key in self.dirty}
+        self.dirty.clear()
+        self.broadcaster.publish_dictionary(data=changed)
+
+    def _set(self, key, value):
+        """ Sets processed data, marking key to publish if value changed. """
+        if key not in self.data or self.data[key] != value:
+            self.data[key] = value
+            self.dirty.add(key)
 
 
 
 # --------------------  PROCESSED DATA ENTRY --------------------
-    def _update_wind(self, raw, sid, speed_key, angle_key):
-        """ Updates scaled average wind speed and heading direction. 
+    def _update_wind(self, record, kind):
+        """ Updates filtered wind speed and angle, and gust and shift
+        statistics when the wind filter keeps a window.
         
         Keyword Arguments:
-        raw -- The dictionary containing the raw WIVWR or WIVWT data.
-            representing relative or true wind data respectively.
-        sid -- nmea sentence id representing true or relative wind data.
-        speed_key -- The key in broadcaster containing the speed data in mps
-        angle_key -- The key in broadcaster containing the angle data in degrees
+        record -- The decoded WIVWR or WIVWT record, representing relative
+            or true wind data respectively.
+        kind -- "apparent" or "true", the last word of the broadcaster keys
+            ("wind speed <kind>", "wind angle <kind>", ...). The reading
+            is also published whole as "wind <kind>" (speed, angle), so
+            subscribers never pair the speed of one reading with the
+            angle of another.
         """
+        speed = record["wind_speed_mps"]
+        angle = record["wind_angle_degree"]
+        if speed is None or angle is None:
+            return
+
         # Left is negative, Right is positive
-        if (raw[sid]["wind_angle_direction"]) == "L":
+        if record["wind_angle_direction"] is Side.LEFT:
             # (counter clockwise)
             # i.e -1 degree = 359 degree.
-            raw[sid]["wind_angle_degree"] = (360 - float(raw[sid]["wind_angle_degree"])) % 360
-        
-        # Initialize new speed to data
-        if speed_key not in self.data:
-            self.data[speed_key] = float(raw[sid]["wind_speed_mps"])
-        if angle_key not in self.data:
-            self.data[angle_key] = float(raw[sid]["wind_angle_degree"])
-
-        # Calculated weighted magn and angle from old and new data.
-        self.data[speed_key], self.data[angle_key] = self._scale_avg_polar_coords(
-            o_magn=self.data[speed_key],
-            o_angle=self.data[angle_key],
-            n_magn=float(raw[sid]["wind_speed_mps"]),
-            n_angle=float(raw[sid]["wind_angle_degree"])
-        )
-
-    def _update_boat_gps(self, raw, sid):
+            angle = (360 - angle) % 360
+
+        wind_filter = self.wind_filters.get(kind)
+        if wind_filter is None:
+            wind_filter = self.wind_filters[kind] = WindFilter(**self.wind_filter)
+
+        speed, angle = wind_filter.update(speed, angle, time=time_in_millis() / 1000.)
+        self._set("wind speed " + kind, speed)
+        self._set("wind angle " + kind, angle)
+        self._set("wind " + kind, (speed, angle))
+
+        stats = wind_filter.stats()
+        if stats is not None:
+            self._set("wind gust " + kind, stats["gust"])
+            self._set("wind shift " + kind, stats["shift"])
+
+    def _update_boat_gps(self, record):
         """ Updates the boat's latitude and longitude position in minutes.
         
         Keyword Arguments:
-        raw -- The dictionary containing raw gps data.
-        sid -- gps nmea sentence id.
+        record -- The decoded gps record.
         """
-        self.data["boat latitude"] = float(raw[sid]["latitude"])
-        self.data["boat longitude"] = float(raw[sid]["longitude"])
+        if record["latitude"] is None or record["longitude"] is None:
+            return
+        self._set("boat latitude", record["latitude"])
+        self._set("boat longitude", record["longitude"])
 
-    def _update_boat_speed(self, raw, sid):
+    def _update_boat_speed(self, record):
         """ Updates the boat's speed and heading direction in kph and minutes.
 
         Keyword Arguments:
-        raw -- The dictionary containig the raw speed and course data
-        sid -- speed/heading nmea sentence id.
+        record -- The decoded speed and course record.
+        """
+        if record["speed_over_ground_kph"] is None or record["course_over_ground_true"] is None:
+            return
+        self._set("boat speed", record["speed_over_ground_kph"])
+        self._set("boat heading", record["course_over_ground_true"])
+
+    def _update_compass_heading(self, record, sid):
+        """ Updates the boat's compass heading in degrees True.
+
+        Keyword Arguments:
+        record -- The decoded HCHDT, HCTHS or HCHDG record.
+        sid -- heading nmea sentence id.
         """
-        self.data["boat speed"] = float(raw[sid]["speed_over_ground_kph"])
-        self.data["boat heading"] = float(raw[sid]["course_over_ground_true"])
+        if sid == "HCHDG":
+            heading = self._true_heading(record)
+        elif sid == "HCTHS" and record["mode_indicator"] == "V":
+            heading = None
+        else:
+            heading = record["heading_true"]
+
+        if heading is not None:
+            self._set("compass heading", heading)
+
+    def _update_rate_of_turn(self, record):
+        """ Updates the boat's rate of turn in degrees per minute
+        (negative when turning to port).
+
+        Keyword Arguments:
+        record -- The decoded TIROT record.
+        """
+        if record["status"] == "A" and record["rate_of_turn"] is not None:
+            self._set("rate of turn", record["rate_of_turn"])
+
+    def _update_attitude(self, record):
+        """ Updates the boat's pitch and heel (roll) in degrees.
+
+        Keyword Arguments:
+        record -- The decoded YXXDR record, keyed by transducer name.
+        """
+        if record.get("PTCH") is not None:
+            self._set("boat pitch", record["PTCH"])
+        if record.get("ROLL") is not None:
+            self._set("boat heel", record["ROLL"])
+
+    def _update_gps_date_time(self, record):
+        """ Updates gps time from a GPRMC record with a valid fix.
+
+        Keyword Arguments:
+        record -- The decoded GPRMC record.
+        """
+        date = record["date"]
+        if record["status"] != "A" or date is None or len(date) != 6 or not date.isdigit():
+            return
+        self._update_gps_time(record=record,
+            year=2000 + int(date[4:6]), month=int(date[2:4]), day=int(date[0:2]))
+
+    def _update_gps_time(self, record, year, month, day):
+        """ Updates gps time in seconds since epoch (UTC). When a
+        SensorClock is installed, it is synced to gps time so that
+        time_in_millis (and the filters using it) follow sensor time.
+
+        Keyword Arguments:
+        record -- The decoded GPZDA or GPRMC record.
+        year, month, day -- UTC date of record.
+        """
+        if None in (year, month, day, record["utc_time"]):
+            return
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return
+
+        gps_time = calendar.timegm((year, month, day, 0, 0, 0)) + record["utc_time"]
+        self._set("gps time", gps_time)
+
+        clock = get_clock()
+        if isinstance(clock, SensorClock):
+            clock.sync(gps_time)
 
 
 
 # -------------------- AIRMAR SPECIFIC CALCULATIONS --------------------
-    def _scale_avg_polar_coords(self, o_magn, o_angle, n_magn, n_angle):
-        """ Calculates the scaled average polar coordinates given the original
-        polar coordinates and new polar coordinates. Note, the scaled weight
-        will be 70% of the original + 30% new vectors.
+    def _true_heading(self, record):
+        """ Calculates true heading from a magnetic HCHDG record.
 
         Keyword Arguments:
-        o_magn -- The magnitude of the original vector.
-        o_angle -- The angle of the original vector in degrees.
-        n_magn -- The magnitude of the new vector.
-        n_angle -- the angle of the new vector in degrees.
+        record -- The decoded HCHDG record.
 
         Returns:
-        (magnitude, angle) as a tuple, such that the magnitude and angle in 
-        degrees of the vector is the scaled average of the original and new vector.
+        heading in degrees True (0 - 360), or None when heading or
+        magnetic variation is not known.
         """
-        old = Vec2.build_from(magnitude=o_magn, angle=math.radians(o_angle))
-        new = Vec2.build_from(magnitude=n_magn, angle=math.radians(n_angle))
-        
-        # Weighted average
-        weight = 0.3
-        x = (old.x * (1 - weight)) + (new.x * weight)
-        y = (old.y * (1 - weight)) + (new.y * weight)
-        
-        v = Vec2(x, y)
+        heading = record["heading_magnetic"]
+        variation = record["magnetic_variation"]
+        if heading is None or variation is None:
+            return None
 
-        # Convert to degrees, returns tuple (speed, angle)
-        try:
-            v_angle = math.degrees(v.angle())
-        except ZeroDivisionError:
-            v_angle = 0
+        # East is positive, West is negative
+        deviation = record["magnetic_deviation"] or 0.
+        if record["magnetic_deviation_direction"] == "W":
+            deviation = -deviation
+        if record["magnetic_variation_direction"] == "W":
+            variation = -variation
 
-        # Assume counter clockwise. More details in documentation.
-        degrees = v_angle if v_angle >=0 else 360 + v_angle
-        return v.length(), degrees
\ No newline at end of file
+        return (heading + deviation + variation) % 360
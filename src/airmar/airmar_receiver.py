@@ -2,10 +2,14 @@ from src.airmar.airmar_processor import AirmarProcessor
 from src.airmar.airmar_exceptions import InvalidIDException, UnsupportedIDException
 from src.airmar.airmar_exceptions import InvalidSentenceException
 from src.airmar.config_reader import read_pin_config, read_port_config, read_ids
+from src.airmar.config_reader import read_publish_interval, read_wind_filter
 from src.airmar.nmeaparser.nmea_parser import NmeaParser
 
+from collections import deque
 from threading import Lock
 
+from src.utils.time_in_millis import time_in_millis
+
 class AirmarReceiver:
     """Defines an Airmar receiver that sends data to a processor."""
 
@@ -28,8 +32,13 @@ class AirmarReceiver:
         self.uart_pin = read_pin_config(mock_bbio=mock_bbio)
         self.port = read_port_config(mock_port=mock_port)
         self.logger = logger
+        self.sentences_read = 0
+        self.drains = deque()   # (time in ms, sentences read) of recent drains
+        self.rate_window = 5000 # ms to average sentences per second over
         self.processor = AirmarProcessor(
-            broadcaster=broadcaster, parser=self.parser)
+            broadcaster=broadcaster, parser=self.parser,
+            publish_interval=read_publish_interval(),
+            wind_filter=read_wind_filter())
 
     def start(self):
         """ Sets up uart pin and open port to start listening. 
@@ -60,27 +69,81 @@ class AirmarReceiver:
         Updates logger with warnings and errors
         """
         sentence = self.port.read_line(terminator='\r\n')
+        self._send_sentence(sentence)
+        self._count_sentences(0 if sentence is None else 1)
+
+    def drain_airmar_data(self):
+        """ Sends every complete nmea sentence waiting on serial port to
+        processor to broadcast data, so that reading keeps up with the
+        airmar however many sentences arrive between reads.
+
+        Returns:
+        Number of sentences read.
+
+        Side effects:
+        Updates logger with warnings and errors
+        """
+        sentences = self.port.read_lines(terminator='\r\n')
+        for sentence in sentences:
+            self._send_sentence(sentence)
+        self._count_sentences(len(sentences))
+        return len(sentences)
+
+    def metrics(self):
+        """ Returns receiver metrics
+
+        Returns:
+        dictionary of
+            sentences -- total sentences read
+            sentences_per_s -- sentences read per second (over rate window)
+            queue_bytes -- bytes received but not yet read as sentences
+        """
+        now = time_in_millis()
+        self._expire_drains(now)
+        return {
+            "sentences": self.sentences_read,
+            "sentences_per_s": 1000. * sum(n for _, n in self.drains) / self.rate_window,
+            "queue_bytes": self.port.bytes_waiting()
+        }
+
+    def _send_sentence(self, sentence):
+        """ Sends nmea sentence to processor to broadcast data
+
+        Keyword arguments:
+        sentence -- nmea sentence read from port
 
+        Side effects:
+        Updates logger with warnings and errors
+        """
         try:
             data = self.parser.parse(sentence)
             self.processor.update_airmar_data(nmea=data)
 
         except InvalidIDException:
-            self.logger.write_msg(pin_name=self.uart_pin.pin_name,
-            msg=r"WARNING Invalid SID: \"{}\"".format(sentence), 
-            rw_state="r")
+            self.logger.write_msg(author=self.uart_pin.pin_name,
+            msg=r"WARNING Invalid SID: \"{}\"".format(sentence))
         except InvalidSentenceException:
-            self.logger.write_msg(pin_name=self.uart_pin.pin_name,
-            msg=r"WARNING Unable to parse \"{}\"".format(sentence), 
-            rw_state="r")
+            self.logger.write_msg(author=self.uart_pin.pin_name,
+            msg=r"WARNING Unable to parse \"{}\"".format(sentence))
         except UnsupportedIDException:
-            self.logger.write_msg(pin_name=self.uart_pin.pin_name,
-            msg=r"WARNING Unsupported ID: \"{}\"".format(sentence), 
-            rw_state="r")
+            self.logger.write_msg(author=self.uart_pin.pin_name,
+            msg=r"WARNING Unsupported ID: \"{}\"".format(sentence))
         except Exception as e:
-            self.logger.write_msg(pin_name=self.uart_pin.pin_name,
-            msg=r"ERROR Unhandled Exception\"{}\": \"{}\"".format(e, sentence), 
-            rw_state="r")
+            self.logger.write_msg(author=self.uart_pin.pin_name,
+            msg=r"ERROR Unhandled Exception\"{}\": \"{}\"".format(e, sentence))
+
+    def _count_sentences(self, count):
+        """ Adds sentences read to metrics """
+        now = time_in_millis()
+        self.sentences_read += count
+        if count > 0:
+            self.drains.append((now, count))
+        self._expire_drains(now)
+
+    def _expire_drains(self, now):
+        """ Drops drains older than rate window """
+        while self.drains and now - self.drains[0][0] > self.rate_window:
+            self.drains.popleft()
 
     def stop(self):
         """ Stops the pin and port """
@@ -1,9 +1,9 @@
 import os
 
-import yaml
-
 from src.hardware.pin import make_pin
 from src.hardware.port import make_port
+from src.utils.config_cache import load_config
+from src.utils.config_service import parse_config_value
 
 
 def read_pin_config(mock_bbio=None, path=None):
@@ -11,12 +11,11 @@ def read_pin_config(mock_bbio=None, path=None):
     dictionary"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        if mock_bbio is None:
-            pin = make_pin(conf["pin"])
-        else:
-            pin = make_pin(conf["pin"], mock_lib=mock_bbio.UART)
+    conf = load_config(path + "/config.yml")
+    if mock_bbio is None:
+        pin = make_pin(conf["pin"])
+    else:
+        pin = make_pin(conf["pin"], mock_lib=mock_bbio.UART)
 
     return pin
 
@@ -26,9 +25,8 @@ def read_ids(path=None):
     and returns list of ids."""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        ids = conf["sentences"]
+    conf = load_config(path + "/config.yml")
+    ids = conf["sentences"]
     return ids
 
 
@@ -36,11 +34,71 @@ def read_interval(path=None):
     """Reads the read interval from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        interval = conf["read interval"]
+    conf = load_config(path + "/config.yml")
+    interval = conf["read interval"]
+
+    return parse_config_value(interval)
+
+
+def read_drain(path=None):
+    """Reads whether receiver drains every waiting sentence from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+
+    return bool(conf.get("drain", False))
+
+
+def read_gps_clock(path=None):
+    """Reads whether time follows gps time (see SensorClock) from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+
+    return bool(conf.get("gps clock", False))
+
+
+def read_publish_interval(path=None):
+    """Reads the publish interval from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+    interval = conf.get("publish interval", 0)
+
+    return parse_config_value(interval)
+
+
+def read_wind_filter(path=None):
+    """Reads the wind filter settings from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+    settings = conf.get("wind filter") or {}
+
+    wind_filter = {}
+    for key in ("weight", "time_constant", "window"):
+        if settings.get(key) is not None:
+            wind_filter[key] = parse_config_value(settings[key])
+    return wind_filter
+
+
+def read_file_writer(path=None):
+    """Reads the FileWriter broadcaster settings from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+    settings = conf.get("file writer") or {}
 
-    return eval(interval)
+    file_writer = {}
+    for key in ("buffered", "background_flush"):
+        if key in settings:
+            file_writer[key] = bool(settings[key])
+    if settings.get("buffer_size") is not None:
+        file_writer["buffer_size"] = parse_config_value(settings["buffer_size"], int)
+    for key in ("flush_interval", "fsync_interval"):
+        if key in settings:
+            file_writer[key] = None if settings[key] is None else parse_config_value(settings[key])
+    return file_writer
 
 
 def read_port_config(mock_port=None, path=None):
@@ -48,10 +106,9 @@ def read_port_config(mock_port=None, path=None):
     returns matching port dictionary"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        if mock_port is None:
-            port = make_port(config=conf["port"])
-        else:
-            port = make_port(config=conf["port"], mock_port=mock_port)
+    conf = load_config(path + "/config.yml")
+    if mock_port is None:
+        port = make_port(config=conf["port"])
+    else:
+        port = make_port(config=conf["port"], mock_port=mock_port)
     return port
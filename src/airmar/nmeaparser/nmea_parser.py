@@ -1,8 +1,23 @@
-import parse
-
 from src.airmar.airmar_exceptions import UnsupportedIDException, InvalidSentenceException
 from src.airmar.nmeaparser.nmea_sentence import get_sentence_interface
 
+# Uppercase two digit hex checksum -> value (other spellings are invalid)
+_CHECKSUMS = {'{:02X}'.format(value): value for value in range(256)}
+
+def _xor_bytes(data):
+    """ Returns XOR of all bytes in data.
+
+    The bytes are read as one integer and folded in half until one byte is
+    left, so the loop runs log2(len(data)) times instead of once per byte.
+    """
+    length = len(data)
+    value = int.from_bytes(data, 'little')
+    while length > 1:
+        length = (length + 1) // 2
+        shift = 8 * length
+        value = (value & ((1 << shift) - 1)) ^ (value >> shift)
+    return value
+
 class NmeaParser():
     """ Defines nmea parser that can read, write, and parse nmea0183 sentences 
 
@@ -36,15 +51,19 @@ class NmeaParser():
             Refer to 300WX User Technical Manual_0183 for detailed descriptions of
             data fields.
         """
-        parsed = parse.parse(self.nmea_format, sentence)
-        if parsed is None:
+        # Sentence must be "$<body>*<checksum>\r\n" with a non empty body
+        if sentence[:1] != '$' or sentence[-2:] != '\r\n':
+            raise InvalidSentenceException()
+        star = sentence.find('*', 1)
+        if star < 2:
             raise InvalidSentenceException()
-            
-        body = parsed[0]
-        checksum = parsed[1]
-        if self.checksum(body) == checksum:
-            return [None if field == '' else field for field in body.split(separator)]
-        raise InvalidSentenceException() # Chksum did not match
+
+        checksum = _CHECKSUMS.get(sentence[star + 1:-2])
+        body = sentence[1:star]
+        if checksum is None or checksum != self._checksum_value(body):
+            raise InvalidSentenceException() # Chksum did not match
+
+        return [field or None for field in body.split(separator)]
 
     def update_data(self, data, fields):
         """ Packages NmeaSentence fields into a map, if sentence id is supported.
@@ -66,6 +85,33 @@ class NmeaParser():
             raise UnsupportedIDException()
         interface.update_data(nmea_map=data, fields=fields)
 
+    def decode(self, records, fields):
+        """ Decodes NmeaSentence fields into a typed record, if sentence id is supported.
+
+        Keyword arguments:
+        records -- A map of records such that ["nmea_id"] : record, reused
+            between sentences (missing records are added).
+        fields -- A list of data fields, where nmea sentence id is the
+            first element.
+
+        Returns:
+        The record of the sentence id, such that
+        record["data_description"] = value (float, int, str, Side or None)
+
+        Raises:
+        UnsupportedIDException when sentence id is not supported.
+        InvalidSentenceException when a field can not be decoded.
+        """
+        sid = fields[0]
+        record = records.get(sid)
+        interface = get_sentence_interface(sid)
+        if interface is None:
+            raise UnsupportedIDException()
+        if record is None:
+            record = records[sid] = interface.new_record()
+        interface.decode(fields=fields, record=record)
+        return record
+
     def toggle(self, sentence_ids=["ALL"], frequency=1, enable=1):
         """ Creates a sentence to toggle sentence(s) to be read in.
         
@@ -135,9 +181,22 @@ class NmeaParser():
         Returns:
         checksum for sentence body as uppercase hexcode.
         """
-        checksum = 0
-        # XOR all characters in string
-        for c in sentence:
-            checksum = checksum ^ ord(c)
+        return '{:02X}'.format(self._checksum_value(sentence))
 
-        return '{:02x}'.format(checksum).upper()
\ No newline at end of file
+    def _checksum_value(self, sentence):
+        """ Gets checksum for sentence body as an integer
+
+        Keyword Arguments:
+        sentence -- A nmea0183 sentence body (between '$' and '*')
+
+        Returns:
+        XOR of all characters in sentence body.
+        """
+        try:
+            return _xor_bytes(sentence.encode('latin-1'))
+        except UnicodeEncodeError:
+            # Not a valid nmea sentence, but keep checksum defined
+            checksum = 0
+            for c in sentence:
+                checksum = checksum ^ ord(c)
+            return checksum
@@ -1,196 +1,414 @@
-from abc import ABC, abstractmethod
-import sys
+from abc import ABC
+from enum import Enum
+
+from src.airmar.airmar_exceptions import InvalidSentenceException
+
+class Side(Enum):
+    """ Side of vessel heading an angle is measured to """
+    LEFT = "L"
+    RIGHT = "R"
+
+def _text(field):
+    return field
+
+def _number(field):
+    return float(field)
+
+def _count(field):
+    return int(field)
+
+def _side(field):
+    return Side(field)
+
+def _utc_time(field):
+    # hhmmss.ss -> seconds since midnight
+    return int(field[0:2]) * 3600 + int(field[2:4]) * 60 + float(field[4:])
+
+def _field(fields, index):
+    # trailing empty fields may be left out of a sentence
+    return fields[index] if index < len(fields) else None
 
 class NmeaSentence(ABC):
-    """ Interface for interpretting all transmitted NMEA 0183 Sentences 
-    
+    """ Interface for interpretting all transmitted NMEA 0183 Sentences
+
+    Each sentence lists its data fields once, as (data_description, index of
+    field in sentence, decoder) triples. Interfaces hold no state, so one
+    instance of each is shared through the registry below.
+
     Refer to 300 WX User Technical Manual_0183 for descriptions of fields
     """
-    @abstractmethod
+    fields = ()
+
+    def __init__(self):
+        """ Precompiles the data descriptions of this sentence """
+        self.keys = tuple(key for key, _, _ in self.fields)
+
     def update_data(self, nmea_map, fields):
-        """ Adds/updates this sentence Key-Value pair to nmea_map 
-        
-        Note: 
-        Values will be of NoneType or StringType, type conversions 
-        is left to client.
+        """ Adds/updates this sentence Key-Value pair to nmea_map
 
-        Dictionary format: 
+        Note:
+        Values will be of NoneType or StringType, type conversions
+        is left to client (or use decode for typed values).
+
+        Dictionary format:
         nmea_map["<sentence-id>"] = { "data_description" : "<sentence-fields>" }
 
         Side-effects:
         nmea_map will be updated with sentence key value pairs
         """
-        pass
+        nmea_map[fields[0]] = {key: _field(fields, index) for key, index, _ in self.fields}
+
+    def new_record(self):
+        """ Returns a record to decode this sentence into, with every value None """
+        return dict.fromkeys(self.keys)
+
+    def decode(self, fields, record):
+        """ Decodes sentence fields into typed values (float, int, str or enum)
+
+        Keyword arguments:
+        fields -- A list of data fields, where sentence id is first element.
+        record -- A record made by new_record, reused for every sentence.
+
+        Side-effects:
+        record values are overwritten (empty fields become None)
+
+        Raises:
+        InvalidSentenceException when a field can not be decoded.
+        """
+        try:
+            for key, index, decoder in self.fields:
+                field = _field(fields, index)
+                record[key] = None if field is None else decoder(field)
+        except ValueError:
+            raise InvalidSentenceException()
+
 
 class GPDTM(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        nmea_map[fields[0]] = {
-            # 3 letter alphabetical code for local datum
-            "local_datum_code" : fields[1],
-            # 1 letter subdivision datum code (when available)
-            "subdivision_datum_code" : fields[2],
-            # Latitude offset to the nearest .0001 minute
-            "latitude_offset" : fields[3],
-            # N/S if dtm_latitude_offset is North/South latitude
-            "latitiude_cardinality" : fields[4],
-            # Longitude offset to the nearest .0001 minute
-            "longitude_offset" : fields[5],
-            # E/W if dtm_longitude_offset is East/West longitude
-            "longitude_cardinality" : fields[6],
-            # Signed (+/-) altitude offset, to the nearest meter
-            "altitude_offset" : fields[7],
-            # 3 character reference datum code
-            "reference_datum_code" : fields[8]
-        } 
+    fields = (
+        # 3 letter alphabetical code for local datum
+        ("local_datum_code", 1, _text),
+        # 1 letter subdivision datum code (when available)
+        ("subdivision_datum_code", 2, _text),
+        # Latitude offset to the nearest .0001 minute
+        ("latitude_offset", 3, _number),
+        # N/S if dtm_latitude_offset is North/South latitude
+        ("latitiude_cardinality", 4, _text),
+        # Longitude offset to the nearest .0001 minute
+        ("longitude_offset", 5, _number),
+        # E/W if dtm_longitude_offset is East/West longitude
+        ("longitude_cardinality", 6, _text),
+        # Signed (+/-) altitude offset, to the nearest meter
+        ("altitude_offset", 7, _number),
+        # 3 character reference datum code
+        ("reference_datum_code", 8, _text),
+    )
 
 
 class GPGGA(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        nmea_map[fields[0]] = { 
-            # UTC of position, in the form hhmmss
-            "utc_position" : fields[1],
-            # Latitude to the nearest .0001 minute
-            "latitude" : fields[2],
-            # N/S if gga_latitude is North/South latitude
-            "latitude_cardinality" : fields[3],
-            # Longitude to the nearest .0001 minute
-            "longitude" : fields[4],
-            # E/W if gga_longitude is East/West longitude
-            "longitude_cardinality" : fields[5],
-            # GPS quality indicator - refer to manual
-            "gps_quality_indicator" : fields[6],
-            # Number of satelites in use, 0-12
-            "number_satelites" : fields[7],
-            # Horizontal dilution of precision (hdop)
-            "hdop" : fields[8],
-            # Altitude relative to mean-sea-level (geoid), to the nearest meter
-            "geoid" : fields[9],
-            # Geoidol separation, meters. Contains separation data
-            "geiodal_separation" : fields[11],
-            # For WX series, appears as null field
-            "age_of_differential_gps_data" : fields[13],
-            # For WX series, appears as null field
-            "differential_reference_station_id" : fields[14]
-        }
+    fields = (
+        # UTC of position, in the form hhmmss
+        ("utc_position", 1, _text),
+        # Latitude to the nearest .0001 minute
+        ("latitude", 2, _number),
+        # N/S if gga_latitude is North/South latitude
+        ("latitude_cardinality", 3, _text),
+        # Longitude to the nearest .0001 minute
+        ("longitude", 4, _number),
+        # E/W if gga_longitude is East/West longitude
+        ("longitude_cardinality", 5, _text),
+        # GPS quality indicator - refer to manual
+        ("gps_quality_indicator", 6, _count),
+        # Number of satelites in use, 0-12
+        ("number_satelites", 7, _count),
+        # Horizontal dilution of precision (hdop)
+        ("hdop", 8, _number),
+        # Altitude relative to mean-sea-level (geoid), to the nearest meter
+        ("geoid", 9, _number),
+        # Geoidol separation, meters. Contains separation data
+        ("geiodal_separation", 11, _number),
+        # For WX series, appears as null field
+        ("age_of_differential_gps_data", 13, _number),
+        # For WX series, appears as null field
+        ("differential_reference_station_id", 14, _text),
+    )
 
 
 class GPGLL(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Latitude to the nearest .0001 minute
+        ("latitude", 1, _number),
+        # N/S if latitude is North/South latitude
+        ("latitude_cardinality", 2, _text),
+        # Longitude to the nearest .0001 minute
+        ("longitude", 3, _number),
+        # E/W if longitude is East/West longitude
+        ("longitude_cardinality", 4, _text),
+        # UTC of position, in the form hhmmss.ss (seconds since midnight when decoded)
+        ("utc_time", 5, _utc_time),
+        # A if data is valid, V if invalid
+        ("status", 6, _text),
+        # Mode indicator - refer to manual
+        ("mode_indicator", 7, _text),
+    )
+
 
 class GPGSA(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # M (manual) or A (automatic) 2D/3D mode
+        ("mode", 1, _text),
+        # 1 no fix, 2 2D fix, 3 3D fix
+        ("fix_type", 2, _count),
+    ) + tuple(
+        # ID numbers of satellites used in solution
+        ("satellite_id_{}".format(ii + 1), 3 + ii, _count) for ii in range(12)
+    ) + (
+        # Position, horizontal and vertical dilution of precision
+        ("pdop", 15, _number),
+        ("hdop", 16, _number),
+        ("vdop", 17, _number),
+    )
+
 
 class GPGSV(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Total number of GSV sentences, 1-3
+        ("total_messages", 1, _count),
+        # Number of this sentence, 1-3
+        ("message_number", 2, _count),
+        # Total number of satellites in view
+        ("satellites_in_view", 3, _count),
+    ) + tuple(
+        # Up to 4 satellites per sentence: PRN number, elevation (0-90 degrees),
+        # azimuth (0-359 degrees True) and SNR (dB, empty when not tracking)
+        field for ii in range(4) for field in (
+            ("satellite_{}_prn".format(ii + 1), 4 + 4 * ii, _count),
+            ("satellite_{}_elevation".format(ii + 1), 5 + 4 * ii, _number),
+            ("satellite_{}_azimuth".format(ii + 1), 6 + 4 * ii, _number),
+            ("satellite_{}_snr".format(ii + 1), 7 + 4 * ii, _number),
+        )
+    )
+
 
 class HCHDG(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Magnetic sensor heading, degrees, to the nearest 0.1 degree
+        ("heading_magnetic", 1, _number),
+        # Magnetic deviation, degrees, to the nearest 0.1 degree
+        ("magnetic_deviation", 2, _number),
+        # E/W if deviation is East/West
+        ("magnetic_deviation_direction", 3, _text),
+        # Magnetic variation, degrees, to the nearest 0.1 degree
+        ("magnetic_variation", 4, _number),
+        # E/W if variation is East/West
+        ("magnetic_variation_direction", 5, _text),
+    )
+
 
 class HCHDT(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Heading relative to True North, degrees, to the nearest 0.1 degree
+        ("heading_true", 1, _number),
+    )
+
 
 class WIMDA(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Barometric pressure, inches of mercury, to the nearest 0.01 inch
+        ("barometric_pressure_inches", 1, _number),
+        # Barometric pressure, bars, to the nearest .001 bar
+        ("barometric_pressure_bars", 3, _number),
+        # Air temperature, degrees C, to the nearest 0.1 degree C
+        ("air_temperature", 5, _number),
+        # Water temperature, degrees C (null for WX series)
+        ("water_temperature", 7, _number),
+        # Relative humidity, percent, to the nearest 0.1 percent
+        ("relative_humidity", 9, _number),
+        # Absolute humidity, percent (null for WX series)
+        ("absolute_humidity", 10, _number),
+        # Dew point, degrees C, to the nearest 0.1 degree C
+        ("dew_point", 11, _number),
+        # Wind direction True 0-359.9 degrees
+        ("wind_direction_true", 13, _number),
+        # Wind direction Magnetic, 0-359.9 degrees
+        ("wind_direction_magnetic", 15, _number),
+        # Wind speed knots, to the nearest 0.1 knot
+        ("wind_speed_knots", 17, _number),
+        # Wind speed meters per second, to the nearest 0.1 m/s
+        ("wind_speed_mps", 19, _number),
+    )
+
 
 class WIMWD(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        nmea_map[fields[0]] = {
-            # Wind direction True 0-359.9 degrees
-            "wind_direction_true" : fields[1],
-            # Wind direction Magnetic, 0-359.9 degrees
-            "wind_direction_magnetic" : fields[3],
-            # Wind speed knots
-            "wind_speed_knots" : fields[5],
-            # Wind speed meters per seconds
-            "wind_speed_mps" : fields[7]
-        } 
+    fields = (
+        # Wind direction True 0-359.9 degrees
+        ("wind_direction_true", 1, _number),
+        # Wind direction Magnetic, 0-359.9 degrees
+        ("wind_direction_magnetic", 3, _number),
+        # Wind speed knots
+        ("wind_speed_knots", 5, _number),
+        # Wind speed meters per seconds
+        ("wind_speed_mps", 7, _number),
+    )
 
 
 class WIMWV(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Wind angle, 0-359.9 degrees, clockwise from bow
+        ("wind_angle", 1, _number),
+        # R (relative/apparent) or T (theoretical/true)
+        ("reference", 2, _text),
+        # Wind speed, to the nearest 0.1 unit
+        ("wind_speed", 3, _number),
+        # K/M/N if wind speed is km/hr, m/s or knots
+        ("wind_speed_units", 4, _text),
+        # A if data is valid, V if invalid
+        ("status", 5, _text),
+    )
+
 
 class GPRMC(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # UTC of position fix, in the form hhmmss.ss (seconds since midnight when decoded)
+        ("utc_time", 1, _utc_time),
+        # A if data is valid, V if invalid
+        ("status", 2, _text),
+        # Latitude to the nearest .0001 minute
+        ("latitude", 3, _number),
+        # N/S if latitude is North/South latitude
+        ("latitude_cardinality", 4, _text),
+        # Longitude to the nearest .0001 minute
+        ("longitude", 5, _number),
+        # E/W if longitude is East/West longitude
+        ("longitude_cardinality", 6, _text),
+        # Speed over ground, knots, to the nearest 0.1 knot
+        ("speed_over_ground_knots", 7, _number),
+        # Course over ground, degrees True, to the nearest 0.1 degree
+        ("course_over_ground_true", 8, _number),
+        # Date, in the form ddmmyy
+        ("date", 9, _text),
+        # Magnetic variation, degrees, to the nearest 0.1 degree
+        ("magnetic_variation", 10, _number),
+        # E/W if variation is East/West
+        ("magnetic_variation_direction", 11, _text),
+        # Mode indicator - refer to manual
+        ("mode_indicator", 12, _text),
+    )
+
 
 class TIROT(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Rate of turn, degrees per minute, negative when bow turns to port
+        ("rate_of_turn", 1, _number),
+        # A if data is valid, V if invalid
+        ("status", 2, _text),
+    )
+
 
 class HCTHS(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # Heading relative to True North, degrees, to the nearest 0.1 degree
+        ("heading_true", 1, _number),
+        # Mode indicator - A autonomous, E estimated, M manual, S simulator, V invalid
+        ("mode_indicator", 2, _text),
+    )
+
 
 class GPVTG(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        nmea_map[fields[0]] = {
-            # Course over ground, degrees True, to the nearest 0.1 degree
-            "course_over_ground_true" : fields[1],
-            # Course over ground, degrees Magnetic, to the nearest 0.1 degree
-            "course_over_ground_magnetic" : fields[3],
-            # Speed over ground, knots, to the nearest 0.1 knot
-            "speed_over_ground_knots" : fields[5],
-            # Speed over ground km/hr to the nearest 0.1 km/hr
-            "speed_over_ground_kph" : fields[7],
-            # Mode indicator - refer to manual
-            "mode_indicator" : fields[9]
-        }
+    fields = (
+        # Course over ground, degrees True, to the nearest 0.1 degree
+        ("course_over_ground_true", 1, _number),
+        # Course over ground, degrees Magnetic, to the nearest 0.1 degree
+        ("course_over_ground_magnetic", 3, _number),
+        # Speed over ground, knots, to the nearest 0.1 knot
+        ("speed_over_ground_knots", 5, _number),
+        # Speed over ground km/hr to the nearest 0.1 km/hr
+        ("speed_over_ground_kph", 7, _number),
+        # Mode indicator - refer to manual
+        ("mode_indicator", 9, _text),
+    )
 
 
 class WIVWR(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        nmea_map[fields[0]] = {
-            # (Apparent) Wind angle relative to the vessel, 0-180 degree
-            "wind_angle_degree" : fields[1],
-            # L/R (left/right) of vessel heading
-            "wind_angle_direction" : fields[2],
-            # Wind speed in knots, to the nearest 0.1 knot
-            "wind_speed_knots" : fields[3],
-            # Wind speed, meters per second
-            "wind_speed_mps" : fields[5],
-            # Wind speed, km/hr
-            "wind_speed_kph" : fields[7]
-        }
+    fields = (
+        # (Apparent) Wind angle relative to the vessel, 0-180 degree
+        ("wind_angle_degree", 1, _number),
+        # L/R (left/right) of vessel heading
+        ("wind_angle_direction", 2, _side),
+        # Wind speed in knots, to the nearest 0.1 knot
+        ("wind_speed_knots", 3, _number),
+        # Wind speed, meters per second
+        ("wind_speed_mps", 5, _number),
+        # Wind speed, km/hr
+        ("wind_speed_kph", 7, _number),
+    )
 
 
-        
 class WIVWT(NmeaSentence):
+    fields = (
+        # True wind angle, 0-180, to the nearest degree
+        ("wind_angle_degree", 1, _number),
+        # L/R (left/right) of vessel heading
+        ("wind_angle_direction", 2, _side),
+        # Wind speed, knots, mps, kph
+        ("wind_speed_knots", 3, _number),
+        ("wind_speed_mps", 5, _number),
+        ("wind_speed_kph", 7, _number),
+    )
+
+
+class YXXDR(NmeaSentence):
+    """ Transducer measurements, sent as any number of (type, value, units,
+    name) groups, e.g. A,-1.2,D,PTCH for pitch in degrees. Records are keyed
+    by transducer name. """
+
     def update_data(self, nmea_map, fields):
         nmea_map[fields[0]] = {
-            # True wind angle, 0-180, to the nearest degree
-            "wind_angle_degree" : fields[1],
-            # L/R (left/right) of vessel heading
-            "wind_angle_direction" : fields[2],
-            # Wind speed, knots, mps, kph
-            "wind_speed_knots" : fields[3],
-            "wind_speed_mps" : fields[5],
-            "wind_speed_kph" : fields[7]
+            fields[index + 3]: {
+                # Transducer type, e.g. A angular displacement, C temperature
+                "type": fields[index],
+                "value": fields[index + 1],
+                # Units, e.g. D degrees, C celsius
+                "units": _field(fields, index + 2)
+            } for index in range(1, len(fields) - 3, 4)
         }
 
-        
+    def new_record(self):
+        return {}
+
+    def decode(self, fields, record):
+        try:
+            for index in range(1, len(fields) - 3, 4):
+                value = fields[index + 1]
+                record[fields[index + 3]] = None if value is None else float(value)
+        except ValueError:
+            raise InvalidSentenceException()
 
-class YXXDR(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
 
 class GPZDA(NmeaSentence):
-    def update_data(self, nmea_map, fields):
-        pass
+    fields = (
+        # UTC, in the form hhmmss.ss (seconds since midnight when decoded)
+        ("utc_time", 1, _utc_time),
+        # Day, 01-31
+        ("day", 2, _count),
+        # Month, 01-12
+        ("month", 3, _count),
+        # Year
+        ("year", 4, _count),
+        # Local zone hours and minutes offset from UTC
+        ("local_zone_hours", 5, _count),
+        ("local_zone_minutes", 6, _count),
+    )
+
+# Sentence id -> shared interface, built once at import
+SENTENCES = {sentence.__name__: sentence() for sentence in (
+    GPDTM, GPGGA, GPGLL, GPGSA, GPGSV, HCHDG, HCHDT, WIMDA, WIMWD, WIMWV,
+    GPRMC, TIROT, HCTHS, GPVTG, WIVWR, WIVWT, YXXDR, GPZDA
+)}
 
 def get_sentence_interface(sentence_id):
     """ Returns the class interface for sentence id"""
     try:
-        return getattr(sys.modules[__name__], sentence_id)()
-    except AttributeError:
-        # Invalid sid provided
-        return None
+        return SENTENCES.get(sentence_id)
     except TypeError:
-        # sid is not string
-        return None
\ No newline at end of file
+        # sid is not hashable
+        return None
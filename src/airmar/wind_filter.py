@@ -0,0 +1,164 @@
+import math
+from collections import deque
+
+
+class WindFilter:
+    """ Smooths wind readings and tracks gust and shift statistics.
+
+    Readings are averaged as vectors (speed * (cos, sin) of angle) so that
+    angles wrap correctly, e.g. 359 and 1 degree average to 0. The filter
+    keeps an exponential moving average (a fixed weight per reading, or a
+    time constant so the weight follows the time between readings), and
+    running sums over a time window for circular mean/variance, gusts and
+    shifts. All state is plain floats, so a reading allocates nothing but
+    its window entry.
+    """
+
+    def __init__(self, weight=0.3, time_constant=None, window=None):
+        """ Builds a new wind filter.
+
+        Keyword Arguments:
+        weight -- weight of each new reading in moving average (0 - 1),
+            used when time_constant is None.
+        time_constant -- time constant of moving average in seconds, None
+            to use fixed weight.
+        window -- length of statistics window in seconds, None to keep no
+            statistics.
+
+        Returns:
+        A new wind filter
+        """
+        self.weight = weight
+        self.time_constant = time_constant
+        self.window = window
+
+        # moving average of wind vector
+        self.x = None
+        self.y = None
+        self.last_time = None
+
+        # readings in window as (time, speed, cos, sin), and their sums
+        self.readings = deque()
+        self.gusts = deque()        # (time, speed) with decreasing speeds, so first is max
+        self.lulls = deque()        # (time, speed) with increasing speeds, so first is min
+        self.sum_speed = 0.
+        self.sum_speed_sq = 0.
+        self.sum_cos = 0.
+        self.sum_sin = 0.
+
+    def update(self, speed, angle, time=None):
+        """ Adds a reading.
+
+        Keyword Arguments:
+        speed -- wind speed
+        angle -- wind angle in degrees
+        time -- time of reading in seconds (needed for time constant and
+            window)
+
+        Returns:
+        (speed, angle) of moving average, angle in degrees (0 - 360)
+        """
+        rad = math.radians(angle)
+        cos, sin = math.cos(rad), math.sin(rad)
+
+        if self.x is None:
+            self.x, self.y = speed * cos, speed * sin
+        else:
+            weight = self._weight(time)
+            self.x += weight * (speed * cos - self.x)
+            self.y += weight * (speed * sin - self.y)
+        self.last_time = time
+
+        if self.window is not None and time is not None:
+            self._add_reading(time, speed, cos, sin)
+
+        return self.speed, self.angle
+
+    @property
+    def speed(self):
+        """ Speed of moving average """
+        return math.hypot(self.x, self.y) if self.x is not None else None
+
+    @property
+    def angle(self):
+        """ Angle of moving average in degrees (0 - 360) """
+        if self.x is None:
+            return None
+        return math.degrees(math.atan2(self.y, self.x)) % 360
+
+    def stats(self):
+        """ Gets statistics of readings in window.
+
+        Returns:
+        dictionary of
+            samples -- number of readings in window
+            mean_speed -- mean speed
+            speed_std -- standard deviation of speed
+            mean_angle -- circular mean of angles in degrees (0 - 360)
+            circular_variance -- 1 - mean resultant length (0 steady - 1 no
+                prevailing direction)
+            angle_std -- circular standard deviation of angles in degrees
+            gust -- highest speed
+            lull -- lowest speed
+            gust_factor -- gust / mean speed
+            shift -- angle of moving average minus mean angle in degrees
+                (-180 - 180, positive is clockwise)
+        None if window is empty.
+        """
+        n = len(self.readings)
+        if n == 0:
+            return None
+
+        mean_speed = self.sum_speed / n
+        variance = max(self.sum_speed_sq / n - mean_speed * mean_speed, 0.)
+        resultant = min(math.hypot(self.sum_cos, self.sum_sin) / n, 1.)
+        mean_angle = math.degrees(math.atan2(self.sum_sin, self.sum_cos)) % 360
+        angle_std = math.degrees(math.sqrt(-2 * math.log(resultant))) if resultant > 0 else 180.
+        gust = self.gusts[0][1]
+
+        return {
+            "samples": n,
+            "mean_speed": mean_speed,
+            "speed_std": math.sqrt(variance),
+            "mean_angle": mean_angle,
+            "circular_variance": 1 - resultant,
+            "angle_std": angle_std,
+            "gust": gust,
+            "lull": self.lulls[0][1],
+            "gust_factor": gust / mean_speed if mean_speed > 0 else None,
+            "shift": (self.angle - mean_angle + 180) % 360 - 180
+        }
+
+    def _weight(self, time):
+        """ Gets weight of a new reading in moving average """
+        if self.time_constant is None or time is None or self.last_time is None:
+            return self.weight
+        dt = max(time - self.last_time, 0.)
+        return 1 - math.exp(-dt / self.time_constant) if self.time_constant > 0 else 1.
+
+    def _add_reading(self, time, speed, cos, sin):
+        """ Adds reading to window and drops readings older than window """
+        self.readings.append((time, speed, cos, sin))
+        self.sum_speed += speed
+        self.sum_speed_sq += speed * speed
+        self.sum_cos += cos
+        self.sum_sin += sin
+
+        while self.gusts and self.gusts[-1][1] <= speed:
+            self.gusts.pop()
+        self.gusts.append((time, speed))
+        while self.lulls and self.lulls[-1][1] >= speed:
+            self.lulls.pop()
+        self.lulls.append((time, speed))
+
+        start = time - self.window
+        while self.readings[0][0] < start:
+            _, old_speed, old_cos, old_sin = self.readings.popleft()
+            self.sum_speed -= old_speed
+            self.sum_speed_sq -= old_speed * old_speed
+            self.sum_cos -= old_cos
+            self.sum_sin -= old_sin
+        while self.gusts[0][0] < start:
+            self.gusts.popleft()
+        while self.lulls[0][0] < start:
+            self.lulls.popleft()
@@ -40,11 +40,27 @@ class Arduino(Thread):
         """ Runs the arduino comms thread """
         print("Started arduino thread")
         while self.is_active:
-            for val in self.data.values():
-                pass            # send over UART
-            print(time.time())
+            self.send_data()
             time.sleep(self.update_interval)
 
+    def send_data(self):
+        """ Sends actuator angles to arduino """
+        for val in self.data.values():
+            pass            # send over UART
+
+    def schedule(self, runtime):
+        """
+        Sends actuator angles every update interval on an async runtime instead of running as a thread
+        Inputs:
+            runtime -- AsyncRuntime to schedule on
+        """
+        runtime.every(self.update_interval, self._send_if_active, name="arduino send")
+
+    def _send_if_active(self):
+        """ Sends actuator angles while controls are enabled """
+        if self.is_active:
+            self.send_data()
+
     def update_rudder_ang(self, rudder_ang):
         """ udpates rudder angle from pub sub """
         self.data["rudder_ang"] = rudder_ang
@@ -1,21 +1,19 @@
 import os
 
-import yaml
-
 from src.hardware.pin import make_pin
 from src.hardware.port import make_port
+from src.utils.config_cache import load_config
 
 def read_pin_config(mock_bbio=None, path=None):
     """Reads the pin configuration from config.yml and returns matching pin 
     dictionary"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        if mock_bbio is None:
-            pin = make_pin(conf["pin"])
-        else:
-            pin = make_pin(conf["pin"], mock_lib=mock_bbio.UART)
+    conf = load_config(path + "/config.yml")
+    if mock_bbio is None:
+        pin = make_pin(conf["pin"])
+    else:
+        pin = make_pin(conf["pin"], mock_lib=mock_bbio.UART)
 
     return pin 
 
@@ -24,20 +22,18 @@ def read_port_config(mock_port=None, path=None):
     returns matching port dictionary"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        if mock_port is None:
-            port = make_port(config=conf["port"])
-        else:
-            port = make_port(config=conf["port"], mock_port=mock_port)
+    conf = load_config(path + "/config.yml")
+    if mock_port is None:
+        port = make_port(config=conf["port"])
+    else:
+        port = make_port(config=conf["port"], mock_port=mock_port)
     return port
 
 def read_arduino_config(path=None):
     """Reads the arduino configuration from config.yml and returns config dictionary"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        arduino_config = conf["arduino"]
+    conf = load_config(path + "/config.yml")
+    arduino_config = conf["arduino"]
 
     return arduino_config
@@ -1,5 +1,4 @@
 from threading import Thread, Lock
-from time import sleep
 import math
 
 from pubsub import pub
@@ -7,6 +6,7 @@ from pubsub import pub
 from src.autopilot.route import Route
 from src.autopilot.helmsman import Helmsman
 from src.autopilot.config_reader import read_gain, read_interval, long_tol, lat_tol
+from src.utils.clock import sleep
 
 
 mutex = Lock()
@@ -35,6 +35,7 @@ class Autopilot(Thread):
         self.lat_tol = lat_tol()
         self.on_standby = False
         pub.subscribe(self.add_to_route, "waypoints")
+        pub.subscribe(self.on_config_changed, "config changed")
 
     def run(self):
         """Runs the autopilot thread"""
@@ -49,6 +50,18 @@ class Autopilot(Thread):
 
                 sleep(self.helm_interval)
 
+    def on_config_changed(self, module, key, value):
+        """Picks up helm interval and waypoint tolerances changed in config while running"""
+        if module != "autopilot":
+            return
+
+        if key == "autohelm interval":
+            self.helm_interval = value
+        elif key == "latitude tolerance":
+            self.lat_tol = value
+        elif key == "longitude tolerance":
+            self.long_tol = value
+
     def update_route(self):
         """Checks to see if we can remove a waypoint"""
         mutex.acquire()
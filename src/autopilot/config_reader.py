@@ -1,46 +1,44 @@
-import yaml
 import os
 
+from src.utils.config_cache import load_config
+from src.utils.config_service import parse_config_value
+
 
 def read_gain(path=None):
     """Reads the read interval from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        gain = conf["rudder gain"]
+    conf = load_config(path + "/config.yml")
+    gain = conf["rudder gain"]
 
-    return eval(str(gain))
+    return parse_config_value(gain)
 
 
 def read_interval(path=None):
     """Reads the read interval from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        helm_interval = conf["autohelm interval"]
+    conf = load_config(path + "/config.yml")
+    helm_interval = conf["autohelm interval"]
 
-    return eval(str(helm_interval))
+    return parse_config_value(helm_interval)
 
 
 def lat_tol(path=None):
-    """Reads the read interval from config.yml"""
+    """Reads the latitude tolerance from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        helm_interval = conf["longitude tolerance"]
+    conf = load_config(path + "/config.yml")
+    tolerance = conf["latitude tolerance"]
 
-    return eval(str(helm_interval))
+    return parse_config_value(tolerance)
 
 
 def long_tol(path=None):
-    """Reads the read interval from config.yml"""
+    """Reads the longitude tolerance from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        helm_interval = conf["latitude tolerance"]
+    conf = load_config(path + "/config.yml")
+    tolerance = conf["longitude tolerance"]
 
-    return eval(str(helm_interval))
+    return parse_config_value(tolerance)
@@ -8,6 +8,12 @@ class Helmsman:
     def __init__(self, rudder_gain):
         """Builds a new helmsman with the specified rudder gain"""
         self.rudder_gain = rudder_gain
+        pub.subscribe(self.on_config_changed, "config changed")
+
+    def on_config_changed(self, module, key, value):
+        """Picks up rudder gain changed in config while running"""
+        if (module, key) == ("autopilot", "rudder gain"):
+            self.rudder_gain = value
 
     def turn_to(self, target_heading, boat):
         """Calculates and sets the rudder angle.
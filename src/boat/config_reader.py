@@ -1,13 +1,13 @@
-import yaml
 import os
 
+from src.utils.config_cache import load_config
+
 
 def upwind_angle(path=None):
     """Reads the read interval from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        angle = conf["upwind angle"]
+    conf = load_config(path + "/config.yml")
+    angle = conf["upwind angle"]
 
     return angle
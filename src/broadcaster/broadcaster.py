@@ -1,6 +1,9 @@
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
+from threading import Event, Lock, Thread
+from time import monotonic
 
 from pubsub import pub
 
@@ -24,6 +27,11 @@ class Broadcaster(ABC):
         """
         pass
 
+    def close(self):
+        """ Releases anything the broadcaster holds open (nothing by
+        default). """
+        pass
+
 
 class TestableBroadcaster(Broadcaster):
     """ A broadcaster built to test methods that need to broadcast."""
@@ -33,8 +41,11 @@ class TestableBroadcaster(Broadcaster):
         self.data = None
 
     def publish_dictionary(self, data):
-        """ Saves data to broadcaster's dictionary """
-        self.data = data
+        """ Saves data to broadcaster's dictionary (keeping the last
+        value published for each key, as a subscriber would) """
+        if self.data is None:
+            self.data = {}
+        self.data.update(data)
         
 
 class Messenger(Broadcaster):
@@ -57,32 +68,144 @@ class Messenger(Broadcaster):
 
 
 class FileWriter(Broadcaster):
-    """Implements an interface to write data to file. """
+    """Implements an interface to write data to file.
+
+    By default the file is opened, appended to and closed on every publish.
+    When buffered, the file stays open and formatted lines are batched in
+    memory, then written once the batch reaches buffer_size bytes or
+    flush_interval seconds have passed since the last write (checked on
+    publish, or by a background thread). fsync_interval trades durability
+    for flash wear: None leaves syncing to the OS, 0 syncs every write, and
+    n syncs at most every n seconds.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, buffered=False, buffer_size=64 * 1024,
+                 flush_interval=1., background_flush=False, fsync_interval=None):
         """ FileWriter implementation of broadcaster.
 
         Keyword Arguments:
         filename -- the name of the file to read/write to.
+        buffered -- keep the file open and batch writes.
+        buffer_size -- bytes batched before they are written.
+        flush_interval -- longest time (in s) lines stay batched, None for
+            no limit.
+        background_flush -- write batched lines from a background thread
+            every flush interval, so they are written even when publishes
+            stop.
+        fsync_interval -- time (in s) between fsyncs after writes, 0 for
+            every write, None to never fsync.
         """
         super().__init__()
         self.filename = filename
         self.line_format = "[{0:20s}]\t\t[Requested: {1} -- Data: {2}]\n"
-    
+
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+
+        self.file = None
+        self.batch = []
+        self.batch_bytes = 0
+        self.last_flush = monotonic()
+        self.last_fsync = None
+        self.lock = Lock()
+
+        # counters
+        self.lines_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+
+        self.stopped = Event()
+        self.flush_thread = None
+        if buffered and background_flush and flush_interval:
+            self.flush_thread = Thread(target=self._flush_periodically, name="file writer flush", daemon=True)
+            self.flush_thread.start()
+
     def publish_dictionary(self, data):
         """ Writes a formated dictionary update to file.
 
         Keyword Arguments:
         data -- The data dictionary containing key-value pair to write to file.
         """
-        f = open(self.filename, "a")
-
-        for key in data:
-            f.write(self.line_format.format(datetime.now().__str__(), key, data[key]))
-        f.close()
-
-
-def make_broadcaster(broadcaster_type=None, filename=None):
+        now = datetime.now().__str__()
+        lines = [self.line_format.format(now, key, data[key]) for key in data]
+
+        if not self.buffered:
+            with open(self.filename, "a") as f:
+                f.writelines(lines)
+            return
+
+        with self.lock:
+            self.batch.extend(lines)
+            self.batch_bytes += sum(len(line) for line in lines)
+            if self.batch_bytes >= self.buffer_size or self._flush_due():
+                self._flush()
+
+    def flush(self):
+        """ Writes batched lines to file. """
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        """ Writes batched lines, stops the flush thread and closes the
+        file. """
+        self.stopped.set()
+        if self.flush_thread is not None and self.flush_thread.is_alive():
+            self.flush_thread.join()
+        with self.lock:
+            self._flush()
+            if self.file is not None:
+                if self.fsync_interval is not None:
+                    self._fsync()
+                self.file.close()
+                self.file = None
+
+    def stats(self):
+        """ Gets counters of lines written, writes and fsyncs, and the
+        number of lines batched. """
+        with self.lock:
+            return {"lines_written": self.lines_written, "flushes": self.flushes,
+                    "fsyncs": self.fsyncs, "batched_lines": len(self.batch)}
+
+    def _flush_due(self):
+        """ Checks whether batched lines have waited the flush interval. """
+        return self.flush_interval is not None and monotonic() - self.last_flush >= self.flush_interval
+
+    def _flush(self):
+        """ Writes batched lines to file (lock must be held). """
+        self.last_flush = monotonic()
+        if not self.batch:
+            return
+
+        if self.file is None:
+            self.file = open(self.filename, "a")
+        self.file.write("".join(self.batch))
+        self.file.flush()
+        self.lines_written += len(self.batch)
+        self.flushes += 1
+        self.batch = []
+        self.batch_bytes = 0
+
+        if self.fsync_interval is not None and \
+                (self.last_fsync is None or self.last_flush - self.last_fsync >= self.fsync_interval):
+            self._fsync()
+
+    def _fsync(self):
+        """ Forces written lines to disk (lock must be held). """
+        os.fsync(self.file.fileno())
+        self.last_fsync = monotonic()
+        self.fsyncs += 1
+
+    def _flush_periodically(self):
+        """ Writes batched lines every flush interval until closed. """
+        while not self.stopped.wait(self.flush_interval):
+            with self.lock:
+                if self._flush_due():
+                    self._flush()
+
+
+def make_broadcaster(broadcaster_type=None, filename=None, file_writer=None):
     """Creates a new broadcaster.
 
     Implements the factory pattern.
@@ -91,6 +214,8 @@ def make_broadcaster(broadcaster_type=None, filename=None):
     broadcaster_type -- The type of broadaster to create
     filename -- File name of file to write data to.
         Default: None if not needed.
+    file_writer -- Dictionary of FileWriter buffering settings
+        (buffered, buffer_size, ...). Default: None, unbuffered.
 
     Returns:
     The correct broadcaster for the environment.
@@ -98,5 +223,5 @@ def make_broadcaster(broadcaster_type=None, filename=None):
     if broadcaster_type == BroadcasterType.Messenger:
         return Messenger()
     if broadcaster_type == BroadcasterType.FileWriter:
-        return FileWriter(filename)
+        return FileWriter(filename, **(file_writer or {}))
     return TestableBroadcaster()
@@ -0,0 +1,179 @@
+import struct
+
+from src.utils.clock import get_clock
+
+# Capture file: magic, then one record per read of (time since capture start in s, length) followed by the bytes read
+CAPTURE_MAGIC = b"SBCAP1\n"
+_RECORD = struct.Struct("<dI")
+
+
+class CaptureWriter():
+    """Writes bytes read from a port to a capture file, timestamped with time since the capture started"""
+
+    def __init__(self, path):
+        """Initializes capture writer
+        Inputs:
+            path -- path of capture file (overwritten)
+        """
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(CAPTURE_MAGIC)
+        self.start = None
+
+    def write(self, data, timestamp=None):
+        """
+        Adds bytes to capture
+        Inputs:
+            data -- bytes read from port (empty reads are skipped)
+            timestamp -- time bytes were read (in s, defaults to now on installed clock)
+        """
+        if len(data) == 0:
+            return
+        if timestamp is None:
+            timestamp = get_clock().time()
+        if self.start is None:
+            self.start = timestamp
+
+        self.file.write(_RECORD.pack(timestamp - self.start, len(data)))
+        self.file.write(data)
+
+    def flush(self):
+        """Flushes capture to disk"""
+        self.file.flush()
+
+    def close(self):
+        """Closes capture file"""
+        self.file.close()
+
+    @property
+    def closed(self):
+        """True once capture file is closed"""
+        return self.file.closed
+
+    def reopen(self):
+        """Reopens closed capture file, appending to the same capture (times stay relative to its start)"""
+        if self.file.closed:
+            self.file = open(self.path, "ab")
+
+
+def read_capture(path):
+    """
+    Reads capture file
+    Inputs:
+        path -- path of capture file
+    Returns:
+        records -- list of (time since capture start in s, bytes)
+    """
+    with open(path, "rb") as capture:
+        data = capture.read()
+
+    if not data.startswith(CAPTURE_MAGIC):
+        raise ValueError("{} is not a capture file".format(path))
+
+    records = []
+    offset = len(CAPTURE_MAGIC)
+    while offset + _RECORD.size <= len(data):
+        timestamp, length = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        records.append((timestamp, data[offset:offset + length]))
+        offset += length
+
+    return records
+
+
+class ReplayDevice():
+    """
+    Stands in for a serial device (the subset of pyserial used by SerialPort), returning the bytes of a capture file
+    as they were originally read. With speed 1 bytes become readable at their original times, with speed n n times
+    faster, and with speed 0 each read returns the next recorded read, as fast as they are asked for.
+    """
+
+    def __init__(self, path=None, speed=1., records=None):
+        """Initializes replay device
+        Inputs:
+            path -- path of capture file
+            speed -- replay speed relative to real time (0 for as fast as possible)
+            records -- list of (time in s, bytes) to replay instead of reading path
+        """
+        self.records = read_capture(path) if records is None else records
+        self.speed = speed
+        self.index = 0          # next record to return
+        self.start = None       # clock time replay started
+        self.is_open = False
+        self.bytes_written = 0
+
+    @property
+    def finished(self):
+        """True once every recorded byte has been read"""
+        return self.index >= len(self.records)
+
+    def open(self):
+        self.is_open = True
+        self.start = get_clock().time()
+
+    def close(self):
+        self.is_open = False
+
+    def isOpen(self):
+        return self.is_open
+
+    def write(self, data):
+        """Discards bytes written (a replay has nothing to send them to)"""
+        self.bytes_written += len(data)
+        return len(data)
+
+    def inWaiting(self):
+        """Returns number of recorded bytes that are due to be read"""
+        return sum(len(data) for _, data in self.records[self.index:self._due()])
+
+    def read(self, size=1):
+        """Returns due recorded bytes (whole records, at most size bytes unless one record is larger)"""
+        end = self._due()
+        chunks, length = [], 0
+        while self.index < end and (length == 0 or length + len(self.records[self.index][1]) <= size):
+            chunks.append(self.records[self.index][1])
+            length += len(chunks[-1])
+            self.index += 1
+        return b"".join(chunks)
+
+    def _due(self):
+        """Returns index after last record due to be read"""
+        if self.speed == 0:
+            return min(self.index + 1, len(self.records))
+
+        elapsed = (get_clock().time() - self.start) * self.speed
+        end = self.index
+        while end < len(self.records) and self.records[end][0] <= elapsed:
+            end += 1
+        return end
+
+
+class RecordingDevice():
+    """Wraps a serial device, writing every byte read from it to a capture file"""
+
+    def __init__(self, device, path):
+        """Initializes recording device
+        Inputs:
+            device -- serial device to read from (e.g. serial.Serial)
+            path -- path of capture file (overwritten)
+        """
+        self.device = device
+        self.writer = CaptureWriter(path)
+
+    def read(self, size=1):
+        data = self.device.read(size=size)
+        self.writer.write(data)
+        return data
+
+    def open(self):
+        # SerialPort closes the device before opening it, so recording continues in the same capture
+        self.writer.reopen()
+        self.device.open()
+
+    def close(self):
+        self.device.close()
+        self.writer.close()
+
+    def __getattr__(self, name):
+        # everything else (open, write, isOpen, inWaiting, fileno, ...) goes to device
+        return getattr(self.device, name)
@@ -0,0 +1,105 @@
+class LineFramer():
+    """
+    Splits a stream of bytes into terminated lines. Incoming bytes are appended to one buffer; consumed lines only
+    advance a read offset (the buffer is compacted occasionally), and the terminator search resumes where the last one
+    stopped, so each byte is scanned once no matter how the stream is chunked.
+    """
+
+    def __init__(self, terminator=b'\r\n', max_line_length=1024):
+        """Initializes line framer
+        Inputs:
+            terminator -- bytes ending each line
+            max_line_length -- longest line kept (in bytes, including terminator); longer partial lines are dropped
+        """
+        self.terminator = terminator
+        self.max_line_length = max_line_length
+
+        self.buffer = bytearray()
+        self.start = 0          # offset of first unconsumed byte
+        self.scan = 0           # offset to resume terminator search from
+
+        self.lines_framed = 0       # number of complete lines returned
+        self.partial_frames = 0     # number of overlong partial lines dropped
+        self.bytes_dropped = 0      # number of bytes dropped with them
+
+    def __len__(self):
+        """Returns number of unconsumed bytes"""
+        return len(self.buffer) - self.start
+
+    def set_terminator(self, terminator):
+        """
+        Changes line terminator (buffered bytes are searched again)
+        Inputs:
+            terminator -- bytes ending each line
+        """
+        if terminator != self.terminator:
+            self.terminator = terminator
+            self.scan = self.start
+
+    def feed(self, data):
+        """
+        Adds bytes to stream
+        Inputs:
+            data -- bytes read from stream
+        """
+        self.buffer += data
+
+    def next_line(self):
+        """
+        Returns next complete line (including terminator) as bytes, or None if no complete line is buffered
+        """
+        end = self.buffer.find(self.terminator, self.scan)
+        if end < 0:
+            # resume search where a terminator split across reads could start
+            self.scan = max(self.start, len(self.buffer) - len(self.terminator) + 1)
+            if len(self) > self.max_line_length:
+                self._drop_partial()
+            return None
+
+        end += len(self.terminator)
+        line = bytes(self.buffer[self.start:end])
+        self.start = self.scan = end
+        self.lines_framed += 1
+
+        self._compact()
+        return line
+
+    def lines(self):
+        """Yields every complete line currently buffered"""
+        line = self.next_line()
+        while line is not None:
+            yield line
+            line = self.next_line()
+
+    def pending(self):
+        """Returns unconsumed bytes (start of a line not yet terminated)"""
+        return bytes(self.buffer[self.start:])
+
+    def clear(self, data=b''):
+        """
+        Discards buffered bytes
+        Inputs:
+            data -- bytes to start buffer with
+        """
+        self.buffer[:] = data
+        self.start = self.scan = 0
+
+    def stats(self):
+        """Returns dict of framer counters"""
+        return {'lines_framed': self.lines_framed, 'partial_frames': self.partial_frames,
+                'bytes_dropped': self.bytes_dropped, 'buffered_bytes': len(self)}
+
+    def _drop_partial(self):
+        """Drops buffered partial line that is longer than any valid line"""
+        self.partial_frames += 1
+        self.bytes_dropped += len(self)
+        self.clear()
+
+    def _compact(self):
+        """Removes consumed bytes once they make up most of the buffer"""
+        if self.start == len(self.buffer):
+            self.clear()
+        elif self.start > 4096 and 2 * self.start > len(self.buffer):
+            del self.buffer[:self.start]
+            self.scan -= self.start
+            self.start = 0
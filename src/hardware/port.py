@@ -1,13 +1,17 @@
-import re
 from abc import ABC, abstractmethod
 from enum import Enum
 
 import serial
 
+from src.hardware.capture import RecordingDevice, ReplayDevice
+from src.hardware.line_framer import LineFramer
+
 
 class PortType(Enum):
     TESTABLE = 0,
-    SERIAL = 1
+    SERIAL = 1,
+    REPLAY = 2,
+    RECORD = 3
 
 
 class Port(ABC):
@@ -37,6 +41,16 @@ class Port(ABC):
         """ Reads in next line from port. """
         pass
 
+    @abstractmethod
+    def read_lines(self, terminator='\n'):
+        """ Reads in every complete line waiting on port. """
+        pass
+
+    @abstractmethod
+    def bytes_waiting(self):
+        """ Counts bytes received but not yet returned as lines. """
+        pass
+
     @abstractmethod
     def write(self, msg):
         """ Writes message to port. """
@@ -76,6 +90,12 @@ class TestablePort(Port):
     def read_line(self, terminator='\n'):
         return self.value + terminator
 
+    def read_lines(self, terminator='\n'):
+        return [self.read_line(terminator)]
+
+    def bytes_waiting(self):
+        return 0
+
     def read(self):
         return self.value
 
@@ -90,7 +110,17 @@ class SerialPort(Port):
         super().__init__(config)
         self.encoding = config["encoding"]
         self.port = port
-        self.remaining_input = bytearray()
+        self.framer = LineFramer(max_line_length=config.get("max_line_length", 1024))
+        self.undecodable_lines = 0      # lines dropped because they were not valid in encoding (e.g. line noise)
+
+    @property
+    def remaining_input(self):
+        """Bytes read from port that are not yet part of a complete line"""
+        return bytearray(self.framer.pending())
+
+    @remaining_input.setter
+    def remaining_input(self, remaining_input):
+        self.framer.clear(remaining_input)
 
     def open(self):
         # Fix for force quit serial bug
@@ -125,31 +155,84 @@ class SerialPort(Port):
 
         Returns:
         line as string, None if port not opened.
+        Lines that can not be decoded are skipped (counted in framer_stats).
         """
-        terminator = terminator.encode(self.encoding)
-        checks = 0
-        # TODO: # checks to config
-        while self.is_open() and checks <= 100:
-            line = bytearray()
-            if len(self.remaining_input) > 0:
-                line = self.remaining_input
-                self.remaining_input = bytearray()
-            
-            next_bytes = bytearray(self.read())
-            if len(next_bytes) > 0:
-                line.extend(next_bytes)
-
-            if len(line) > 0 and re.search(terminator, line):
-                data, self.remaining_input = line.split(terminator, 1)
-                line = bytearray()
-                # appends terminator back
-                data.extend(terminator)
-                # full line read, so we can decode.
-                return bytes(data).decode(self.encoding)
-            self.remaining_input = line
-            checks += 1
-        return None
+        if not self.is_open():
+            return None
+
+        self.framer.set_terminator(terminator.encode(self.encoding))
+        while True:
+            line = self.framer.next_line()
+            # read until a line is complete or the port has nothing more waiting
+            while line is None:
+                next_bytes = self.read()
+                if len(next_bytes) == 0:
+                    return None
+                self.framer.feed(next_bytes)
+                line = self.framer.next_line()
+
+            # full line read, so we can decode.
+            line = self._decode(line)
+            if line is not None:
+                return line
+
+    def read_lines(self, terminator='\n'):
+        """ Reads in every complete line waiting on serial port.
 
+        Key Arguments:
+        terminator -- line terminator to look for as a string.
+            Default: '\n'
+
+        Returns:
+        list of lines as strings (empty if port not opened).
+        Lines that can not be decoded are skipped (counted in framer_stats).
+        """
+        if not self.is_open():
+            return []
+
+        self.framer.set_terminator(terminator.encode(self.encoding))
+        next_bytes = self.read()
+        if len(next_bytes) > 0:
+            self.framer.feed(next_bytes)
+
+        lines = (self._decode(line) for line in self.framer.lines())
+        return [line for line in lines if line is not None]
+
+    def bytes_waiting(self):
+        """ Counts bytes received but not yet returned as lines.
+
+        Returns:
+        bytes waiting on serial port plus bytes of partial line read.
+        """
+        try:
+            waiting = self.port.inWaiting()
+        except:
+            waiting = 0
+        return waiting + len(self.framer)
+
+    def fileno(self):
+        """ Returns file descriptor of serial port (to wait on for data). """
+        return self.port.fileno()
+
+    def framer_stats(self):
+        """ Returns counts of lines framed, partial lines dropped and
+        lines dropped because they could not be decoded. """
+        stats = self.framer.stats()
+        stats['undecodable_lines'] = self.undecodable_lines
+        return stats
+
+    def _decode(self, line):
+        """ Decodes a framed line, counting and dropping it if it is not
+        valid in the port's encoding.
+
+        Returns:
+        line as string, None if it could not be decoded.
+        """
+        try:
+            return line.decode(self.encoding)
+        except UnicodeDecodeError:
+            self.undecodable_lines += 1
+            return None
 
     def close(self):
         self.port.close()
@@ -166,14 +249,24 @@ def make_port(config, mock_port=None):
     The type of port specified in the config.
     """
     port_type = PortType[config["port_type"]]
-    if port_type == PortType.SERIAL:
+    if port_type in (PortType.SERIAL, PortType.RECORD):
         if mock_port is None:
             port = serial.Serial(
                 port=config["port_name"],
                 baudrate=config["baudrate"],
                 timeout=config["timeout"]
             )
-            return SerialPort(config=config, port=port)
-        return SerialPort(config=config, port=mock_port)
+        else:
+            port = mock_port
+        if port_type == PortType.RECORD:
+            # tee everything read to capture file
+            port = RecordingDevice(port, config["capture_file"])
+        return SerialPort(config=config, port=port)
+    elif port_type == PortType.REPLAY:
+        if mock_port is None:
+            port = ReplayDevice(config["capture_file"], speed=config.get("replay_speed", 1))
+        else:
+            port = mock_port
+        return SerialPort(config=config, port=port)
     else:
         return TestablePort(config=config)
@@ -0,0 +1,471 @@
+import argparse
+import bisect
+import datetime
+import json
+import mmap
+import os
+import struct
+import time
+
+# Log file: magic, header length and JSON header (log header, config files, start time), then records. Each record
+# starts with its type:
+#   author record -- author id, name length, name (UTF-8); written before the first message by that author
+#   message record -- time since log start (ns), author id, payload type, payload length, payload
+# Index file (log path + INDEX_SUFFIX): magic, then author records (as in the log) and block records, one per block
+# of messages: time of first and last message (ns), offsets of start and end of block in log, message count, author
+# count, author ids
+LOG_MAGIC = b"SBLOG1\n"
+INDEX_MAGIC = b"SBIDX1\n"
+INDEX_SUFFIX = ".idx"
+
+_AUTHOR = 1
+_MESSAGE = 2
+_BLOCK = 3
+
+_HEADER_LENGTH = struct.Struct("<I")
+_TYPE = struct.Struct("<B")
+_AUTHOR_RECORD = struct.Struct("<HH")
+_MESSAGE_RECORD = struct.Struct("<QHBI")
+_BLOCK_RECORD = struct.Struct("<QQQQIH")
+
+# payload types
+NONE = 0
+BOOL = 1
+INT = 2
+FLOAT = 3
+STRING = 4
+JSON = 5
+
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+
+# datetime of log records, as written by Logger and returned by both log readers (sorts in time order as a string).
+# JSON logs written before log headers had a start time only record whole seconds, in LEGACY_DATETIME_FORMAT.
+LOG_DATETIME_FORMAT = '%Y-%m-%d // %H:%M:%S.%f'
+LEGACY_DATETIME_FORMAT = '%Y-%m-%d // %H:%M:%S'
+
+
+def encode_payload(msg):
+    """
+    Encodes message as typed payload
+    Inputs:
+        msg -- message (None, bool, int, float, str, or anything else JSON can encode)
+    Returns:
+        payload_type -- type of payload
+        payload -- encoded message bytes
+    """
+    if msg is None:
+        return NONE, b""
+    if isinstance(msg, bool):
+        return BOOL, b"\x01" if msg else b"\x00"
+    if isinstance(msg, int) and -2 ** 63 <= msg < 2 ** 63:
+        return INT, _INT.pack(msg)
+    if isinstance(msg, float):
+        return FLOAT, _FLOAT.pack(msg)
+    if isinstance(msg, str):
+        return STRING, msg.encode("utf-8")
+    return JSON, json.dumps(msg).encode("utf-8")
+
+
+def decode_payload(payload_type, payload):
+    """
+    Decodes typed payload
+    Inputs:
+        payload_type -- type of payload
+        payload -- encoded message bytes
+    Returns:
+        msg -- message
+    """
+    if payload_type == NONE:
+        return None
+    if payload_type == BOOL:
+        return payload != b"\x00"
+    if payload_type == INT:
+        return _INT.unpack(payload)[0]
+    if payload_type == FLOAT:
+        return _FLOAT.unpack(payload)[0]
+    if payload_type == STRING:
+        return bytes(payload).decode("utf-8")
+    if payload_type == JSON:
+        return json.loads(bytes(payload).decode("utf-8"))
+    raise ValueError("unknown payload type {}".format(payload_type))
+
+
+def monotonic_ns():
+    """Returns monotonic time (in ns)"""
+    return int(time.monotonic() * 1e9)
+
+
+def datetime_from_ns(wall_ns):
+    """
+    Converts wall time to local datetime (to the microsecond)
+    Inputs:
+        wall_ns -- time (in ns since epoch)
+    Returns:
+        timestamp -- datetime
+    """
+    return datetime.datetime.fromtimestamp(wall_ns // 10 ** 9) + \
+        datetime.timedelta(microseconds=(wall_ns % 10 ** 9) // 1000)
+
+
+def ns_from_datetime(timestamp):
+    """
+    Converts local datetime to wall time, exactly (datetime.timestamp() rounds through a float)
+    Inputs:
+        timestamp -- datetime
+    Returns:
+        wall_ns -- time (in ns since epoch)
+    """
+    return int(timestamp.replace(microsecond=0).timestamp()) * 10 ** 9 + timestamp.microsecond * 1000
+
+
+class BinaryLogWriter():
+    """
+    Writes log records in the binary log format, and a sparse index of blocks of records alongside. Authors are
+    interned to small ids and record times are nanoseconds on the monotonic clock since the log started, so records
+    keep their sub-second order even if the wall clock is set (e.g. from gps time) while logging.
+    """
+
+    def __init__(self, path, header=None, configs=None, block_size=256, start_time_ns=None):
+        """
+        Initializes binary log writer (the log and index files are overwritten)
+        Inputs:
+            path -- path of log file
+            header -- dict of log header values
+            configs -- dict of config file path -> parsed config
+            block_size -- number of messages per index block
+            start_time_ns -- wall time log started (in ns since epoch, defaults to now)
+        """
+        self.path = path
+        self.block_size = block_size
+        self.start_ns = monotonic_ns()
+        self.authors = {}           # name -> id
+
+        header = dict(header or {})
+        if start_time_ns is None:
+            start_time_ns = int(time.time() * 1e9)
+        header['start_time_ns'] = start_time_ns
+        header['configs'] = configs or {}
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        self.file = open(path, "wb")
+        self.file.write(LOG_MAGIC + _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes)
+        self.offset = self.file.tell()
+        self.index = open(path + INDEX_SUFFIX, "wb")
+        self.index.write(INDEX_MAGIC)
+        self._new_block()
+
+    def write(self, author, msg, t_ns=None):
+        """
+        Writes message record
+        Inputs:
+            author -- author of message
+            msg -- message (see encode_payload)
+            t_ns -- monotonic time of message (in ns, defaults to now)
+        """
+        if t_ns is None:
+            t_ns = monotonic_ns()
+        t_ns = max(t_ns - self.start_ns, 0)
+
+        author_id = self.authors.get(author)
+        if author_id is None:
+            author_id = self._add_author(author)
+
+        payload_type, payload = encode_payload(msg)
+        record = _TYPE.pack(_MESSAGE) + _MESSAGE_RECORD.pack(t_ns, author_id, payload_type, len(payload)) + payload
+        self.file.write(record)
+
+        if self.block_count == 0:
+            self.block_first = t_ns
+        self.block_last = max(self.block_last, t_ns)
+        self.block_count += 1
+        self.block_authors.add(author_id)
+        self.offset += len(record)
+        if self.block_count >= self.block_size:
+            self._end_block()
+
+    def flush(self):
+        """Flushes log and index to disk (the index only covers whole blocks)"""
+        self.file.flush()
+        self.index.flush()
+
+    def close(self):
+        """Indexes last block and closes log and index"""
+        self._end_block()
+        self.file.close()
+        self.index.close()
+
+    def _add_author(self, author):
+        """Interns author, writing its author record to log and index"""
+        author_id = len(self.authors)
+        if author_id > 0xFFFF:
+            raise ValueError("too many log authors")
+        self.authors[author] = author_id
+
+        name = str(author).encode("utf-8")
+        record = _TYPE.pack(_AUTHOR) + _AUTHOR_RECORD.pack(author_id, len(name)) + name
+        self.file.write(record)
+        self.offset += len(record)
+        self.index.write(record)
+        return author_id
+
+    def _new_block(self):
+        self.block_offset = self.offset
+        self.block_first = 0
+        self.block_last = 0
+        self.block_count = 0
+        self.block_authors = set()
+
+    def _end_block(self):
+        """Writes index record for current block"""
+        if self.block_count == 0:
+            return
+        authors = sorted(self.block_authors)
+        self.index.write(_TYPE.pack(_BLOCK) +
+                         _BLOCK_RECORD.pack(self.block_first, self.block_last, self.block_offset, self.offset,
+                                            self.block_count, len(authors)) +
+                         struct.pack("<{}H".format(len(authors)), *authors))
+        self._new_block()
+
+
+class BinaryLogReader():
+    """
+    Reads binary logs. With an index, reads of a time range or of some authors only read the blocks that can hold
+    matching records; without one (e.g. the writer did not close the log) the whole log is scanned.
+    """
+
+    def __init__(self, path, use_mmap=False):
+        """
+        Initializes binary log reader, reading the log header and index
+        Inputs:
+            path -- path of log file
+            use_mmap -- read records through an mmap of the log instead of buffered reads
+        """
+        self.path = path
+        self.use_mmap = use_mmap
+        with open(path, "rb") as logfile:
+            if logfile.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                raise ValueError("{} is not a binary log".format(path))
+            length = _HEADER_LENGTH.unpack(logfile.read(_HEADER_LENGTH.size))[0]
+            self.header = json.loads(logfile.read(length).decode("utf-8"))
+            self.data_offset = logfile.tell()
+
+        self.config_dict = self.header.pop('configs', {})
+        self.start_time_ns = self.header['start_time_ns']
+        self.authors = {}       # id -> name
+        self.blocks = None      # list of (first t_ns, last t_ns, offset, count, author ids), None without an index
+        self.indexed_end = None     # offset of end of last indexed block
+        self._read_index()
+
+    def read_log(self, start=None, end=None, author=None):
+        """
+        Reads log records as a generator, oldest first
+        Inputs:
+            start -- earliest time of records (in s since log start)
+            end -- latest time of records (in s since log start)
+            author -- author, or list of authors, of records
+        Returns:
+            records -- dicts with datetime (LOG_DATETIME_FORMAT), time (s since log start), author and msg
+        """
+        start_ns = None if start is None else int(start * 1e9)
+        end_ns = None if end is None else int(end * 1e9)
+        author_ids = self._author_ids(author)
+
+        with self._open_log() as logfile:
+            for offset, count in self._ranges(start_ns, end_ns, author_ids):
+                logfile.seek(offset)
+                for t_ns, author_id, msg in self._read_records(logfile, count):
+                    if start_ns is not None and t_ns < start_ns:
+                        continue
+                    if end_ns is not None and t_ns > end_ns:
+                        if self.blocks is None:
+                            return
+                        continue
+                    if author_ids is not None and author_id not in author_ids:
+                        continue
+                    yield self._record(t_ns, author_id, msg)
+
+    def _open_log(self):
+        """Opens log for reading records, as a file or an mmap of it"""
+        logfile = open(self.path, "rb")
+        if not self.use_mmap:
+            return logfile
+        try:
+            return mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            logfile.close()         # mmap keeps its own handle
+
+    def _record(self, t_ns, author_id, msg):
+        """Builds record dict"""
+        timestamp = datetime_from_ns(self.start_time_ns + t_ns)
+        return {'datetime': timestamp.strftime(LOG_DATETIME_FORMAT), 'time': t_ns / 1e9,
+                'author': self.authors.get(author_id), 'msg': msg}
+
+    def _author_ids(self, author):
+        """Returns set of ids of authors (None for every author)"""
+        if author is None:
+            return None
+        if self.blocks is None:
+            self._scan_authors()
+        names = [author] if isinstance(author, str) else author
+        return {author_id for author_id, name in self.authors.items() if name in names}
+
+    def _ranges(self, start_ns, end_ns, author_ids):
+        """Yields (offset, number of messages) of blocks that may hold matching records"""
+        if self.blocks is None:
+            yield self.data_offset, None
+            return
+
+        # blocks are in time order, so skip straight to the first that ends after start
+        first = 0
+        if start_ns is not None:
+            first = bisect.bisect_left(self._block_ends, start_ns)
+        for first_ns, _, offset, count, authors in self.blocks[first:]:
+            if end_ns is not None and first_ns > end_ns:
+                return
+            if author_ids is not None and author_ids.isdisjoint(authors):
+                continue
+            yield offset, count
+
+        # messages written after the last indexed block (log not closed)
+        yield self.indexed_end, None
+
+    def _read_records(self, logfile, count):
+        """Yields (t_ns, author id, msg) of the next count messages (every message to end of log if count is None)"""
+        read = 0
+        while count is None or read < count:
+            record_type = logfile.read(_TYPE.size)
+            if len(record_type) < _TYPE.size:
+                return
+            record_type = _TYPE.unpack(record_type)[0]
+
+            if record_type == _AUTHOR:
+                author_id, length = _AUTHOR_RECORD.unpack(logfile.read(_AUTHOR_RECORD.size))
+                self.authors[author_id] = logfile.read(length).decode("utf-8")
+            elif record_type == _MESSAGE:
+                fields = logfile.read(_MESSAGE_RECORD.size)
+                if len(fields) < _MESSAGE_RECORD.size:
+                    return      # record cut off (log still being written)
+                t_ns, author_id, payload_type, length = _MESSAGE_RECORD.unpack(fields)
+                payload = logfile.read(length)
+                if len(payload) < length:
+                    return
+                read += 1
+                yield t_ns, author_id, decode_payload(payload_type, payload)
+            else:
+                raise ValueError("unknown record type {} in {}".format(record_type, self.path))
+
+    def _read_index(self):
+        """Reads author table and blocks from index, if there is one"""
+        try:
+            with open(self.path + INDEX_SUFFIX, "rb") as index:
+                data = index.read()
+        except FileNotFoundError:
+            return
+        if not data.startswith(INDEX_MAGIC):
+            return
+
+        blocks = []
+        offset = len(INDEX_MAGIC)
+        while offset < len(data):
+            record_type = data[offset]
+            offset += _TYPE.size
+            if record_type == _AUTHOR:
+                author_id, length = _AUTHOR_RECORD.unpack_from(data, offset)
+                offset += _AUTHOR_RECORD.size
+                self.authors[author_id] = data[offset:offset + length].decode("utf-8")
+                offset += length
+            elif record_type == _BLOCK:
+                first_ns, last_ns, block_offset, block_end, count, num_authors = _BLOCK_RECORD.unpack_from(data, offset)
+                offset += _BLOCK_RECORD.size
+                authors = struct.unpack_from("<{}H".format(num_authors), data, offset)
+                offset += 2 * num_authors
+                blocks.append((first_ns, last_ns, block_offset, count, frozenset(authors)))
+                self.indexed_end = block_end
+            else:
+                return          # damaged index, scan log instead
+
+        if blocks:
+            self.blocks = blocks
+            # latest time seen up to each block, so bisect finds the first block that can end after a time
+            self._block_ends = []
+            latest = 0
+            for block in blocks:
+                latest = max(latest, block[1])
+                self._block_ends.append(latest)
+
+    def _scan_authors(self):
+        """Reads author records from whole log (when there is no index)"""
+        with self._open_log() as logfile:
+            logfile.seek(self.data_offset)
+            for _ in self._read_records(logfile, None):
+                pass
+
+
+def convert_json_log(json_path, binary_path=None, block_size=256):
+    """
+    Converts a JSON log (as written by Logger) to the binary log format. The binary log starts when the JSON log did
+    (at its first record for logs without a start time), so both read back the same records for the same start and
+    end. JSON logs record times to the microsecond (legacy ones to the second), so records with the same datetime
+    keep their order but are given the same time.
+    Inputs:
+        json_path -- path of JSON log
+        binary_path -- path of binary log (defaults to json_path with extension .blog)
+        block_size -- number of messages per index block
+    Returns:
+        binary_path -- path of binary log
+    """
+    if binary_path is None:
+        binary_path = os.path.splitext(json_path)[0] + ".blog"
+
+    with open(json_path, "r") as infile:
+        header = json.loads(infile.readline())
+        configs = {}
+        for _ in range(header.get('num_config_files', 0)):
+            configs.update(json.loads(infile.readline()))
+        records = [json.loads(line) for line in infile if line.strip()]
+
+    times = [parse_log_datetime(record.get('datetime')) for record in records]
+    known = [t for t in times if t is not None]
+    if header.get('start_time_ns') is not None:
+        start = datetime_from_ns(header['start_time_ns'])
+    else:
+        start = known[0] if known else None
+
+    writer = BinaryLogWriter(binary_path, header=header, configs=configs, block_size=block_size,
+                             start_time_ns=None if start is None else ns_from_datetime(start))
+    last_ns = 0
+    for record, t in zip(records, times):
+        if t is not None:
+            last_ns = max((t - start) // datetime.timedelta(microseconds=1) * 1000, last_ns)
+        writer.write(record.get('author'), record.get('msg'), t_ns=writer.start_ns + last_ns)
+    writer.close()
+    return binary_path
+
+
+def parse_log_datetime(text):
+    """
+    Parses datetime string of a log record
+    Inputs:
+        text -- datetime string written by Logger (LOG_DATETIME_FORMAT or LEGACY_DATETIME_FORMAT), or ISO format
+    Returns:
+        timestamp -- datetime, or None if text can not be parsed
+    """
+    for fmt in (LOG_DATETIME_FORMAT, LEGACY_DATETIME_FORMAT, '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(text, fmt)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def main():
+    """Converts JSON logs given on the command line to binary logs"""
+    parser = argparse.ArgumentParser(description="Converts JSON logs to binary logs")
+    parser.add_argument("logs", nargs="+", help="JSON log files")
+    for json_path in parser.parse_args().logs:
+        print("{} -> {}".format(json_path, convert_json_log(json_path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import glob
+import json
+import math
+import os
+import re
+from numbers import Number
+
+import numpy as np
+
+from src.logging.binary_log import parse_log_datetime
+from src.logging.log_reader import logReader, scan_logs
+
+# Exported columns: one .npy structured array per author (so they can be memory-mapped on load; .npz archives can
+# not be) and an index mapping authors to file names
+INDEX_FILE = "columns.json"
+
+
+def collect_logs(logs):
+    """
+    Groups logs by author (used by log_columns, in worker processes when reading many logs)
+    Inputs:
+        logs -- iterable of logs (dicts with datetime, author and msg)
+    Returns:
+        samples -- dict of author -> (list of times in s since epoch, list of msgs)
+    """
+    samples = {}
+    for log in logs:
+        timestamp = parse_log_datetime(log.get('datetime'))
+        if timestamp is None:
+            continue
+        times, msgs = samples.setdefault(log.get('author'), ([], []))
+        times.append(timestamp.timestamp())
+        msgs.append(log.get('msg'))
+    return samples
+
+
+def log_columns(infiles, processes=1, **filters):
+    """
+    Reads logs into per-author structured arrays, sorted by time. Every array has a time field (s since epoch)
+    and fields for the messages:
+        numbers (and None) -- value (float, NaN for None)
+        dicts -- one field per key (float for numbers, otherwise str)
+        anything else -- value (str)
+    Inputs:
+        infiles -- log file path, directory of logs, or list of them
+        processes -- number of worker processes reading logs (1 reads them in this process)
+        filters -- start, end, author and predicate as for logReader.read_log
+    Returns:
+        columns -- dict of author -> structured array
+    """
+    paths = find_logs(infiles)
+    if processes == 1:
+        results = []
+        for path in paths:
+            reader = logReader(path)
+            try:
+                results.append(collect_logs(reader.read_log(**filters)))
+            finally:
+                reader.close()
+    else:
+        results = scan_logs(paths, func=collect_logs, processes=processes, **filters).values()
+
+    samples = {}
+    for result in results:
+        for author, (times, msgs) in result.items():
+            all_times, all_msgs = samples.setdefault(author, ([], []))
+            all_times.extend(times)
+            all_msgs.extend(msgs)
+
+    return {author: _to_array(times, msgs) for author, (times, msgs) in samples.items()}
+
+
+def find_logs(infiles):
+    """
+    Lists log files
+    Inputs:
+        infiles -- log file path, directory of logs (*.log and *.blog), or list of them
+    Returns:
+        paths -- sorted list of log file paths
+    """
+    if isinstance(infiles, str):
+        infiles = [infiles]
+
+    paths = []
+    for infile in infiles:
+        if os.path.isdir(infile):
+            paths.extend(glob.glob(os.path.join(infile, "*.log")) + glob.glob(os.path.join(infile, "*.blog")))
+        else:
+            paths.append(infile)
+    return sorted(paths)
+
+
+def export_columns(infiles, outdir, processes=1, **filters):
+    """
+    Exports logs as one .npy structured array per author (see log_columns)
+    Inputs:
+        infiles -- log file path, directory of logs, or list of them
+        outdir -- directory to write arrays to (created if needed)
+        processes -- number of worker processes reading logs
+        filters -- start, end, author and predicate as for logReader.read_log
+    Returns:
+        index -- dict of author -> file name of its array in outdir
+    """
+    os.makedirs(outdir, exist_ok=True)
+    index = {}
+    for author, column in log_columns(infiles, processes=processes, **filters).items():
+        name = _file_name(author, index.values())
+        np.save(os.path.join(outdir, name), column)
+        index[author] = name
+
+    with open(os.path.join(outdir, INDEX_FILE), "w") as outfile:
+        json.dump(index, outfile)
+    return index
+
+
+def load_columns(outdir, authors=None, mmap_mode="r"):
+    """
+    Loads exported columns, memory-mapped so only the parts used are read
+    Inputs:
+        outdir -- directory columns were exported to
+        authors -- authors to load (defaults to every author)
+        mmap_mode -- numpy mmap mode ("r" read only, "c" copy on write, None to read into memory)
+    Returns:
+        columns -- dict of author -> structured array
+    """
+    with open(os.path.join(outdir, INDEX_FILE), "r") as infile:
+        index = json.load(infile)
+    if authors is not None:
+        index = {author: index[author] for author in authors}
+    return {author: np.load(os.path.join(outdir, name), mmap_mode=mmap_mode) for author, name in index.items()}
+
+
+def resample(columns, period=None, times=None, field="value", method="previous"):
+    """
+    Aligns numeric columns of several authors on one time grid
+    Inputs:
+        columns -- dict of author -> structured array (e.g. from log_columns or load_columns)
+        period -- time (in s) between samples of grid spanning every column (used if times is None)
+        times -- array of times (in s since epoch) to sample at
+        field -- field of each array to sample (authors without it as a float field are skipped)
+        method -- "previous" holds the last value logged at or before each time, "linear" interpolates
+    Returns:
+        resampled -- structured array with time and one float field per author (NaN before an author's first
+                     sample, and after its last with "linear")
+    """
+    columns = {author: column for author, column in columns.items()
+               if column.dtype.names is not None and field in column.dtype.names and
+               column.dtype[field].kind == "f" and len(column) > 0}
+
+    if times is None:
+        if period is None:
+            raise ValueError("resample needs a period or times")
+        start = min(column["time"][0] for column in columns.values()) if columns else 0.
+        end = max(column["time"][-1] for column in columns.values()) if columns else 0.
+        times = start + period * np.arange(int(math.floor((end - start) / period)) + 1)
+    times = np.asarray(times, dtype=float)
+
+    resampled = np.empty(len(times), dtype=[("time", "f8")] + [(str(author), "f8") for author in columns])
+    resampled["time"] = times
+    for author, column in columns.items():
+        column_times = np.asarray(column["time"])
+        values = np.asarray(column[field])
+        if method == "linear":
+            resampled[str(author)] = np.interp(times, column_times, values, left=np.nan, right=np.nan)
+        elif method == "previous":
+            indices = np.searchsorted(column_times, times, side="right") - 1
+            sampled = values[np.maximum(indices, 0)]
+            sampled[indices < 0] = np.nan
+            resampled[str(author)] = sampled
+        else:
+            raise ValueError("unknown resample method {!r}".format(method))
+    return resampled
+
+
+def _is_number(msg):
+    return msg is None or isinstance(msg, Number)
+
+
+def _to_array(times, msgs):
+    """Builds structured array sorted by time from times and msgs of one author"""
+    order = np.argsort(np.asarray(times, dtype=float), kind="stable")
+    times = [times[ii] for ii in order]
+    msgs = [msgs[ii] for ii in order]
+
+    if all(isinstance(msg, dict) for msg in msgs) and msgs:
+        keys = []
+        for msg in msgs:
+            keys.extend(key for key in msg if key not in keys)
+        fields = [(str(key), [msg.get(key) for msg in msgs]) for key in keys]
+    else:
+        fields = [("value", msgs)]
+
+    dtype = [("time", "f8")]
+    values = []
+    for name, field_values in fields:
+        if all(_is_number(value) for value in field_values):
+            dtype.append((name, "f8"))
+            values.append([np.nan if value is None else float(value) for value in field_values])
+        else:
+            field_values = ["" if value is None else _to_str(value) for value in field_values]
+            dtype.append((name, "U{}".format(max(1, max(len(value) for value in field_values)))))
+            values.append(field_values)
+
+    array = np.empty(len(times), dtype=dtype)
+    array["time"] = times
+    for (name, _), field_values in zip(dtype[1:], values):
+        array[name] = field_values
+    return array
+
+
+def _to_str(value):
+    """Formats non-numeric message value as str (JSON for lists and dicts)"""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _file_name(author, taken):
+    """Returns unique file name for author's array"""
+    base = re.sub(r"[^A-Za-z0-9_.-]", "_", str(author)) or "author"
+    name, ii = base + ".npy", 1
+    while name in taken:
+        ii += 1
+        name = "{}_{}.npy".format(base, ii)
+    return name
+
+
+def main():
+    """Exports logs given on the command line to columns"""
+    parser = argparse.ArgumentParser(description="Exports logs as one NumPy array per author")
+    parser.add_argument("logs", nargs="+", help="log files or directories of logs")
+    parser.add_argument("--out", required=True, help="directory to write arrays to")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (defaults to CPUs)")
+    args = parser.parse_args()
+    for author, name in sorted(export_columns(args.logs, args.out, processes=args.processes).items()):
+        print("{} -> {}".format(author, os.path.join(args.out, name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,239 @@
+import datetime
 import json
+import mmap
 import pdb
+from functools import partial
+from multiprocessing import Pool
 from pprint import pprint as pp
 
+from src.logging.binary_log import BinaryLogReader, LEGACY_DATETIME_FORMAT, LOG_DATETIME_FORMAT, LOG_MAGIC, \
+    datetime_from_ns, parse_log_datetime
+
+# JSON log records are written by json.dump as {"datetime": "<datetime>", "author": <author>, "msg": <msg>}
+_DATETIME_KEY = b'"datetime": "'
+_AUTHOR_KEY = b'"author": '
+
 class logReader():
     """
-    Class that allows for log readback
+    Class that allows for log readback, of JSON logs or binary logs (see binary_log)
+
+    Logs are streamed from the file (or from an mmap of it), so memory use does not grow with the log. Filters are
+    checked on the raw line before it is decoded where they can be: lines whose author or datetime can not match are
+    skipped without json.loads.
     """
-    def __init__(self, infile):
+    def __init__(self, infile, use_mmap=False):
         """
         Initialization of reader
         Reads header and config files
 
         Keyword arguments:
         infile -- File path to log file to be read
-        """ 
+        use_mmap -- read the log through an mmap of the file instead of buffered reads
+        """
         self.infile = infile
-        self.logfile = open(self.infile, 'r');
+        self.use_mmap = use_mmap
         self.lineno = 0
+        with open(self.infile, 'rb') as logfile:
+            is_binary = logfile.read(len(LOG_MAGIC)) == LOG_MAGIC
+
+        self.binary = None
+        if is_binary:
+            self.binary = BinaryLogReader(self.infile, use_mmap=use_mmap)
+            self.header = self.binary.header
+            self.config_dict = self.binary.config_dict
+            return
+
+        self.logfile = open(self.infile, 'rb');
         self.read_header()
         self.read_configs()
+        self.data_offset = self.logfile.tell()
+        self.first_datetime = None
 
     def read_header(self):
         """
         Reads header and stores as dictionary
         """
-        self.header = json.loads(self.logfile.readline())
+        self.header = json.loads(self.logfile.readline().decode('utf-8'))
         self.lineno += 1
 
     def read_configs(self):
         """
         Reads config files and stores as dictionary
         """
-        num_config_files = self.header['num_config_files'] 
+        num_config_files = self.header['num_config_files']
         self.config_dict = {}
         for n in range(num_config_files):
-            temp_config_dict = json.loads(self.logfile.readline())
+            temp_config_dict = json.loads(self.logfile.readline().decode('utf-8'))
             self.lineno += 1
             self.config_dict.update(temp_config_dict)
 
-    def read_log(self):
+    def close(self):
+        """
+        Closes log file
+        """
+        if self.binary is None:
+            self.logfile.close()
+
+    def read_log(self, start=None, end=None, author=None, predicate=None):
         """
         Reads log line by line as a generator
         Create generator by calling:
             example_generator = exampleLogReader.read_log()
         Obtain logs one by one by calling:
             exampleLog = example_generator.__next__()
-        
+
+        Binary logs seek straight to the records in the time range and of the authors asked for; JSON logs are read
+        from the start. Both give the same records for the same start and end (see convert_json_log).
+
+        Keyword arguments:
+        start -- earliest time of logs (in s since log start, or since first log for JSON logs without a start time)
+        end -- latest time of logs (in s since log start, or since first log for JSON logs without a start time)
+        author -- author, or list of authors, of logs
+        predicate -- function of a log returning whether to read it (checked after the other filters)
+
         Returns:
-        A log with datetime, pin number, and a message
+        A log with datetime (LOG_DATETIME_FORMAT, or LEGACY_DATETIME_FORMAT for legacy JSON logs), pin number, and a
+        message
+        """
+        if self.binary is not None:
+            logs = self.binary.read_log(start=start, end=end, author=author)
+        else:
+            logs = self._read_json_log(start, end, author)
+
+        for log in logs:
+            if predicate is None or predicate(log):
+                yield log
+
+    def _read_json_log(self, start, end, author):
+        """
+        Reads JSON log records, skipping lines that can not match before decoding them
         """
-        for line in self.logfile.readlines():
-            yield json.loads(line)
+        authors = None
+        needles = None
+        if author is not None:
+            authors = [author] if isinstance(author, str) else list(author)
+            needles = [_AUTHOR_KEY + json.dumps(name).encode('utf-8') for name in authors]
+
+        # times are relative to log start, and datetime strings sort in time order, so the window is compared as
+        # strings
+        low = high = None
+        if start is not None or end is not None:
+            log_start = self._log_start()
+            if log_start is None:
+                return
+            if self.header.get('start_time_ns') is not None:
+                datetime_format = LOG_DATETIME_FORMAT
+            else:
+                datetime_format = LEGACY_DATETIME_FORMAT
+            if start is not None:
+                low = log_start + datetime.timedelta(seconds=start)
+                if datetime_format == LEGACY_DATETIME_FORMAT and low.microsecond:
+                    # legacy logs only know whole seconds, so the window starts at the next one
+                    low += datetime.timedelta(microseconds=10 ** 6 - low.microsecond)
+                low = low.strftime(datetime_format)
+            if end is not None:
+                high = (log_start + datetime.timedelta(seconds=end)).strftime(datetime_format)
+
+        for line in self._lines():
             self.lineno += 1
+            if needles is not None and not any(needle in line for needle in needles):
+                continue
+            if low is not None or high is not None:
+                datetime_str = _datetime_str(line)
+                if datetime_str is None or (low is not None and datetime_str < low) or \
+                        (high is not None and datetime_str > high):
+                    continue
+
+            log = json.loads(line.decode('utf-8'))
+            if authors is not None and log.get('author') not in authors:
+                continue            # author only appeared in msg
+            yield log
+
+    def _lines(self):
+        """
+        Yields lines (as bytes) after the header and config files
+        """
+        if not self.use_mmap:
+            self.logfile.seek(self.data_offset)
+            for line in self.logfile:
+                yield line
+            return
+
+        try:
+            data = mmap.mmap(self.logfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return          # empty file
+        try:
+            data.seek(self.data_offset)
+            line = data.readline()
+            while line:
+                yield line
+                line = data.readline()
+        finally:
+            data.close()
+
+    def _log_start(self):
+        """
+        Returns datetime log started, from its header (first log for logs without a start time)
+        """
+        if self.header.get('start_time_ns') is not None:
+            return datetime_from_ns(self.header['start_time_ns'])
+        return self._first_datetime()
+
+    def _first_datetime(self):
+        """
+        Returns datetime of first log that has one
+        """
+        if self.first_datetime is None:
+            self.logfile.seek(self.data_offset)
+            for line in self.logfile:
+                self.first_datetime = parse_log_datetime(_datetime_str(line))
+                if self.first_datetime is not None:
+                    break
+        return self.first_datetime
+
+
+def _datetime_str(line):
+    """
+    Returns datetime string of a raw JSON log line, or None if it has none
+    """
+    start = line.find(_DATETIME_KEY)
+    if start < 0:
+        return None
+    start += len(_DATETIME_KEY)
+    end = line.find(b'"', start)
+    if end < 0:
+        return None
+    return line[start:end].decode('utf-8')
+
+
+def _scan_log(infile, func, use_mmap, filters):
+    """
+    Reads one log for scan_logs (runs in a worker process)
+    """
+    reader = logReader(infile, use_mmap=use_mmap)
+    try:
+        return infile, func(reader.read_log(**filters))
+    finally:
+        reader.close()
+
+
+def scan_logs(infiles, func=list, processes=None, use_mmap=True, **filters):
+    """
+    Reads many logs in parallel worker processes, for batch analysis
+
+    Keyword arguments:
+    infiles -- File paths of logs to read
+    func -- function of a generator of logs, called in the worker for each log (defaults to list, which returns
+        every matching log; reducing there, e.g. counting, keeps results small). Must be picklable (defined at
+        module level).
+    processes -- number of worker processes (defaults to number of CPUs)
+    use_mmap -- read logs through an mmap
+    filters -- start, end, author and predicate as for read_log (predicate must be picklable)
+
+    Returns:
+    A dict of log file path -> func result
+    """
+    scan = partial(_scan_log, func=func, use_mmap=use_mmap, filters=filters)
+    with Pool(processes=processes) as pool:
+        return dict(pool.imap_unordered(scan, infiles))
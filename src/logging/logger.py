@@ -1,24 +1,95 @@
 import os
 import json
 import datetime
+import atexit
+import weakref
 import yaml
 import glob
+import time
+from collections import deque
+from enum import Enum
+from threading import Condition, Thread
 from pubsub import pub
 
+from src.logging.binary_log import BinaryLogWriter, LOG_DATETIME_FORMAT, monotonic_ns
+
+
+class DropPolicy(Enum):
+    """What write_msg does when the queue of records waiting to be written is full"""
+    NEWEST = 'newest'       # drop the record being written
+    OLDEST = 'oldest'       # drop the oldest waiting record
+    BLOCK = 'block'         # wait (up to block timeout) for the writer thread, then drop the record
+
+
 class Logger():
     """
     Class that allows processes to log messages in log files in JSON format
+
+    Messages are queued and written by a background writer thread in batches, so publishers (e.g. pin reads) never
+    wait on the disk. The queue is bounded; when it is full the drop policy decides which record is lost, and the
+    number of dropped records is counted in stats().
     """
-    def __init__(self):
-        self.outfile_name = self._get_file_name()       #Gets default log file name (SHOULD CHANGE DIRECTORY THAT LOGS GO IN
+    def __init__(self, asynchronous=True, queue_size=10000, drop_policy=DropPolicy.OLDEST, batch_size=512,
+                 flush_interval=0.5, block_timeout=0.1, binary=False):
+        """
+        Keyword arguments:
+        asynchronous -- write records from a background thread (False writes each record as it is logged)
+        queue_size -- most records waiting to be written
+        drop_policy -- DropPolicy applied when the queue is full
+        batch_size -- most records written per write call
+        flush_interval -- longest time (in s) the writer thread sleeps before writing queued records
+        block_timeout -- longest time (in s) write_msg waits for space with DropPolicy.BLOCK
+        binary -- write the binary log format (see binary_log) instead of JSON lines
+        """
+        os.makedirs('logs', exist_ok=True)
+        self.outfile_name = self._get_file_name('.blog' if binary else '.log')  #Gets default log file name (SHOULD CHANGE DIRECTORY THAT LOGS GO IN
         yml_file_list = self._find_config_files()       #Finds all config files in subdirectories
-        header_dict = {'file_name' : self.outfile_name, 'num_config_files': len(yml_file_list)}
-        with open(self.outfile_name, 'w') as outfile:
-            json.dump(header_dict, outfile)             #Write header to log file
-            outfile.write('\n')
-        self._record_config_files(yml_file_list)        #Write config files to log to track config values for each process
+        self.start_time_ns = int(time.time() * 1e9)     # log readers count record times from here
+        header_dict = {'file_name' : self.outfile_name, 'num_config_files': len(yml_file_list),
+                       'start_time_ns': self.start_time_ns}
+        self.binary = None
+        if binary:
+            configs = {}
+            for out_dict in self._load_config_files(yml_file_list):
+                configs.update(out_dict)
+            self.binary = BinaryLogWriter(self.outfile_name, header=header_dict, configs=configs,
+                                          start_time_ns=self.start_time_ns)
+        else:
+            with open(self.outfile_name, 'w') as outfile:
+                json.dump(header_dict, outfile)             #Write header to log file
+                outfile.write('\n')
+            self._record_config_files(yml_file_list)        #Write config files to log to track config values for each process
 
         self.log_dict = dict()
+
+        self.queue = deque()                # records waiting to be written; append/popleft are thread safe
+        self.queue_size = queue_size
+        self.drop_policy = DropPolicy(drop_policy)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.space = Condition()            # notified by writer thread after it takes records
+        self.wake = Condition()             # notified when records are queued
+        self.stopped = False
+        self.writing = False                # writer thread has taken records it has not written yet
+
+        # counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0                     # records (or flushes) the writer thread failed to write
+        self.last_error = None              # exception of last failed write
+        self.max_depth = 0
+
+        self.writer = None
+        if asynchronous:
+            if self.binary is None:
+                self.outfile = open(self.outfile_name, 'a')
+            self.writer = Thread(target=self._write_queued, name="log writer", daemon=True)
+            self.writer.start()
+            # through a weak reference, so a closed logger is not kept alive until exit
+            atexit.register(_close_logger, weakref.ref(self))
+
         pub.subscribe(self.write_msg, 'write msg')
 
     def _find_config_files(self):
@@ -42,14 +113,29 @@ class Logger():
         Keyword arguments:
         yml_file_list --  List of config.yml file paths
         """
+        for out_dict in self._load_config_files(yml_file_list):
+            with open(self.outfile_name, 'a') as outfile:
+                json.dump(out_dict, outfile)
+                outfile.write('\n')
+
+    def _load_config_files(self, yml_file_list):
+        """
+        Loads config files from yml format, publishing each as "config dict"
+
+        Keyword arguments:
+        yml_file_list --  List of config.yml file paths
+
+        Returns:
+        A list of {config file path: config dict}
+        """
+        out_dicts = []
         for config_file in yml_file_list:
             with open(config_file, 'r') as infile:
                 config_dict = yaml.safe_load(infile)
             out_dict = {config_file: config_dict}
-            with open(self.outfile_name, 'a') as outfile:
-                json.dump(out_dict, outfile)
-                outfile.write('\n')
-                pub.sendMessage("config dict", config_dict=out_dict)
+            pub.sendMessage("config dict", config_dict=out_dict)
+            out_dicts.append(out_dict)
+        return out_dicts
 
 
     def write_msg(self, author, msg):
@@ -60,15 +146,176 @@ class Logger():
         author -- author of message being written
         msg -- Message to be recorded (data on pin)
         """
+        if self.stopped:
+            return
 
         datetime_str = self._get_datetime_str()
         
         self.log_dict = {'datetime': datetime_str, 'author': author, 'msg': msg} 
 
-        with open(self.outfile_name, 'a') as outfile:
-            json.dump(self.log_dict, outfile)
-            outfile.write('\n')
+        # binary records keep the monotonic time the message was logged
+        record = self.log_dict if self.binary is None else (monotonic_ns(), author, msg)
+
+        if self.writer is None:
+            self.enqueued += 1
+            self._write_records([record])
+            if self.binary is not None:
+                self.binary.flush()
+            return
+
+        self._enqueue(record)
+
+    def flush(self, timeout=None):
+        """
+        Waits until every queued record has been written
+
+        Keyword arguments:
+        timeout -- longest time (in s) to wait, None for no limit
+
+        Returns:
+        True if the queue was emptied
+        """
+        if self.writer is None:
+            return True
+        with self.wake:
+            self.wake.notify()
+        with self.space:
+            return self.space.wait_for(lambda: not self.queue and not self.writing, timeout)
+
+    def close(self):
+        """
+        Stops logging messages, writes queued records, stops the writer thread and closes the log
+        """
+        if self.stopped:
+            return
+        self.stopped = True
+        pub.unsubscribe(self.write_msg, 'write msg')
+        if self.writer is not None:
+            with self.wake:
+                self.wake.notify()
+            self.writer.join()
+            if self.binary is None:
+                self.outfile.close()
+        if self.binary is not None:
+            self.binary.close()
+
+    def stats(self):
+        """
+        Returns dict of logger counters: records logged, written and dropped, failed writes, and current and largest
+        queue depth
+        """
+        return {'enqueued': self.enqueued, 'written': self.written, 'dropped': self.dropped, 'errors': self.errors,
+                'queue_depth': len(self.queue), 'max_queue_depth': self.max_depth}
+
+    def _enqueue(self, record):
+        """
+        Adds record to queue, applying drop policy if queue is full
+
+        Keyword arguments:
+        record -- log dict (or binary record) to write
+        """
+        if len(self.queue) >= self.queue_size:
+            if self.drop_policy is DropPolicy.NEWEST:
+                self.dropped += 1
+                return
+            if self.drop_policy is DropPolicy.OLDEST:
+                try:
+                    self.queue.popleft()
+                    self.dropped += 1
+                except IndexError:
+                    pass            # writer thread took it
+            else:
+                with self.space:
+                    if not self.space.wait_for(lambda: len(self.queue) < self.queue_size, self.block_timeout):
+                        self.dropped += 1
+                        return
+
+        self.queue.append(record)
+        self.enqueued += 1
+        depth = len(self.queue)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if depth >= self.batch_size:
+            with self.wake:
+                self.wake.notify()
+
+    def _write_queued(self):
+        """
+        Writer thread: writes queued records in batches until logger is closed and the queue is empty
+        """
+        while True:
+            with self.wake:
+                if not self.stopped and len(self.queue) < self.batch_size:
+                    self.wake.wait(self.flush_interval)
+
+            try:
+                while self.queue:
+                    self.writing = True
+                    records = []
+                    while self.queue and len(records) < self.batch_size:
+                        records.append(self.queue.popleft())
+                    with self.space:
+                        self.space.notify_all()
+                    self._write_batch(records)
+                (self.outfile if self.binary is None else self.binary).flush()
+            except Exception as exc:
+                self._write_failed(exc)
+            finally:
+                self.writing = False
+                with self.space:
+                    self.space.notify_all()
+
+            if self.stopped and not self.queue:
+                return
+
+    def _write_batch(self, records):
+        """
+        Writes records from writer thread, counting records that can not be written (e.g. a msg JSON can not encode)
+        in stats() instead of raising, so one bad record or failed write does not stop the writer thread
+
+        Keyword arguments:
+        records -- list of log dicts, or of (monotonic time in ns, author, msg) for binary logs
+        """
+        if self.binary is None:
+            try:
+                self._write_records(records)        # nothing is written if a record can not be encoded
+                return
+            except Exception:
+                pass
+
+        # binary records are written one by one, so retry one by one to find the ones that fail
+        for record in records:
+            try:
+                self._write_records([record])
+            except Exception as exc:
+                self._write_failed(exc)
+
+    def _write_failed(self, exc):
+        """
+        Counts a record (or flush) the writer thread failed to write
+
+        Keyword arguments:
+        exc -- exception raised writing it
+        """
+        self.errors += 1
+        self.last_error = exc
 
+    def _write_records(self, records):
+        """
+        Writes records to log
+
+        Keyword arguments:
+        records -- list of log dicts, or of (monotonic time in ns, author, msg) for binary logs
+        """
+        if self.binary is not None:
+            for t_ns, author, msg in records:
+                self.binary.write(author, msg, t_ns=t_ns)
+        elif self.writer is not None:
+            self.outfile.write(''.join(json.dumps(record) + '\n' for record in records))
+        else:
+            with open(self.outfile_name, 'a') as outfile:
+                outfile.write(''.join(json.dumps(record) + '\n' for record in records))
+        self.written += len(records)
 
     def _get_datetime_str(self):
         """
@@ -77,19 +324,34 @@ class Logger():
         Returns:
         A string formatted date and time
         """
-        return datetime.datetime.now().strftime('%Y-%m-%d // %H:%M:%S')
+        return datetime.datetime.now().strftime(LOG_DATETIME_FORMAT)
 
-    def _get_file_name(self):
+    def _get_file_name(self, extension='.log'):
         """
         Finds a filename for the output log file
 
+        Keyword arguments:
+        extension -- extension of the log file
+
         Returns:
         Filename for the log file
         """
         current_date = datetime.datetime.now().strftime('%Y_%m_%d')
         n = 1
-        temp_name = 'logs/' + current_date + '_%d.log' % n
+        temp_name = 'logs/' + current_date + '_%d' % n + extension
         while os.path.isfile(temp_name):                                    #Loops until open file name is found
             n += 1
-            temp_name = 'logs/' + current_date + '_%d.log' % n
+            temp_name = 'logs/' + current_date + '_%d' % n + extension
         return temp_name
+
+
+def _close_logger(logger_ref):
+    """
+    Closes logger at exit, if it still exists
+
+    Keyword arguments:
+    logger_ref -- weak reference to Logger
+    """
+    logger = logger_ref()
+    if logger is not None:
+        logger.close()
@@ -1,5 +1,4 @@
 from threading import Thread, Lock
-from time import sleep
 
 from pubsub import pub
 
@@ -8,6 +7,7 @@ from src.nav.tack_points import place_tacks
 from src.nav.config_reader import read_interval
 from src.nav.course import Course, Path
 from src.autopilot.autopilot import Autopilot
+from src.utils.clock import sleep
 
 
 mutex = Lock()
@@ -29,6 +29,7 @@ class Captain(Thread):
         else:
             self.course = Course()
         pub.subscribe(self.switch_mode, "set nav mode")
+        pub.subscribe(self.on_config_changed, "config changed")
 
     def run(self):
         """Runs the captain thread"""
@@ -51,6 +52,11 @@ class Captain(Thread):
             else:
                 self.autopilot.standby()
 
+    def on_config_changed(self, module, key, value):
+        """Picks up nav interval changed in config while running"""
+        if (module, key) == ("nav", "nav interval"):
+            self.nav_interval = value
+
     def switch_mode(self, mode):
         """Changes the navigation mode"""
         if mode is NavigationMode.AUTONOMOUS:
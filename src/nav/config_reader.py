@@ -1,13 +1,14 @@
-import yaml
 import os
 
+from src.utils.config_cache import load_config
+from src.utils.config_service import parse_config_value
+
 
 def read_interval(path=None):
     """Reads the read interval from config.yml"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        helm_interval = conf["nav interval"]
+    conf = load_config(path + "/config.yml")
+    helm_interval = conf["nav interval"]
 
-    return eval(str(helm_interval))
+    return parse_config_value(helm_interval)
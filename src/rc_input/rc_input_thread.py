@@ -1,6 +1,8 @@
 from threading import Thread
 from time import sleep
 
+from pubsub import pub
+
 from src.rc_input.config_reader import read_pin_config, read_interval
 from src.rc_input.rc_receiver import RCReceiver
 
@@ -18,9 +20,23 @@ class RCInputThread(Thread):
 
         self.keep_reading = True
         self.read_interval = read_interval()
+        pub.subscribe(self.on_config_changed, "config changed")
+
+    def on_config_changed(self, module, key, value):
+        """Picks up read interval changed in config while running"""
+        if (module, key) == ("rc_input", "read interval"):
+            self.read_interval = value
 
     def run(self):
         """Starts a regular input read interval."""
         while True:
             self.receiver.send_inputs()
             sleep(self.read_interval)
+
+    def schedule(self, runtime):
+        """
+        Reads inputs every read interval on an async runtime instead of running as a thread
+        Inputs:
+            runtime -- AsyncRuntime to schedule on
+        """
+        runtime.every(lambda: self.read_interval, self.receiver.send_inputs, name="rc read")
@@ -1,17 +1,15 @@
 import os
 
-import yaml
-
 from src.hardware.pin import make_pin
+from src.utils.config_cache import load_config
 
 
 def build_pin_from_config(path=None):
     """Reads the pin configuration from config.yml and returns a matching Pin"""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        pin = make_pin(conf["pins"]["RUDDER"])
+    conf = load_config(path + "/config.yml")
+    pin = make_pin(conf["pins"]["RUDDER"])
 
     return pin
 
@@ -20,9 +18,8 @@ def read_servo_config(path=None):
     """Reads the servo configuration from config.yml and returns a matching servo."""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        servo_config = conf["servos"]["MAIN"]
+    conf = load_config(path + "/config.yml")
+    servo_config = conf["servos"]["MAIN"]
 
     return servo_config
 
@@ -31,8 +28,7 @@ def read_rudder_config(path=None):
     """Reads the servo configuration from config.yml and returns a matching servo."""
     if path is None:
         path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + "/config.yml", "r") as yml:
-        conf = yaml.full_load(yml)
-        rudder_config = conf["rudder"]
+    conf = load_config(path + "/config.yml")
+    rudder_config = conf["rudder"]
 
     return rudder_config
@@ -0,0 +1,178 @@
+import numpy as np
+
+from src.utils.time_in_millis import time_in_millis
+
+class BatchKalmanFilter():
+    """
+    Structure-of-arrays store of kalman filters. Each track owns one slot (row) of the state and covariance arrays so
+    that predict and update run as single batched numpy operations over every track instead of one filterpy call per
+    track. Per-track behaviour (delta_t, process noise, bearing wraparound) matches KalmanFilter.
+    """
+
+    def __init__(self, capacity=32):
+        """Initialize batch kalman filter
+        Inputs:
+            capacity -- number of track slots to preallocate (grows as needed)
+        """
+        self.states = np.zeros((capacity, 4))                           # rows are r, bear, v_r, v_bear
+        self.covars = np.zeros((capacity, 4, 4))                        # covariance matrix for each track
+        self.last_time_changed = np.zeros(capacity, dtype=np.int64)     # last predict time for each track (ms)
+        self.delta_t = np.zeros(capacity)                               # last predict delta for each track (s)
+        self.active = np.zeros(capacity, dtype=bool)                    # whether slot is owned by a track
+
+        self.measurement_covar = np.eye(4)      # measurement covariance shared by every track
+
+        self._free_slots = list(range(capacity - 1, -1, -1))
+        self._active_slots = np.empty(0, dtype=np.intp)
+        self._slots_changed = False
+
+    def __len__(self):
+        """Returns number of tracks held in the store"""
+        return int(self.active_slots().size)
+
+    def add(self, state, covar, last_time_changed=None):
+        """Adds a track to the store
+        Inputs:
+            state -- state vector of track (r, bear, v_r, v_bear)
+            covar -- covariance matrix of track
+            last_time_changed -- time track was last predicted (in ms, defaults to now)
+        Returns:
+            slot -- index of row owned by track
+        """
+        if not self._free_slots:
+            self._grow()
+
+        slot = self._free_slots.pop()
+        self.states[slot] = state
+        self.covars[slot] = covar
+        self.last_time_changed[slot] = time_in_millis() if last_time_changed is None else last_time_changed
+        self.delta_t[slot] = 0
+        self.active[slot] = True
+        self._slots_changed = True
+
+        return slot
+
+    def remove(self, slot):
+        """Removes a track from the store, freeing its slot
+        Inputs:
+            slot -- index of row owned by track
+        """
+        if not self.active[slot]:
+            return
+
+        self.active[slot] = False
+        self._free_slots.append(slot)
+        self._slots_changed = True
+
+    def active_slots(self):
+        """Returns array of slots currently owned by tracks"""
+        if self._slots_changed:
+            self._active_slots = np.flatnonzero(self.active)
+            self._slots_changed = False
+
+        return self._active_slots
+
+    def predict(self, slots=None):
+        """Predicts next state of tracks
+        Inputs:
+            slots -- slots of tracks to predict (defaults to every track)
+        Side Effects:
+            self.states -- updates states through kalman predict
+            self.covars -- updates covariances through kalman predict
+            self.delta_t -- updates delta between current time and last time changed
+            self.last_time_changed -- updates last time changed to current time
+        """
+        slots = self.active_slots() if slots is None else np.asarray(slots, dtype=np.intp)
+        if slots.size == 0:
+            return
+
+        # update delta_t for every track
+        cur_time = time_in_millis()
+        delta_t = (cur_time - self.last_time_changed[slots]) / 1000.
+        self.last_time_changed[slots] = cur_time
+        self.delta_t[slots] = delta_t
+
+        state = self.states[slots]
+        covar = self.covars[slots]
+
+        # process noise (see KalmanFilter._update_process_noise)
+        with np.errstate(divide='ignore'):
+            bearing_scale_fac = 0.5 + 50*(np.power(state[:, 0], -2))
+        rng_noise = delta_t * (1 + np.abs(state[:, 2]))
+        bearing_noise = bearing_scale_fac * (1 + np.abs(state[:, 3])) * delta_t
+
+        # x = Fx (F only adds delta_t * velocity to position)
+        state[:, 0] += delta_t * state[:, 2]
+        state[:, 1] += delta_t * state[:, 3]
+
+        # P = FPF' + Q
+        covar[:, 0, :] += delta_t[:, None] * covar[:, 2, :]
+        covar[:, 1, :] += delta_t[:, None] * covar[:, 3, :]
+        covar[:, :, 0] += delta_t[:, None] * covar[:, :, 2]
+        covar[:, :, 1] += delta_t[:, None] * covar[:, :, 3]
+        covar[:, 0, 0] += rng_noise
+        covar[:, 2, 2] += rng_noise
+        covar[:, 1, 1] += bearing_noise
+        covar[:, 3, 3] += bearing_noise
+
+        # wrap bearings from -180 to 180
+        wrap = state[:, 1] > 180
+        state[wrap, 1] = -180. + (state[wrap, 1] % 180)
+
+        self.states[slots] = state
+        self.covars[slots] = covar
+
+    def update(self, slots, measurements):
+        """Updates tracks using measurements
+        Inputs:
+            slots -- slots of tracks to update
+            measurements -- array of measurements (r, bear, v_r, v_bear), one row per slot
+        Side Effects:
+            self.states -- updates states through kalman update
+            self.covars -- updates covariances through kalman update
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        if slots.size == 0:
+            return
+
+        state = self.states[slots]
+        covar = self.covars[slots]
+        measurement = np.asarray(measurements, dtype=np.float64).reshape(slots.size, 4)
+        measurement_covar = self.measurement_covar
+
+        # measurement transition matrix is identity, so Hx = x and HPH' = P
+        residual = measurement - state
+        system_uncertainty = covar + measurement_covar
+        gain = np.matmul(covar, np.linalg.inv(system_uncertainty))
+
+        state += np.einsum('nij,nj->ni', gain, residual)
+
+        # P = (I-K)P(I-K)' + KRK'
+        i_k = np.eye(4) - gain
+        covar = np.matmul(np.matmul(i_k, covar), i_k.transpose(0, 2, 1)) + \
+                np.matmul(np.matmul(gain, measurement_covar), gain.transpose(0, 2, 1))
+
+        self.states[slots] = state
+        self.covars[slots] = covar
+
+    def _grow(self):
+        """
+        Doubles the number of slots in the store
+        Side Effects:
+            self.states, self.covars, self.last_time_changed, self.delta_t, self.active -- resized
+        """
+        old_capacity = self.active.size
+        new_capacity = max(1, 2 * old_capacity)
+
+        def resize(arr):
+            new_arr = np.zeros((new_capacity,) + arr.shape[1:], dtype=arr.dtype)
+            new_arr[:old_capacity] = arr
+            return new_arr
+
+        self.states = resize(self.states)
+        self.covars = resize(self.covars)
+        self.last_time_changed = resize(self.last_time_changed)
+        self.delta_t = resize(self.delta_t)
+        self.active = resize(self.active)
+
+        self._free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
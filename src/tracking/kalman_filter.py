@@ -5,7 +5,20 @@ from src.utils.time_in_millis import time_in_millis
 
 from src.tracking.config_reader import read_kalman_config
 
+def _constant(arr):
+    """Returns read-only copy of array (shared between filters, so must never be written in place)"""
+    arr = np.array(arr)
+    arr.setflags(write=False)
+    return arr
+
+_MEASUREMENT_COVAR = _constant(np.eye(4, dtype=np.float32))     # default measurement covariance
+_MEASUREMENT_TRANS = _constant(np.eye(4))                       # measurement transition matrix (measure full state)
+_PROCESS_NOISE = _constant(np.eye(4, dtype=np.float32))         # process noise before first predict
+
 class KalmanFilter():
+    __slots__ = ('batch', 'slot', '_state', '_covar', '_last_time_changed', '_delta_t', '_state_trans',
+                 'measurement_covar', 'process_noise', 'measurement_trans')
+
     def __init__(self, pos, vel, pos_sigma=None, vel_sigma=None):
         """Initialize kalman filter
         Inputs:
@@ -17,26 +30,129 @@ class KalmanFilter():
 
         kalman_config = read_kalman_config()
 
+        self.batch = None       # batch filter holding state (None if filter holds its own state)
+        self.slot = None        # slot of filter in batch filter
+
         self.state = np.append(pos, vel).astype(np.float32)       # create state vector (elements are r, bear, v_r, v_bear)
         if pos_sigma is None:
             pos_sigma = np.array([kalman_config['r_sigma'], kalman_config['theta_sigma']]).astype(np.float32)
         if vel_sigma is None:
             vel_sigma = np.array([kalman_config['r_hat_sigma'], kalman_config['theta_hat_sigma']]).astype(np.float32)
         self.covar = np.diag(np.append(pos_sigma, vel_sigma)).astype(np.float32)   # create covariance matrix (matrix of certainties of measurements)
-        self.measurement_covar = np.eye(self.covar.shape[0]).astype(np.float32)
+        self.measurement_covar = _MEASUREMENT_COVAR     # shared until replaced
 
-        self.process_noise = np.eye(self.state.shape[0]).astype(np.float32)      # initalize process noise
+        self.process_noise = _PROCESS_NOISE      # initalize process noise (replaced on every predict)
 
         self.last_time_changed = time_in_millis()
         self.delta_t = 0
 
-        # create state transition matrix
-        self.state_trans = np.array([[1., 0, self.delta_t, 0],
-                                    [0, 1., 0, self.delta_t],
-                                    [0, 0, 1., 0],
-                                    [0, 0, 0, 1.]])
+        self._state_trans = None        # state transition matrix (created on first use, filters in a batch never need one)
+
+        self.measurement_trans = _MEASUREMENT_TRANS     # create measurement transition matrix
+
+    @property
+    def state(self):
+        """State vector of object (r, bear, v_r, v_bear)"""
+        if self.batch is None:
+            return self._state
+        return self.batch.states[self.slot]
+
+    @state.setter
+    def state(self, state):
+        if self.batch is None:
+            self._state = state
+        else:
+            self.batch.states[self.slot] = state
+
+    @property
+    def state_trans(self):
+        """State transition matrix (velocity coefficients set to delta_t)"""
+        if self._state_trans is None:
+            self._state_trans = np.array([[1., 0, self.delta_t, 0],
+                                          [0, 1., 0, self.delta_t],
+                                          [0, 0, 1., 0],
+                                          [0, 0, 0, 1.]])
+        return self._state_trans
+
+    @state_trans.setter
+    def state_trans(self, state_trans):
+        self._state_trans = state_trans
+
+    @property
+    def covar(self):
+        """Covariance matrix of state"""
+        if self.batch is None:
+            return self._covar
+        return self.batch.covars[self.slot]
+
+    @covar.setter
+    def covar(self, covar):
+        if self.batch is None:
+            self._covar = covar
+        else:
+            self.batch.covars[self.slot] = covar
+
+    @property
+    def last_time_changed(self):
+        """Time of last prediction (in ms)"""
+        if self.batch is None:
+            return self._last_time_changed
+        return int(self.batch.last_time_changed[self.slot])
+
+    @last_time_changed.setter
+    def last_time_changed(self, last_time_changed):
+        if self.batch is None:
+            self._last_time_changed = last_time_changed
+        else:
+            self.batch.last_time_changed[self.slot] = last_time_changed
+
+    @property
+    def delta_t(self):
+        """Time between last two predictions (in s)"""
+        if self.batch is None:
+            return self._delta_t
+        return float(self.batch.delta_t[self.slot])
+
+    @delta_t.setter
+    def delta_t(self, delta_t):
+        if self.batch is None:
+            self._delta_t = delta_t
+        else:
+            self.batch.delta_t[self.slot] = delta_t
+
+    def attach(self, batch):
+        """Moves filter state into a batch filter so it is predicted and updated with every other track in the batch
+        Inputs:
+            batch -- BatchKalmanFilter to hold state
+        Side Effects:
+            self.batch -- set to batch
+            self.slot -- set to slot owned in batch
+        """
+        if self.batch is batch:
+            return
+        if self.batch is not None:
+            self.detach()
 
-        self.measurement_trans = np.eye(self.state.size)    # create measurement transition matrix
+        self.slot = batch.add(self._state, self._covar, self._last_time_changed)
+        self.batch = batch
+
+    def detach(self):
+        """Moves filter state out of its batch filter and frees its slot
+        Side Effects:
+            self.batch -- set to None
+            self.slot -- set to None
+        """
+        if self.batch is None:
+            return
+
+        batch, slot = self.batch, self.slot
+        self._state = batch.states[slot].copy()
+        self._covar = batch.covars[slot].copy()
+        self._last_time_changed = int(batch.last_time_changed[slot])
+        self._delta_t = float(batch.delta_t[slot])
+
+        batch.remove(slot)
+        self.batch, self.slot = None, None
 
     def predict(self):
         """Predicts next state of object
@@ -69,13 +185,14 @@ class KalmanFilter():
             self.last_time_changed -- updates last time changed to reflect that state has changed
             self.delta_t -- updates delta between current time and last time changed (used for predict)
         """
-        self.delta_t = (time_in_millis() - self.last_time_changed) / 1000.
+        cur_time = time_in_millis()
+        self.delta_t = (cur_time - self.last_time_changed) / 1000.
 
         # update delta_t in state transition matrix
         self.state_trans[0, 2] = self.delta_t
         self.state_trans[1, 3] = self.delta_t
 
-        self.last_time_changed = time_in_millis()
+        self.last_time_changed = cur_time
 
     def _update_process_noise(self):
         """
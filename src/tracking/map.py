@@ -1,39 +1,69 @@
 from threading import Thread, Lock
-from time import sleep
 
 from pubsub import pub
 
 from src.tracking.config_reader import read_map_config
+from src.tracking.batch_kalman_filter import BatchKalmanFilter
 from src.tracking.object import Object
+from src.tracking.polar_index import PolarIndex, IndexedList
+from src.tracking.map_snapshot import MapSnapshot
 from src.tracking.classification_types import ObjectType
-from src.tracking.pdaf import joint_pdaf
+from src.tracking.pdaf import batch_joint_pdaf
 
 from src.utils.time_in_millis import time_in_millis
+from src.utils.clock import sleep
 
-mutex = Lock()
 class Map(Thread):
     """
     Map is used to create a model of where objects around the boat currently exist. Everything is currently relative to where
     our boat is, so each calculation should never have an absolute position in mind.
+
+    Writers (kalman predict, frame smoothing, pruning) hold the map's own lock and publish a new snapshot when they finish,
+    if they changed the object list or any track's state. Readers (return_objects, get_buoys) query the latest snapshot
+    and never wait on writers.
     """
 
     def __init__(self, boat, toggle_update):
         """ Initializes Map (done on startup) """
         super().__init__()
         pub.subscribe(self.smooth_frame, "object(s) detected")
-
-        self.boat = boat
-        self.object_list = []
+        pub.subscribe(self.on_config_changed, "config changed")
 
         config = read_map_config()
 
+        self.boat = boat
+        self.lock = Lock()          # held by writers of object list
+        self.index = PolarIndex(config['index_rng_bin'], config['index_bearing_bin'])     # spatial index of objects
+        self.batch_kalman = BatchKalmanFilter()     # holds kalman filters of all tracks (batched predict/update)
+        self._object_list = IndexedList(self.index, [])
+        self.snapshot = MapSnapshot.publish([], 0, self.index.rng_bin, self.index.bearing_bin)     # latest published view of map
+        self.tracks_changed = False     # track state changed since snapshot was published
+
         self.update_interval = config['update_interval']
         self.toggle_update = toggle_update
 
+    @property
+    def object_list(self):
+        """List of tracked objects (kept in sync with spatial index)"""
+        return self._object_list
+
+    @object_list.setter
+    def object_list(self, object_list):
+        # release kalman filter slots of objects that are no longer tracked (as clear_objects does)
+        object_list = list(object_list)
+        kept = {id(obj) for obj in object_list}
+        for obj in self._object_list:
+            if id(obj) not in kept:
+                self._release_object(obj)
+
+        self.index.clear()
+        self._object_list = IndexedList(self.index, object_list)
+
     def run(self):
         """ Continuously updates objects in object list using Kalman filter prediction"""
         while self.toggle_update:
-            self.update_map()
+            # one snapshot per cycle, published by prune_objects
+            self.update_map(publish=False)
             self.prune_objects()
             sleep(self.update_interval)
 
@@ -45,6 +75,11 @@ class Map(Thread):
         """Disables object updating using kalman filter"""
         self.toggle_update = False
 
+    def on_config_changed(self, module, key, value):
+        """Picks up update interval changed in config while running"""
+        if (module, key) == ("tracking", "update_interval"):
+            self.update_interval = value
+
     def smooth_frame(self, epoch_frame, frame_bounds):
         """
         Updates map using observations from object list input
@@ -56,48 +91,41 @@ class Map(Thread):
         Side Effects:
             object_list -- Updates object list using data from frame (updates or creates new objects)
         """
+        self.lock.acquire()
         # trim object list to only include tracks with frame bounds
         trimmed_object_list = self._return_full_objects(bearingRange = frame_bounds[1], rngRange = frame_bounds[0])
 
         if len(trimmed_object_list) != 0:
-            # generate gate list
-            gate_list = [self._generate_obj_gate(obj) for obj in trimmed_object_list]
-
-            # get update list from joint pdaf
-            update_list, detections_used = joint_pdaf(trimmed_object_list, gate_list, epoch_frame)
-
-            for obj, update in zip(trimmed_object_list, update_list):
-                # update objects
-                if update is not None:
-                    mutex.acquire()
-                    obj.update(update[0], update[1])
-                    mutex.release()
-                else:
-                    mutex.acquire()
-                    obj.update(None, None)
-                    mutex.release()
+            # gate detections and get update list from joint pdaf
+            update_list, detections_used = batch_joint_pdaf(trimmed_object_list, epoch_frame)
+            self._update_objects(trimmed_object_list, update_list)
                     
         else:
             detections_used = [0] * len(epoch_frame)
 
         # use all detections NOT used to update objects to create new objects
+        cur_time = time_in_millis()
         for ii, det in enumerate(epoch_frame):
             if detections_used[ii] == 0:
-                new_obj = Object(det[1], det[0], time_in_millis(), objectType = det[2])     # create object using detection
-                mutex.acquire()
+                new_obj = Object(det[1], det[0], cur_time, objectType = det[2])     # create object using detection
                 self.object_list.append(new_obj)        # add to object_list
-                mutex.release()
+
+        self._publish_snapshot()
+        self.lock.release()
 
     def prune_objects(self):
         """
         Prunes objects in object list
         """
         # iterate through objects in track
-        mutex.acquire()
-        for ii, obj in enumerate(self.object_list):
+        self.lock.acquire()
+        for ii in reversed(range(len(self.object_list))):
+            obj = self.object_list[ii]
             if obj.confidence < 0.1:
+                self._release_object(obj)
                 del self.object_list[ii]
-        mutex.release()
+        self._publish_snapshot()
+        self.lock.release()
 
     def return_objects(self, bearingRange=[-30,30], timeRange=[0,5000], rngRange=None):
         """ Returns objects passing within given bearing range of boat in given time range
@@ -111,31 +139,17 @@ class Map(Thread):
             return_list -- list made up of rng, bearing, and type data of objects in map fitting criteria specified
         """
         _max_objs = 25               # Maximum number of objects to output (arbitrary choice)
-        object_list = [0] * _max_objs
 
-        if rngRange == None:
-            # Convert time range to range range
-            current_speed = self.boat.current_speed()
-            rngRange = [(current_speed * (time_val/1000.)) for time_val in timeRange]
-
-        ii = 0
-        mutex.acquire()
-        for obj in self.object_list:
-            if ii >= _max_objs:
-                break
-            if (rngRange[0] <= obj.rng <= rngRange[1] and (bearingRange[0] <= obj.bearing <= bearingRange[1])):
-                object_list[ii] = obj
-                ii += 1
+        rngRange = self._get_rng_range(timeRange, rngRange)
+        record_list = self._current_snapshot().query(rngRange, bearingRange, max_objs=_max_objs)
 
-        mutex.release()
-                
-        return_list = [(obj.rng, obj.bearing, obj.objectType, obj.rngRate, obj.bearingRate, obj.confidence)
-                        for obj in object_list[0:ii]] 
+        return_list = [record[0:6] for record in record_list]
 
         return return_list
 
     def _return_full_objects(self, bearingRange=[-30,30], timeRange=[0,5000], rngRange=None):
         """Returns objects (Object types) passing within given bearing range of boat in given time range
+        (reads live object list, so callers on other threads should hold self.lock)
 
         Inputs:
             bearingRange -- Angle (in degrees) from bow to search within (-180 to 180)
@@ -146,25 +160,11 @@ class Map(Thread):
             return_list -- list made up of rng, bearing, and type data of objects in map fitting criteria specified
         """
         _max_objs = 25               # Maximum number of objects to output (arbitrary choice)
-        object_list = [0] * _max_objs
 
-        if rngRange == None:
-            # Convert time range to range range
-            current_speed = self.boat.current_speed()
-            rngRange = [(current_speed * (time_val/1000.)) for time_val in timeRange]
-
-        ii = 0
-        mutex.acquire()
-        for obj in self.object_list:
-            if ii >= _max_objs:
-                break
-            if (rngRange[0] <= obj.rng <= rngRange[1] and (bearingRange[0] <= obj.bearing <= bearingRange[1])):
-                object_list[ii] = obj
-                ii += 1
+        rngRange = self._get_rng_range(timeRange, rngRange)
 
-        mutex.release()
-                
-        return_list = [obj for obj in object_list[0:ii]] 
+        # only visits index buckets overlapping window
+        return_list = self.index.query(rngRange, bearingRange, max_objs=_max_objs)
 
         return return_list
 
@@ -174,32 +174,34 @@ class Map(Thread):
         Returns:
             return_list -- list made up of rng, bearing, and type data of buoys in map
         """
-
-        # Create output array
         _max_objs = 10               # Maximum number of objects to output (arbitrary choice)
-        object_list = [0] * _max_objs
-
-        num_buoys = 0
-        mutex.acquire()
-        for obj in self.object_list:
-            if num_buoys >= _max_objs:
-                break
-            if obj.objectType == ObjectType.BUOY:
-                object_list[num_buoys] = obj
-                num_buoys += 1
 
-        mutex.release()
+        record_list = self._current_snapshot().of_type(ObjectType.BUOY, max_objs=_max_objs)
 
-        return_list = [(obj.rng, obj.bearing, obj.objectType) for obj in object_list[0:num_buoys]] 
+        return_list = [record[0:3] for record in record_list]
 
         return return_list
 
-    def update_map(self):
-        """ Updates map using boat state data"""
-        mutex.acquire()
+    def update_map(self, publish=True):
+        """ Updates map using boat state data
+
+        Inputs:
+            publish -- publish snapshot of predicted tracks (False leaves it to the next write, e.g. prune_objects)
+        """
+        self.lock.acquire()
+        # predict every track in one batched kalman predict
         for obj in self.object_list:
-            obj.predict()
-        mutex.release()
+            obj.kalman.attach(self.batch_kalman)
+        self.batch_kalman.predict()
+
+        for obj in self.object_list:
+            obj.predict(filtered=True)
+            self.index.move(obj)
+        if len(self.object_list) != 0:
+            self.tracks_changed = True
+        if publish:
+            self._publish_snapshot()
+        self.lock.release()
 
     def clear_objects(self, timeSinceLastSeen=0):
         """ Clears object from objects with greater than <timeSinceLastSeen> time since last seen
@@ -210,24 +212,88 @@ class Map(Thread):
 
         cur_time = time_in_millis()
         del_list = []
-        mutex.acquire()
+        self.lock.acquire()
         for ii, obj in enumerate(self.object_list):
-            if (time_in_millis() - obj.lastSeen) > timeSinceLastSeen:
+            if (cur_time - obj.lastSeen) > timeSinceLastSeen:
                 del_list.append(ii)
         for index in sorted(del_list, reverse=True):
+            self._release_object(self.object_list[index])
             del self.object_list[index]
-        mutex.release()
+        self._publish_snapshot()
+        self.lock.release()
 
-    def _generate_obj_gate(self, obj):
+    def _update_objects(self, object_list, update_list):
         """
-        Generates tuple containing gate around object
+        Updates objects using update observations (kalman filters are updated in one batched update)
         Inputs:
-            obj -- object to create gate around
-        Returns:
-            gate -- tuple containing range range, bearing range, and allowable object types
+            object_list -- list of objects to update
+            update_list -- list of update observations (rng, bearing) for each object (None if not observed)
+        """
+        updated_list = [(obj, update) for obj, update in zip(object_list, update_list) if update is not None]
+
+        if len(updated_list) != 0:
+            slots = [0] * len(updated_list)
+            measurements = [0] * len(updated_list)
+            for ii, (obj, update) in enumerate(updated_list):
+                obj.kalman.attach(self.batch_kalman)
+                slots[ii] = obj.kalman.slot
+                measurements[ii] = (update[0], update[1], obj.rngRate, obj.bearingRate)
+
+            self.batch_kalman.update(slots, measurements)
+
+        for obj, update in zip(object_list, update_list):
+            if update is not None:
+                obj.update(update[0], update[1], filtered=True)
+                self.index.move(obj)
+            else:
+                obj.update(None, None)
+            self.tracks_changed = True
+
+    def _get_rng_range(self, timeRange, rngRange):
+        """
+        Returns range range to search within
+        Inputs:
+            timeRange -- Time (in ms) to search within using current boat velocity
+            rngRange -- Range (in m) from bow to search within (used if not None)
+        """
+        if rngRange == None:
+            # Convert time range to range range
+            current_speed = self.boat.current_speed()
+            rngRange = [(current_speed * (time_val/1000.)) for time_val in timeRange]
+
+        return rngRange
+
+    def _publish_snapshot(self):
         """
-        rng_gate = (obj.rng - obj.kalman.covar[0,0], obj.rng + obj.kalman.covar[0, 0])
-        bearing_gate = (obj.bearing - obj.kalman.covar[1,1], obj.bearing + obj.kalman.covar[1, 1])
-        type_gate = (ObjectType.NONE, obj.objectType)
+        Publishes snapshot of object list for readers (caller must hold self.lock), unless neither the object list nor
+        any track changed since the last snapshot
+        Side Effects:
+            self.snapshot -- replaced with snapshot of current object list
+        """
+        if self.object_list.version == self.snapshot.version and not self.tracks_changed:
+            return
+        self.tracks_changed = False
+        self.snapshot = MapSnapshot.publish(self.object_list, self.object_list.version,
+                                            self.index.rng_bin, self.index.bearing_bin)
 
-        return (rng_gate, bearing_gate, type_gate)
+    def _current_snapshot(self):
+        """
+        Returns latest snapshot, republishing if object list was changed outside of a write cycle.
+        Never waits on writers: if a writer holds the lock, it will publish when it finishes.
+        """
+        snapshot = self.snapshot
+        if snapshot.version != self.object_list.version and self.lock.acquire(blocking=False):
+            self._publish_snapshot()
+            snapshot = self.snapshot
+            self.lock.release()
+
+        return snapshot
+
+    def _release_object(self, obj):
+        """
+        Releases kalman filter slot held by object being removed from map
+        Inputs:
+            obj -- object being removed
+        """
+        if obj.kalman.batch is self.batch_kalman:
+            obj.kalman.detach()
@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+from src.tracking.polar_index import PolarIndex
+
+# read-only copy of a track's state at the time a snapshot is published (seq is position in object list)
+TrackRecord = namedtuple('TrackRecord', ['rng', 'bearing', 'objectType', 'rngRate', 'bearingRate', 'confidence', 'seq'])
+
+class MapSnapshot(namedtuple('MapSnapshot', ['records', 'index', 'version'])):
+    """
+    Immutable view of the map published after every write cycle. Readers grab the current snapshot with a single
+    attribute read and query it without locking; writers build a new snapshot and swap it in rather than changing it.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def publish(cls, object_list, version, rng_bin, bearing_bin):
+        """
+        Creates snapshot from objects
+        Inputs:
+            object_list -- list of objects to copy into snapshot
+            version -- version of object list being copied
+            rng_bin -- range size of snapshot index buckets (in m)
+            bearing_bin -- bearing size of snapshot index buckets (in deg)
+        Returns:
+            snapshot -- snapshot of objects
+        """
+        records = tuple(TrackRecord(obj.rng, obj.bearing, obj.objectType, obj.rngRate, obj.bearingRate,
+                                    obj.confidence, seq) for seq, obj in enumerate(object_list))
+
+        # bucket every record now so that queries never write to the index
+        index = PolarIndex(rng_bin, bearing_bin)
+        for record in records:
+            index.insert(record)
+        index.flush()
+
+        return cls(records, index, version)
+
+    def query(self, rngRange, bearingRange, max_objs=None):
+        """
+        Returns records within range and bearing window (in object list order)
+        Inputs:
+            rngRange -- range (in m) to search within
+            bearingRange -- bearing (in deg) to search within
+            max_objs -- maximum number of records to return (None for no limit)
+        Returns:
+            return_list -- list of records within window
+        """
+        return self.index.query(rngRange, bearingRange, max_objs)
+
+    def of_type(self, obj_type, max_objs=None):
+        """
+        Returns records of given type (in object list order)
+        Inputs:
+            obj_type -- type of records to return
+            max_objs -- maximum number of records to return (None for no limit)
+        Returns:
+            return_list -- list of records of type
+        """
+        return self.index.of_type(obj_type, max_objs)
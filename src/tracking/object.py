@@ -6,76 +6,120 @@ from src.utils.time_in_millis import time_in_millis
 import numpy as np
 
 class Object():
+    __slots__ = ('bearing', 'rng', 'lastSeen', 'objectType', 'rngRate', 'bearingRate', 'histLength', '_histMask',
+                 '_histKnown', '_histUpdates', '_histKnowns', 'histScore', 'confidence', 'prevRng', 'prevBearing',
+                 'kalman')
 
-    def __init__(self, bearing, rng, lastSeen=time_in_millis(), rngRate=0, bearingRate=0, objectType=ObjectType.NONE):
+    def __init__(self, bearing, rng, lastSeen=None, rngRate=0, bearingRate=0, objectType=ObjectType.NONE):
         """ Initalizes object that tracks a detection in map
 
         bearing -- Relative angle of object (in deg)
         rng -- Range of object from boat (in m)
-        lastSeen -- Time object was last seen (in ms)
+        lastSeen -- Time object was last seen (in ms, defaults to now)
         objectType -- Classification of object (None for unclassified object)
         rangeRate -- Velocity of object in radial direction (in m/s, + for object moving outwards)
         bearingRate -- Velocity of object in angular direction (in deg/s, + for object moving CCW)
         """
         self.bearing = bearing
         self.rng = rng
-        self.lastSeen = lastSeen
+        self.lastSeen = time_in_millis() if lastSeen is None else lastSeen
         self.objectType = objectType
         self.rngRate = rngRate
         self.bearingRate = bearingRate
         self.histLength = 10
-        self.updateHist = [None] * self.histLength        # list to store if track updates for past <histLength> update cycles
+        self.updateHist = [None] * self.histLength        # stores if track updates for past <histLength> update cycles
         self.histScore = 0                                # history score of object
         self.confidence = 0                               # confidence score of obj
 
         self.prevRng = 0
         self.prevBearing = 0
 
-        self.kalman = KalmanFilter(np.array([self.rng, self.bearing]), np.array([self.rngRate, self.bearingRate]))
+        self.kalman = KalmanFilter((self.rng, self.bearing), (self.rngRate, self.bearingRate))
 
-    def update(self, rng, bearing, rngRate=None, bearingRate=None):
+    @property
+    def updateHist(self):
+        """
+        Update history, most recent first (1 if updated, 0 if not updated, None before track existed).
+        Stored as bitmasks (bit 0 is most recent) with running counts so updates and scoring never scan or allocate.
+        """
+        return [((self._histMask >> ii) & 1) if (self._histKnown >> ii) & 1 else None for ii in range(self.histLength)]
+
+    @updateHist.setter
+    def updateHist(self, update_hist):
+        self._histMask, self._histKnown = 0, 0
+        for ii, updated in enumerate(update_hist[0:self.histLength]):
+            if updated is not None:
+                self._histKnown |= 1 << ii
+                if updated:
+                    self._histMask |= 1 << ii
+        self._histUpdates = bin(self._histMask).count('1')
+        self._histKnowns = bin(self._histKnown).count('1')
+
+    def _push_hist(self, updated):
+        """
+        Rotates update history and adds newest entry
+        Inputs:
+            updated -- 1 if track was updated this cycle, else 0
+        """
+        oldest = 1 << (self.histLength - 1)
+        if self._histKnown & oldest:
+            self._histKnowns -= 1
+            if self._histMask & oldest:
+                self._histUpdates -= 1
+
+        full_mask = (oldest << 1) - 1
+        self._histKnown = ((self._histKnown << 1) & full_mask) | 1
+        self._histMask = ((self._histMask << 1) & full_mask) | updated
+        self._histKnowns += 1
+        self._histUpdates += updated
+
+    def update(self, rng, bearing, rngRate=None, bearingRate=None, filtered=False):
         """Updates object position and model based on new reading
         Inputs:
             rng -- range measured by sensors
             bearing -- bearing measured by sensors
             rngRate -- rate of change of range
             bearingRate -- rate of change of bearing
+            filtered -- True if kalman filter was already updated with reading (batched update in Map)
         """
         # rotate update history
-        self.updateHist[1:self.histLength] = self.updateHist[0:self.histLength - 1]
-
         if (rng is None) and (bearing is None):
-            self.updateHist[0] = 0                  # not updated
+            self._push_hist(0)                      # not updated
             return                                  # exit function
 
-        self.updateHist[0] = 1                      # updated
+        self._push_hist(1)                          # updated
 
-        if (rngRate is None) and (bearingRate is None):
-            self.kalman.update([rng, bearing], [self.rngRate, self.bearingRate])
-        else:
-            self.kalman.update([rng, bearing], [rngRate, bearingRate])
+        if not filtered:
+            if (rngRate is None) and (bearingRate is None):
+                self.kalman.update([rng, bearing], [self.rngRate, self.bearingRate])
+            else:
+                self.kalman.update([rng, bearing], [rngRate, bearingRate])
         self._set_object_state()
 
-        # update range and bearing rate for object
-        self._find_object_rngRate()
-        self._find_object_bearingRate()
+        # update range and bearing rate for object (time read once per update)
+        cur_time = time_in_millis()
+        self._find_object_rngRate(cur_time)
+        self._find_object_bearingRate(cur_time)
 
-        self.lastSeen = time_in_millis()
+        self.lastSeen = cur_time
         self.prevRng = self.rng
         self.prevBearing = self.bearing
 
         # set hist score
         self._calc_hist_score()
 
-    def predict(self):
+    def predict(self, filtered=False):
         """
         Predicts object position based on model
+        Inputs:
+            filtered -- True if kalman filter was already predicted (batched predict in Map)
         Side Effects:
             Updates self.rng with predicted range
             Updates self.bearing with predicted bearing
             Updates self.confidence
         """
-        self.kalman.predict()
+        if not filtered:
+            self.kalman.predict()
         self._set_object_state()
 
         self._calc_confidence()
@@ -92,21 +136,29 @@ class Object():
         self.rng, self.bearing = (self.kalman.state[0], self.kalman.state[1])
         self.rngRate, self.bearingRate = (self.kalman.state[2], self.kalman.state[3])
 
-    def _find_object_rngRate(self):
+    def _find_object_rngRate(self, cur_time=None):
         """
         Finds and sets object range rate
+        Inputs:
+            cur_time -- time of measurement (in ms, defaults to now)
         Side Effects:
             self.rngRate -- Updates range rate using new measurement
         """
-        self.rngRate = 1000 * (self.rng - self.prevRng) / (time_in_millis() - self.lastSeen)
+        if cur_time is None:
+            cur_time = time_in_millis()
+        self.rngRate = 1000 * (self.rng - self.prevRng) / (cur_time - self.lastSeen)
 
-    def _find_object_bearingRate(self):
+    def _find_object_bearingRate(self, cur_time=None):
         """
         Finds and sets object bearing rate
+        Inputs:
+            cur_time -- time of measurement (in ms, defaults to now)
         Side Effects:
             self.bearingRate -- Updates bearing rate using new measurement
         """
-        self.bearingRate = 1000 * (self.bearing - self.prevBearing) / (time_in_millis() - self.lastSeen)
+        if cur_time is None:
+            cur_time = time_in_millis()
+        self.bearingRate = 1000 * (self.bearing - self.prevBearing) / (cur_time - self.lastSeen)
 
     def _calc_hist_score(self):
         """
@@ -114,10 +166,9 @@ class Object():
         Returns:
             hist_score -- object certainty score (scaled from 0.0 - 1.0)
         """
-        min_val = 0.
-        num_nones = sum(el is None for el in self.updateHist)
+        num_nones = self.histLength - self._histKnowns
         scale_fac = 1. / self.histLength
-        self.histScore = (sum(filter(None, self.updateHist)) + (0.5 * num_nones)) * scale_fac
+        self.histScore = (self._histUpdates + (0.5 * num_nones)) * scale_fac
 
     def _calc_confidence(self):
         """
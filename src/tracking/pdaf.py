@@ -1,6 +1,8 @@
 import numpy as np
 from scipy.spatial.distance import mahalanobis as sp_mahalanobis
 
+from src.tracking.classification_types import ObjectType
+
 def joint_pdaf(object_list, gate_list, epoch_frame):
     """
     Generates a 'joint' weighted update observation using detections in epoch frame in gate for each object and weights possibility trees jointly to find a global best approach
@@ -127,3 +129,112 @@ def normalize_distances(distances):
         return [dist / total_dist for dist in distances]
     else:
         return distances
+
+
+def batch_joint_pdaf(object_list, epoch_frame):
+    """
+    Vectorized joint pdaf. Gates every track - detection pair and computes association weights in one pass, using the
+    innovation covariance of each object's kalman filter for the mahalanobis distance.
+    Gates are covariance sized range and bearing windows around the object, passing detections of type NONE or of the
+    object's type. Detections are sorted by range so each track only visits detections inside its range gate.
+    Weights are computed from log likelihoods relative to each object's most likely detection, so an object with
+    detections in its gate is always updated, however unlikely they are.
+    Inputs:
+        object_list -- list of objects
+        epoch_frame -- list of detections
+    Returns:
+        update_list -- list of update observations based on detections within object gate (None if no detections)
+        detections_used -- list of number of object gates each detection fell within
+    """
+    num_objs, num_dets = len(object_list), len(epoch_frame)
+    if num_objs == 0 or num_dets == 0:
+        return [None] * num_objs, [0] * num_dets
+
+    # track data
+    obj_rng = np.array([obj.rng for obj in object_list], dtype=np.float64)
+    obj_bearing = np.array([obj.bearing for obj in object_list], dtype=np.float64)
+    obj_types = np.empty(num_objs, dtype=object)
+    obj_types[:] = [obj.objectType for obj in object_list]
+    covars, innov_covars = _stack_covars(object_list)
+
+    # detection data
+    det_rng = np.array([det[0] for det in epoch_frame], dtype=np.float64)
+    det_bearing = np.array([det[1] for det in epoch_frame], dtype=np.float64)
+    det_types = np.empty(num_dets, dtype=object)
+    det_types[:] = [det[2] for det in epoch_frame]
+
+    # range gate -- find window of range sorted detections strictly within gate of each track
+    rng_order = np.argsort(det_rng, kind='mergesort')
+    sorted_rng = det_rng[rng_order]
+    rng_gate = covars[:, 0, 0]
+    lower = np.searchsorted(sorted_rng, obj_rng - rng_gate, side='right')
+    upper = np.searchsorted(sorted_rng, obj_rng + rng_gate, side='left')
+    counts = np.maximum(upper - lower, 0)
+
+    # expand windows into candidate track - detection pairs
+    obj_idx = np.repeat(np.arange(num_objs), counts)
+    offsets = np.arange(obj_idx.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    det_idx = rng_order[lower[obj_idx] + offsets]
+
+    # bearing and type gates
+    bearing_gate = covars[obj_idx, 1, 1]
+    in_gate = (np.abs(det_bearing[det_idx] - obj_bearing[obj_idx]) < bearing_gate) & \
+              ((det_types[det_idx] == ObjectType.NONE) | (det_types[det_idx] == obj_types[obj_idx]))
+    obj_idx, det_idx = obj_idx[in_gate], det_idx[in_gate]
+
+    # a detection in any gate belongs to a track, however small its weight, so it must not start a new one
+    detections_used = np.bincount(det_idx, minlength=num_dets).tolist()
+
+    # association log likelihood of each pair from mahalanobis distance with innovation covariance
+    rng_resid = det_rng[det_idx] - obj_rng[obj_idx]
+    bearing_resid = (det_bearing[det_idx] - obj_bearing[obj_idx] + 180.) % 360. - 180.
+    s = innov_covars[obj_idx]
+    det_s = s[:, 0, 0] * s[:, 1, 1] - s[:, 0, 1] * s[:, 1, 0]
+    sq_dists = (s[:, 1, 1] * rng_resid**2 - (s[:, 0, 1] + s[:, 1, 0]) * rng_resid * bearing_resid + \
+                s[:, 0, 0] * bearing_resid**2) / det_s
+    log_weights = -0.5 * sq_dists
+
+    # for detections shared by multiple objects, drop all but highest associated object's pair
+    det_max = np.full(num_dets, -np.inf)
+    np.maximum.at(det_max, det_idx, log_weights)
+    kept = log_weights >= det_max[det_idx]
+    obj_idx, det_idx, log_weights = obj_idx[kept], det_idx[kept], log_weights[kept]
+
+    # weights relative to most likely detection of each object (1 for it), so they never all underflow to 0
+    obj_max = np.full(num_objs, -np.inf)
+    np.maximum.at(obj_max, obj_idx, log_weights)
+    weights = np.exp(log_weights - obj_max[obj_idx])
+
+    # weighted (normalized) update measurement for each object
+    total_weights = np.bincount(obj_idx, weights=weights, minlength=num_objs)
+    update_rng = np.bincount(obj_idx, weights=weights * det_rng[det_idx], minlength=num_objs)
+    update_bearing = np.bincount(obj_idx, weights=weights * det_bearing[det_idx], minlength=num_objs)
+
+    update_list = [None] * num_objs
+    for kk in np.flatnonzero(total_weights):
+        update_list[kk] = (update_rng[kk] / total_weights[kk], update_bearing[kk] / total_weights[kk])
+
+    return update_list, detections_used
+
+def _stack_covars(object_list):
+    """
+    Stacks state covariance and (range, bearing) innovation covariance of objects' kalman filters
+    Inputs:
+        object_list -- list of objects
+    Returns:
+        covars -- array of state covariance matrices
+        innov_covars -- array of innovation covariance matrices for range and bearing
+    """
+    kalmans = [obj.kalman for obj in object_list]
+    batch = kalmans[0].batch
+
+    if batch is not None and all(kalman.batch is batch for kalman in kalmans):
+        # read straight from batch kalman filter
+        covars = batch.covars[[kalman.slot for kalman in kalmans]]
+        innov_covars = covars[:, 0:2, 0:2] + batch.measurement_covar[0:2, 0:2]
+    else:
+        covars = np.array([kalman.covar for kalman in kalmans], dtype=np.float64)
+        innov_covars = covars[:, 0:2, 0:2] + \
+                       np.array([kalman.measurement_covar[0:2, 0:2] for kalman in kalmans], dtype=np.float64)
+
+    return covars, innov_covars
@@ -0,0 +1,263 @@
+from collections import OrderedDict
+from itertools import count, islice
+from math import floor, isinf
+
+class PolarIndex():
+    """
+    Range/bearing bucketed index of tracked objects. Objects are kept in a polar grid of buckets and in per-type
+    lists, so window queries only visit candidate buckets and type lookups are proportional to the number of results.
+    Objects are re-bucketed by calling move after their range or bearing changes.
+    """
+
+    def __init__(self, rng_bin=10., bearing_bin=10.):
+        """Initializes polar index
+        Inputs:
+            rng_bin -- range size of each bucket (in m)
+            bearing_bin -- bearing size of each bucket (in deg)
+        """
+        self.rng_bin = float(rng_bin)
+        self.bearing_bin = float(bearing_bin)
+
+        self.buckets = {}           # bucket key -> set of objects in bucket
+        self.types = {}             # object type -> ordered dict of objects of type
+        self.entries = {}           # object -> [bucket key, object type, insertion sequence]
+        self.pending = OrderedDict()    # objects added but not yet bucketed
+
+        self._seq = 0
+
+    def __len__(self):
+        """Returns number of objects in index"""
+        return len(self.entries) + len(self.pending)
+
+    def __contains__(self, obj):
+        """Returns whether object is in index"""
+        return obj in self.entries or obj in self.pending
+
+    def insert(self, obj):
+        """
+        Adds object to index (object is bucketed on next query or move)
+        Inputs:
+            obj -- object to add
+        """
+        if obj not in self:
+            self.pending[obj] = None
+
+    def remove(self, obj):
+        """
+        Removes object from index
+        Inputs:
+            obj -- object to remove
+        """
+        if obj in self.pending:
+            del self.pending[obj]
+            return
+
+        entry = self.entries.pop(obj, None)
+        if entry is None:
+            return
+
+        bucket_key, obj_type, _ = entry
+        self._discard(self.buckets, bucket_key, obj)
+        self.types[obj_type].pop(obj, None)
+
+    def move(self, obj):
+        """
+        Re-buckets object using its current range, bearing, and type
+        Inputs:
+            obj -- object that has changed
+        """
+        if obj in self.pending:
+            self.flush()
+            return
+
+        entry = self.entries.get(obj)
+        if entry is None:
+            return
+
+        bucket_key = self._bucket_key(obj.rng, obj.bearing)
+        if bucket_key != entry[0]:
+            self._discard(self.buckets, entry[0], obj)
+            self.buckets.setdefault(bucket_key, set()).add(obj)
+            entry[0] = bucket_key
+
+        if obj.objectType != entry[1]:
+            self.types[entry[1]].pop(obj, None)
+            self.types.setdefault(obj.objectType, OrderedDict())[obj] = None
+            entry[1] = obj.objectType
+
+    def clear(self):
+        """Removes every object from index"""
+        self.buckets.clear()
+        self.types.clear()
+        self.entries.clear()
+        self.pending.clear()
+
+    def query(self, rngRange, bearingRange, max_objs=None):
+        """
+        Returns objects within range and bearing window (in order added to index)
+        Inputs:
+            rngRange -- range (in m) to search within
+            bearingRange -- bearing (in deg) to search within
+            max_objs -- maximum number of objects to return (None for no limit)
+        Returns:
+            return_list -- list of objects within window
+        """
+        self.flush()
+
+        rng_lo, rng_hi = rngRange
+        bearing_lo, bearing_hi = bearingRange
+        if rng_lo > rng_hi or bearing_lo > bearing_hi:
+            return []
+
+        # visit candidate buckets, or occupied buckets if there are fewer of them
+        if any(isinf(val) for val in (rng_lo, rng_hi, bearing_lo, bearing_hi)):
+            num_candidates = float('inf')
+        else:
+            rng_keys = range(self._bin(rng_lo, self.rng_bin), self._bin(rng_hi, self.rng_bin) + 1)
+            bearing_keys = range(self._bin(bearing_lo, self.bearing_bin), self._bin(bearing_hi, self.bearing_bin) + 1)
+            num_candidates = len(rng_keys) * len(bearing_keys)
+
+        if num_candidates <= len(self.buckets):
+            buckets = (self.buckets.get((rng_key, bearing_key)) for rng_key in rng_keys for bearing_key in bearing_keys)
+        else:
+            buckets = self.buckets.values()
+
+        return_list = [obj for bucket in buckets if bucket for obj in bucket
+                       if rng_lo <= obj.rng <= rng_hi and bearing_lo <= obj.bearing <= bearing_hi]
+
+        entries = self.entries
+        return_list.sort(key=lambda obj: entries[obj][2])
+
+        return return_list if max_objs is None else return_list[0:max_objs]
+
+    def of_type(self, obj_type, max_objs=None):
+        """
+        Returns objects of given type (in order added to index)
+        Inputs:
+            obj_type -- type of objects to return
+            max_objs -- maximum number of objects to return (None for no limit)
+        Returns:
+            return_list -- list of objects of type
+        """
+        self.flush()
+
+        objs = self.types.get(obj_type, ())
+        return list(islice(objs, max_objs))
+
+    def flush(self):
+        """
+        Buckets objects waiting to be added
+        Side Effects:
+            self.pending -- emptied into buckets, types, and entries
+        """
+        while self.pending:
+            obj, _ = self.pending.popitem(last=False)
+            bucket_key = self._bucket_key(obj.rng, obj.bearing)
+
+            self.buckets.setdefault(bucket_key, set()).add(obj)
+            self.types.setdefault(obj.objectType, OrderedDict())[obj] = None
+            self.entries[obj] = [bucket_key, obj.objectType, self._seq]
+            self._seq += 1
+
+    def _bucket_key(self, rng, bearing):
+        """Returns key of bucket containing range and bearing"""
+        return (self._bin(rng, self.rng_bin), self._bin(bearing, self.bearing_bin))
+
+    @staticmethod
+    def _bin(val, bin_size):
+        """Returns index of bin containing val"""
+        return int(floor(val / bin_size))
+
+    @staticmethod
+    def _discard(buckets, bucket_key, obj):
+        """Removes object from bucket, deleting bucket when empty"""
+        bucket = buckets.get(bucket_key)
+        if bucket is not None:
+            bucket.discard(obj)
+            if not bucket:
+                del buckets[bucket_key]
+
+
+_versions = count(1)      # shared by every indexed list so versions are never reused
+
+class IndexedList(list):
+    """
+    List of objects that keeps a PolarIndex in sync as objects are added and removed. The version attribute changes on
+    every add or remove, so copies of the list can be checked for staleness.
+    """
+
+    def __init__(self, index, iterable=()):
+        """Initializes indexed list
+        Inputs:
+            index -- PolarIndex to keep in sync
+            iterable -- initial objects
+        """
+        super().__init__(iterable)
+        self.index = index
+        self.version = next(_versions)
+        for obj in self:
+            index.insert(obj)
+
+    def append(self, obj):
+        super().append(obj)
+        self.index.insert(obj)
+        self.version = next(_versions)
+
+    def extend(self, iterable):
+        objs = list(iterable)
+        super().extend(objs)
+        for obj in objs:
+            self.index.insert(obj)
+        self.version = next(_versions)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def insert(self, ii, obj):
+        super().insert(ii, obj)
+        self.index.insert(obj)
+        self.version = next(_versions)
+
+    def remove(self, obj):
+        super().remove(obj)
+        self._release([obj])
+
+    def pop(self, ii=-1):
+        obj = super().pop(ii)
+        self._release([obj])
+        return obj
+
+    def clear(self):
+        objs = list(self)
+        super().clear()
+        self._release(objs)
+
+    def __delitem__(self, ii):
+        objs = self[ii] if isinstance(ii, slice) else [self[ii]]
+        super().__delitem__(ii)
+        self._release(objs)
+
+    def __setitem__(self, ii, val):
+        if isinstance(ii, slice):
+            old_objs = self[ii]
+            val = list(val)
+            new_ids = set(id(obj) for obj in val)
+            super().__setitem__(ii, val)
+            self._release([obj for obj in old_objs if id(obj) not in new_ids])
+            for obj in val:
+                self.index.insert(obj)
+            self.version = next(_versions)
+        else:
+            old_obj = self[ii]
+            super().__setitem__(ii, val)
+            if old_obj is not val:
+                self._release([old_obj])
+                self.index.insert(val)
+                self.version = next(_versions)
+
+    def _release(self, objs):
+        """Removes objects from index"""
+        for obj in objs:
+            self.index.remove(obj)
+        self.version = next(_versions)
@@ -0,0 +1,148 @@
+import asyncio
+from threading import Thread
+
+
+class AsyncRuntime():
+    """
+    Runs sensor reads and periodic outputs as tasks on one asyncio event loop, as an alternative to a thread with a
+    sleep-poll loop per sensor. Periodic tasks are timed against fixed deadlines (a slow run does not push back every
+    later run) and ports that expose a file descriptor are read only when the loop reports data waiting on them.
+    """
+
+    def __init__(self, loop=None):
+        """Initializes async runtime
+        Inputs:
+            loop -- event loop to run on (defaults to a new loop)
+        """
+        self.loop = asyncio.new_event_loop() if loop is None else loop
+        self.tasks = {}             # name -> task
+        self.stats = {}             # name -> {'runs', 'late', 'errors'}
+        self.readers = []           # file descriptors watched by loop
+        self.stop_callbacks = []    # functions called when runtime stops
+        self.thread = None
+
+    def every(self, interval, callback, name=None):
+        """
+        Schedules callback to run periodically
+        Inputs:
+            interval -- time (in s) between runs, or function returning it (read before every wait, so changed
+                        config values apply from the next run)
+            callback -- function called with no arguments
+            name -- name of task in stats (defaults to callback name)
+        Returns:
+            name -- name of task
+        """
+        name = self._add_stats(name or getattr(callback, '__name__', 'task'))
+        self._create_task(name, self._periodic(name, interval, callback))
+        return name
+
+    def watch_port(self, port, on_readable, poll_interval, name=None):
+        """
+        Calls on_readable whenever data is waiting on port. Ports without a file descriptor (e.g. testable ports)
+        are polled instead.
+        Inputs:
+            port -- port to watch
+            on_readable -- function called with no arguments
+            poll_interval -- time (in s) between polls if port can not be watched, or function returning it
+            name -- name of task in stats
+        Returns:
+            name -- name of task
+        """
+        try:
+            fd = port.fileno()
+        except Exception:
+            fd = None
+
+        if not isinstance(fd, int):
+            return self.every(poll_interval, on_readable, name=name)
+
+        name = self._add_stats(name or getattr(on_readable, '__name__', 'reader'))
+        self.loop.add_reader(fd, self._run_once, name, on_readable)
+        self.readers.append(fd)
+        return name
+
+    def on_stop(self, callback):
+        """
+        Adds function to call (on the loop) when runtime stops, e.g. to close ports
+        Inputs:
+            callback -- function called with no arguments
+        """
+        self.stop_callbacks.append(callback)
+
+    def run(self):
+        """Runs event loop in current thread until stopped"""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+            # let cancelled tasks finish
+            pending = list(self.tasks.values())
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            self.loop.close()
+
+    def start(self):
+        """Runs event loop in a background thread"""
+        self.thread = Thread(target=self.run, name="async runtime", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops event loop (safe to call from any thread)"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._shutdown)
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
+
+    def _shutdown(self):
+        """Cancels tasks, stops watching ports and stops loop"""
+        for task in self.tasks.values():
+            task.cancel()
+        for fd in self.readers:
+            self.loop.remove_reader(fd)
+        self.readers = []
+        for callback in self.stop_callbacks:
+            self._run_once('on stop', callback)
+        self.loop.stop()
+
+    def _create_task(self, name, coroutine):
+        """Schedules coroutine on loop"""
+        if self.loop.is_running():
+            # scheduled from another thread
+            self.loop.call_soon_threadsafe(self._add_task, name, coroutine)
+        else:
+            self._add_task(name, coroutine)
+
+    def _add_task(self, name, coroutine):
+        self.tasks[name] = self.loop.create_task(coroutine)
+
+    def _add_stats(self, name):
+        """Adds stats for task, returning a unique task name"""
+        unique_name, ii = name, 1
+        while unique_name in self.stats:
+            ii += 1
+            unique_name = "{} {}".format(name, ii)
+        self.stats[unique_name] = {'runs': 0, 'late': 0, 'errors': 0}
+        return unique_name
+
+    def _run_once(self, name, callback):
+        """Runs callback, counting (and printing) errors so one failing sensor does not stop the loop"""
+        stats = self.stats.setdefault(name, {'runs': 0, 'late': 0, 'errors': 0})
+        stats['runs'] += 1
+        try:
+            callback()
+        except Exception as err:
+            stats['errors'] += 1
+            print("Error in {}: {}".format(name, err))
+
+    async def _periodic(self, name, interval, callback):
+        """Runs callback on fixed deadlines, skipping deadlines already missed"""
+        deadline = self.loop.time()
+        while True:
+            self._run_once(name, callback)
+
+            deadline += interval() if callable(interval) else interval
+            now = self.loop.time()
+            if deadline < now:
+                self.stats[name]['late'] += 1
+                deadline = now
+            await asyncio.sleep(deadline - now)
@@ -0,0 +1,164 @@
+import heapq
+import time
+from threading import Condition, Lock
+
+class SystemClock():
+    """Clock that reads and waits on real (wall) time"""
+
+    def time(self):
+        """Returns current time (in s since epoch)"""
+        return time.time()
+
+    def sleep(self, secs):
+        """Blocks for secs seconds"""
+        time.sleep(secs)
+
+
+class SimulatedClock():
+    """
+    Clock that only moves when told to, so loops driven by it run as fast as they can while still seeing the time
+    deltas they would have seen in real time.
+
+    The clock is driven by the threads sleeping on it: once every one of them is asleep, it jumps to the earliest time
+    one of them asked to wake at and wakes that thread. So with several threads each sleeper still wakes at now + secs,
+    instead of each sleep moving the shared clock on. sleepers must be the number of threads sleeping on the clock (a
+    thread that stops sleeping on it holds the others up); with sleepers=0 only advance and set_time move the clock.
+    """
+
+    def __init__(self, start=0., sleepers=1):
+        """Initializes simulated clock
+        Inputs:
+            start -- starting time (in s)
+            sleepers -- number of threads sleeping on clock (0 if it is only moved by advance and set_time)
+        """
+        self._time = float(start)
+        self._lock = Lock()
+        self._changed = Condition(self._lock)      # notified when time moves
+        self._wakes = []        # heap of times sleeping threads wake at
+        self.sleepers = sleepers
+
+    def time(self):
+        """Returns current simulated time (in s)"""
+        return self._time
+
+    def advance(self, secs):
+        """Moves clock forward by secs seconds"""
+        with self._changed:
+            self._move(self._time + secs)
+
+    def set_time(self, secs):
+        """Sets simulated time (in s), e.g. to the timestamp of a replayed record"""
+        with self._changed:
+            self._move(float(secs))
+
+    def sleep(self, secs):
+        """Waits until clock reaches secs seconds from now, moving it on once every sleeper is waiting"""
+        with self._changed:
+            wake = self._time + secs
+            if wake <= self._time:
+                return
+            heapq.heappush(self._wakes, wake)
+            while self._time < wake:
+                if self.sleepers and len(self._wakes) >= self.sleepers:
+                    self._move(self._wakes[0])
+                else:
+                    self._changed.wait()
+
+    def _move(self, secs):
+        """Sets time and wakes threads whose wake time it reached (caller must hold self._lock)"""
+        self._time = secs
+        while self._wakes and self._wakes[0] <= secs:
+            heapq.heappop(self._wakes)
+        self._changed.notify_all()
+
+
+class SensorClock():
+    """
+    Clock that follows time reported by a sensor (e.g. GPS time from the airmar). It runs on the local monotonic clock
+    from system time, and is slewed towards sensor time (by at most slew_rate seconds per second) rather than stepped
+    to it, so time never jumps and never goes backwards: timestamps taken before a report stay comparable with those
+    taken after it. Large errors (e.g. no system time at boot) take error / slew_rate seconds to remove, so the system
+    clock should be set before starting.
+    """
+
+    def __init__(self, slew_rate=0.05):
+        """Initializes sensor clock
+        Inputs:
+            slew_rate -- largest correction towards sensor time (in s per s, below 1 keeps time moving forward)
+        """
+        self.slew_rate = slew_rate
+        now = time.monotonic()
+        self._offset = time.time() - now        # clock time - monotonic time
+        self._sensor_offset = None              # sensor time - monotonic time at last report
+        self._slewed_at = now                   # monotonic time offset was last slewed
+        self._last_time = None                  # last time returned
+        self._lock = Lock()
+
+    @property
+    def synced(self):
+        """True once sensor time has been reported"""
+        return self._sensor_offset is not None
+
+    @property
+    def error(self):
+        """Sensor time minus clock time still to be slewed away (in s, 0 before first report)"""
+        with self._lock:
+            self._slew(time.monotonic())
+            return 0. if self._sensor_offset is None else self._sensor_offset - self._offset
+
+    def sync(self, secs):
+        """
+        Reports current sensor time
+        Inputs:
+            secs -- sensor time (in s since epoch)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._slew(now)
+            self._sensor_offset = float(secs) - now
+
+    def time(self):
+        """Returns current time (in s since epoch), never less than the last time returned"""
+        with self._lock:
+            now = time.monotonic()
+            self._slew(now)
+            secs = now + self._offset
+            if self._last_time is not None and secs < self._last_time:
+                secs = self._last_time
+            self._last_time = secs
+            return secs
+
+    def sleep(self, secs):
+        """Blocks for secs seconds"""
+        time.sleep(secs)
+
+    def _slew(self, now):
+        """Moves offset towards sensor time by slew rate since last slewed (caller must hold self._lock)"""
+        if self._sensor_offset is not None:
+            step = self.slew_rate * (now - self._slewed_at)
+            self._offset += max(-step, min(step, self._sensor_offset - self._offset))
+        self._slewed_at = now
+
+
+_clock = SystemClock()
+
+def get_clock():
+    """Returns clock currently used by time_in_millis and sleep"""
+    return _clock
+
+def set_clock(clock):
+    """
+    Installs clock used by time_in_millis and sleep (process wide)
+    Inputs:
+        clock -- object with time() and sleep(secs) methods (None to restore system clock)
+    Returns:
+        prev_clock -- clock that was installed before
+    """
+    global _clock
+    prev_clock = _clock
+    _clock = SystemClock() if clock is None else clock
+    return prev_clock
+
+def sleep(secs):
+    """Sleeps for secs seconds on the installed clock"""
+    _clock.sleep(secs)
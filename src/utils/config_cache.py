@@ -0,0 +1,59 @@
+import os
+from threading import Lock
+from time import monotonic
+
+import yaml
+
+_check_interval = 1.        # minimum time (in s) between checks of a file's mtime
+_cache = {}                 # absolute path -> [mtime, size, parsed config, time of last check]
+_lock = Lock()
+
+def load_config(path):
+    """
+    Returns parsed contents of YAML config file, parsing it only the first time it is read and again after it changes
+    on disk (the file is stat'ed at most once per check interval). The returned config is shared by every caller and
+    must not be modified.
+    Inputs:
+        path -- path to config file
+    Returns:
+        conf -- parsed config
+    """
+    path = os.path.abspath(path)
+    now = monotonic()
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and now - entry[3] < _check_interval:
+            return entry[2]
+
+        stat = os.stat(path)
+        if entry is not None and (entry[0], entry[1]) == (stat.st_mtime, stat.st_size):
+            entry[3] = now
+            return entry[2]
+
+        with open(path, "r") as yml:
+            conf = yaml.full_load(yml)
+        _cache[path] = [stat.st_mtime, stat.st_size, conf, now]
+
+    return conf
+
+def reload_config(path=None):
+    """
+    Drops cached config so that it is parsed again on next read
+    Inputs:
+        path -- path to config file to drop (None to drop every file)
+    """
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
+
+def set_check_interval(interval):
+    """
+    Sets minimum time between checks of a config file's mtime
+    Inputs:
+        interval -- time (in s), 0 to check on every read
+    """
+    global _check_interval
+    _check_interval = interval
@@ -0,0 +1,160 @@
+import ast
+import operator
+import sys
+from collections import OrderedDict
+from threading import Thread
+
+from pubsub import pub
+
+from src.utils.clock import sleep
+from src.utils.config_cache import reload_config
+
+_BIN_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+            ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_MAX_EXPONENT = 100
+
+# number literals parse to Num before python 3.8 and to Constant after
+if sys.version_info >= (3, 8):
+    _NUM_NODE, _NUM_FIELD = ast.Constant, 'value'
+else:
+    _NUM_NODE, _NUM_FIELD = ast.Num, 'n'
+
+def parse_expression(expr):
+    """
+    Safely evaluates an arithmetic config expression, e.g. "50 / 1000" (only numbers, parentheses and + - * / // % **
+    are allowed; anything else raises ValueError)
+    Inputs:
+        expr -- expression string (numbers are returned unchanged)
+    Returns:
+        value -- value of expression
+    """
+    if isinstance(expr, (int, float)) and not isinstance(expr, bool):
+        return expr
+    if not isinstance(expr, str):
+        raise ValueError("config value {!r} is not a number or expression".format(expr))
+
+    try:
+        tree = ast.parse(expr.strip(), mode='eval')
+    except SyntaxError:
+        raise ValueError("config value {!r} is not a valid expression".format(expr))
+
+    return _eval_node(tree.body, expr)
+
+def _eval_node(node, expr):
+    """Evaluates node of expression tree"""
+    if isinstance(node, _NUM_NODE):
+        value = getattr(node, _NUM_FIELD)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+
+    elif isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left, right = _eval_node(node.left, expr), _eval_node(node.right, expr)
+        if isinstance(node.op, ast.Pow) and abs(right) > _MAX_EXPONENT:
+            raise ValueError("exponent in config value {!r} is too large".format(expr))
+        try:
+            return _BIN_OPS[type(node.op)](left, right)
+        except ZeroDivisionError:
+            raise ValueError("config value {!r} divides by zero".format(expr))
+
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand, expr))
+
+    raise ValueError("config value {!r} may only contain numbers and arithmetic".format(expr))
+
+def parse_config_value(value, value_type=float):
+    """
+    Parses config value and checks its type
+    Inputs:
+        value -- value read from config (number or arithmetic expression string)
+        value_type -- float or int
+    Returns:
+        value -- parsed value of value_type
+    """
+    value = parse_expression(value)
+    if value_type is int:
+        if value != int(value):
+            raise ValueError("config value {!r} is not an integer".format(value))
+        return int(value)
+
+    return value_type(value)
+
+
+class ConfigService(Thread):
+    """
+    Watches config values and publishes "config changed" (module, key, value) whenever one changes on disk, so that
+    running threads can pick up new values without restarting. Values are read through each module's config reader
+    (which read through the config cache), so polling only stats files that may have changed.
+    """
+
+    def __init__(self, poll_interval=1.):
+        """Initializes config service
+        Inputs:
+            poll_interval -- time (in s) between checks for changed values
+        """
+        super().__init__()
+        self.poll_interval = poll_interval
+        self.is_running = True
+        self.watches = OrderedDict()        # (module, key) -> [reader, current value]
+
+    def watch(self, module, key, reader):
+        """
+        Adds value to watch
+        Inputs:
+            module -- name of module owning value (e.g. "autopilot")
+            key -- name of value (e.g. "rudder gain")
+            reader -- function returning current (parsed and validated) value
+        Returns:
+            value -- current value
+        """
+        value = reader()
+        self.watches[(module, key)] = [reader, value]
+        return value
+
+    def get(self, module, key):
+        """Returns last value read for module and key"""
+        return self.watches[(module, key)][1]
+
+    def run(self):
+        """Polls watched values until stopped"""
+        while self.is_running:
+            self.poll()
+            sleep(self.poll_interval)
+
+    def stop(self):
+        """Stops polling"""
+        self.is_running = False
+
+    def reload(self):
+        """
+        Drops cached config files and checks every value immediately
+        Returns:
+            changes -- list of (module, key, value) that changed
+        """
+        reload_config()
+        return self.poll()
+
+    def poll(self):
+        """
+        Checks every watched value and publishes those that changed. Values that fail to read or validate keep their
+        old value (the error is printed) so a bad edit never interrupts running threads.
+        Returns:
+            changes -- list of (module, key, value) that changed
+        """
+        changes = []
+        for (module, key), watch in self.watches.items():
+            reader, old_value = watch
+            try:
+                value = reader()
+            except Exception as err:
+                print("Ignoring invalid config value {} {}: {}".format(module, key, err))
+                continue
+
+            if value != old_value:
+                watch[1] = value
+                changes.append((module, key, value))
+
+        for module, key, value in changes:
+            pub.sendMessage("config changed", module=module, key=key, value=value)
+
+        return changes
@@ -1,6 +1,6 @@
-import time
+from src.utils.clock import get_clock
 
 def time_in_millis():
-    """Returns current time in milliseconds"""
+    """Returns current time in milliseconds (on installed clock, see src.utils.clock)"""
 
-    return int(round(time.time() * 1000))
+    return int(round(get_clock().time() * 1000))
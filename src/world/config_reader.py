@@ -0,0 +1,29 @@
+import os
+
+from src.utils.config_cache import load_config
+from src.utils.config_service import parse_config_value
+
+
+def read_wind_history(path=None):
+    """Reads the wind history size and window lengths from config.yml
+
+    Returns:
+    A dictionary of size (number of samples) and windows (tuple of lengths in s)
+    """
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")["wind history"]
+
+    return {
+        "size": parse_config_value(conf["size"], int),
+        "windows": tuple(parse_config_value(window) for window in conf["windows"])
+    }
+
+
+def read_solve_true_wind(path=None):
+    """Reads whether to compute true wind from apparent wind from config.yml"""
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    conf = load_config(path + "/config.yml")
+
+    return bool(conf["solve true wind"])
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+def solve_true_wind(apparent_speed, apparent_angle, boat_speed, course, heading):
+    """Computes true wind from apparent wind and the boat's velocity.
+
+    Takes numbers or numpy arrays of samples (computed element-wise). Wind
+    angles are the direction the wind comes from, in degrees clockwise from
+    the bow; course and heading are in degrees clockwise from north.
+
+    Keyword arguments:
+    apparent_speed -- The apparent wind speed
+    apparent_angle -- The apparent wind angle, relative to the bow
+    boat_speed -- The boat's speed over ground, in the units of wind speed
+    course -- The boat's course over ground
+    heading -- The direction the bow points
+
+    Returns:
+    A tuple of true wind speed, true wind angle relative to the bow (0 - 360)
+    and true wind direction relative to north (0 - 360)
+    """
+    heading = np.asarray(heading, dtype=float)
+    wind_from = np.radians(heading + apparent_angle)
+    course = np.radians(course)
+
+    # true wind = apparent wind + boat velocity, as (east, north) vectors
+    # of where the wind is going
+    east = boat_speed * np.sin(course) - apparent_speed * np.sin(wind_from)
+    north = boat_speed * np.cos(course) - apparent_speed * np.cos(wind_from)
+
+    speed = np.hypot(east, north)
+    direction = np.degrees(np.arctan2(-east, -north)) % 360
+    angle = (direction - heading) % 360
+    return speed, angle, direction
+
+
+class TrueWindSolver:
+    """Solves true wind for buffered apparent wind samples.
+
+    Samples are only recorded when they arrive; the first read after new
+    samples solves all of them in one vectorized call and caches the result,
+    so reading the latest true wind repeatedly costs nothing.
+    """
+
+    def __init__(self, size=256, on_solved=None):
+        """Builds a new true wind solver.
+
+        Keyword arguments:
+        size -- The number of samples buffered before they are solved
+        without waiting for a read
+        on_solved -- A function called with the list of samples each solve
+        returns
+        """
+        self.size = size
+        self.on_solved = on_solved
+        self.pending = []       # (time, apparent speed, apparent angle, boat speed, course, heading)
+        self.solved = []        # (time, speed, angle, direction) of last solve
+        self._latest = None
+
+    def add(self, t, apparent_speed, apparent_angle, boat_speed, course, heading):
+        """Adds an apparent wind sample.
+
+        Keyword arguments:
+        t -- The time of the sample in seconds
+        See solve_true_wind for the other arguments.
+        """
+        self.pending.append((t, apparent_speed, apparent_angle, boat_speed, course, heading))
+        if len(self.pending) >= self.size:
+            self.solve()
+
+    def solve(self):
+        """Solves the samples added since the last solve.
+
+        Returns:
+        A list of (time, speed, angle, direction) for each solved sample,
+        oldest first
+        """
+        if not self.pending:
+            return []
+
+        samples = np.array(self.pending, dtype=float)
+        self.pending = []
+        speed, angle, direction = solve_true_wind(*samples[:, 1:].T)
+
+        self.solved = list(zip(samples[:, 0].tolist(), speed.tolist(), angle.tolist(), direction.tolist()))
+        self._latest = self.solved[-1]
+        if self.on_solved is not None:
+            self.on_solved(self.solved)
+        return self.solved
+
+    @property
+    def latest(self):
+        """Gets the newest true wind as (time, speed, angle, direction)
+
+        Returns:
+        The newest solved sample, or None if no samples were added
+        """
+        if self.pending:
+            self.solve()
+        return self._latest
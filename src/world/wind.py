@@ -2,8 +2,11 @@ import math
 
 from pubsub import pub
 
+from src.utils.clock import get_clock
 from src.utils.vec import Vec2
 from src.gps_point import GPSPoint
+from src.world.true_wind import TrueWindSolver
+from src.world.wind_history import WindHistory
 
 
 class Wind:
@@ -16,6 +19,8 @@ class Wind:
         Returns:
         A Vec2 of the true wind
         """
+        if self._true_wind is None:
+            self._true_wind = Vec2.build_from(self.true_wind_speed, self.true_wind_angle)
         return self._true_wind
 
     @property
@@ -25,41 +30,151 @@ class Wind:
         Returns:
         A Vec2 of the apparent wind
         """
+        if self._apparent_wind is None:
+            self._apparent_wind = Vec2.build_from(self.apparent_wind_speed, self.apparent_wind_angle)
         return self._apparent_wind
 
-    def __init__(self):
-        """Builds a new wind object"""
+    @property
+    def true_wind_speed(self):
+        """Gets the latest true wind speed"""
+        self.solve()
+        return self._true_wind_speed
+
+    @true_wind_speed.setter
+    def true_wind_speed(self, speed):
+        self._true_wind_speed = speed
+        self._true_wind = None
+
+    @property
+    def true_wind_angle(self):
+        """Gets the latest true wind angle"""
+        self.solve()
+        return self._true_wind_angle
+
+    @true_wind_angle.setter
+    def true_wind_angle(self, angle):
+        self._true_wind_angle = angle
+        self._true_wind = None
+
+    def __init__(self, history=None, solve_true_wind=False):
+        """Builds a new wind object
+
+        Keyword arguments:
+        history -- Keyword arguments of the true wind history (see WindHistory)
+        solve_true_wind -- Whether to compute true wind from apparent wind and
+        the boat's speed, course and heading, instead of using the true wind
+        reported by the sensor
+        """
         self.true_wind_speed = 0
         self.true_wind_angle = 0
+        self.true_wind_direction = None
         self.apparent_wind_speed = 0
         self.apparent_wind_angle = 0
-        self._true_wind = Vec2(0, 0)
+        self._true_wind = Vec2(0, 0)         # built when first read after an update
         self._apparent_wind = Vec2(0, 0)
-
-        pub.subscribe(self.update_true_wind_angle, "wind angle true")
-        pub.subscribe(self.update_true_wind_speed, "wind speed true")
+        self.history = WindHistory(**(history or {}))
+
+        self.boat_speed = 0     # m/s
+        self.course = None      # None until one is read
+        self.heading = None     # compass heading, course is used until one is read
+        self.solver = TrueWindSolver(on_solved=self._add_solved) if solve_true_wind else None
+
+        if self.solver is None:
+            pub.subscribe(self.update_true_wind_angle, "wind angle true")
+            pub.subscribe(self.update_true_wind_speed, "wind speed true")
+            pub.subscribe(self.update_true_wind, "wind true")
+        else:
+            pub.subscribe(self.update_boat_speed, "boat speed")
+        pub.subscribe(self.update_course, "boat heading")
+        pub.subscribe(self.update_heading, "compass heading")
         pub.subscribe(self.update_apparent_wind_angle, "wind angle apparent")
         pub.subscribe(self.update_apparent_wind_speed, "wind speed apparent")
+        pub.subscribe(self.update_apparent_wind, "wind apparent")
+
+    def update_true_wind(self, wind):
+        """Updates the true wind from a whole reading and adds it to the history
+
+        The history gets the direction relative to north (as when solving true
+        wind), so readings are only added once the boat's heading is known.
+
+        Keyword arguments:
+        wind -- A tuple of the reading's true wind speed and angle
+        """
+        self.true_wind_speed, self.true_wind_angle = wind
+        heading = self._boat_heading()
+        if heading is None:
+            return
+        self.true_wind_direction = (self.true_wind_angle + heading) % 360
+        self.history.add(get_clock().time(), self.true_wind_speed, self.true_wind_direction)
 
     def update_true_wind_angle(self, angle):
         """Updates the true wind angle"""
         self.true_wind_angle = angle
-        self._true_wind = Vec2.build_from(self.true_wind_speed, angle)
 
     def update_true_wind_speed(self, speed):
         """Updates the true wind speed"""
         self.true_wind_speed = speed
-        self._true_wind = Vec2.build_from(speed, self.true_wind_angle)
+
+    def update_apparent_wind(self, wind):
+        """Updates the apparent wind from a whole reading, adding it to the
+        true wind solver when solving true wind
+
+        Keyword arguments:
+        wind -- A tuple of the reading's apparent wind speed and angle
+        """
+        self.apparent_wind_speed, self.apparent_wind_angle = wind
+        self._apparent_wind = None
+        self._add_apparent_sample()
 
     def update_apparent_wind_angle(self, angle):
         """Updates the apparent wind angle"""
         self.apparent_wind_angle = angle
-        self._apparent_wind = Vec2.build_from(self.apparent_wind_speed, angle)
+        self._apparent_wind = None
 
     def update_apparent_wind_speed(self, speed):
         """Updates the apparent wind speed"""
         self.apparent_wind_speed = speed
-        self._apparent_wind = Vec2.build_from(speed, self.apparent_wind_angle)
+        self._apparent_wind = None
+
+    def update_boat_speed(self, speed):
+        """Updates the boat's speed over ground (kph), used to solve true wind"""
+        self.boat_speed = speed / 3.6
+
+    def update_course(self, heading):
+        """Updates the boat's course over ground, used for true wind direction"""
+        self.course = heading
+
+    def update_heading(self, heading):
+        """Updates the boat's compass heading, used for true wind direction"""
+        self.heading = heading
+
+    def solve(self):
+        """Solves true wind for apparent wind samples not yet solved"""
+        if self.solver is not None and self.solver.pending:
+            self.solver.solve()
+
+    def _add_apparent_sample(self):
+        """Adds the latest apparent wind and boat velocity to the true wind solver"""
+        if self.solver is None:
+            return
+        course = 0 if self.course is None else self.course
+        heading = course if self.heading is None else self.heading
+        self.solver.add(get_clock().time(), self.apparent_wind_speed, self.apparent_wind_angle,
+                        self.boat_speed, course, heading)
+
+    def _boat_heading(self):
+        """Gets the compass heading, or the course until one is read (None if neither was)"""
+        return self.course if self.heading is None else self.heading
+
+    def _add_solved(self, samples):
+        """Takes the newest solved true wind and adds every solved sample to the history
+
+        The history gets the direction relative to north, so that turning the
+        boat does not look like a wind shift.
+        """
+        _, self.true_wind_speed, self.true_wind_angle, self.true_wind_direction = samples[-1]
+        for t, speed, _, direction in samples:
+            self.history.add(t, speed, direction)
 
     def angle_relative_to_wind(self, bearing):
         """Converts a bearing into a relative wind angle
@@ -0,0 +1,228 @@
+import math
+from collections import deque
+
+
+class WindWindow:
+    """Rolling statistics over the wind samples of the last length seconds.
+
+    Sums are updated as samples enter and leave the window, min/max speed are
+    kept in monotonic deques, and shift period is estimated from the times the
+    wind direction crossed the window's mean direction, so every query is O(1).
+    """
+
+    def __init__(self, length):
+        """Builds a new wind window.
+
+        Keyword arguments:
+        length -- Length of the window in seconds
+        """
+        self.length = length
+        self.first = 0          # sample number of oldest sample in window
+        self.count = 0
+        self.sum_speed = 0.
+        self.sum_cos = 0.
+        self.sum_sin = 0.
+        self.maxes = deque()    # sample numbers with decreasing speeds
+        self.mins = deque()     # sample numbers with increasing speeds
+        self.crossings = deque()
+        self.side = 0           # side of mean the last sample was on (-1, 0 or 1)
+
+    def add(self, history, number):
+        """Adds a sample to the window and drops samples that left it.
+
+        Keyword arguments:
+        history -- The history holding the samples
+        number -- The sample number of the new sample
+        """
+        t, speed, cos, sin = history.sample(number)
+        self.count += 1
+        self.sum_speed += speed
+        self.sum_cos += cos
+        self.sum_sin += sin
+
+        while self.maxes and history.sample(self.maxes[-1])[1] <= speed:
+            self.maxes.pop()
+        self.maxes.append(number)
+        while self.mins and history.sample(self.mins[-1])[1] >= speed:
+            self.mins.pop()
+        self.mins.append(number)
+
+        self.expire(history, t - self.length)
+
+        # direction crossing the mean marks half an oscillation
+        side = _sign(_cross(self.sum_cos, self.sum_sin, cos, sin))
+        if side != 0 and side != self.side:
+            if self.side != 0:
+                self.crossings.append(t)
+            self.side = side
+        while self.crossings and self.crossings[0] < t - self.length:
+            self.crossings.popleft()
+
+    def expire(self, history, start, oldest=None):
+        """Drops samples older than start, or overwritten in the history.
+
+        Keyword arguments:
+        history -- The history holding the samples
+        start -- The time of the oldest sample to keep
+        oldest -- The number of the oldest sample still in the history
+        """
+        if oldest is None:
+            oldest = history.oldest
+        while self.count > 0 and (self.first < oldest or history.sample(self.first)[0] < start):
+            _, speed, cos, sin = history.sample(self.first)
+            self.count -= 1
+            self.sum_speed -= speed
+            self.sum_cos -= cos
+            self.sum_sin -= sin
+            self.first += 1
+        while self.maxes and self.maxes[0] < self.first:
+            self.maxes.popleft()
+        while self.mins and self.mins[0] < self.first:
+            self.mins.popleft()
+
+    def stats(self, history):
+        """Gets the statistics of the window.
+
+        Keyword arguments:
+        history -- The history holding the samples
+
+        Returns:
+        A dictionary of samples, mean_speed, mean_angle (degrees, 0 - 360),
+        circular_variance (0 steady - 1 no prevailing direction), max_speed,
+        min_speed and shift_period (seconds, None until the direction has
+        crossed its mean three times), or None if the window is empty.
+        """
+        if self.count == 0:
+            return None
+
+        resultant = min(math.hypot(self.sum_cos, self.sum_sin) / self.count, 1.)
+        shift_period = None
+        if len(self.crossings) > 2:
+            shift_period = 2 * (self.crossings[-1] - self.crossings[0]) / (len(self.crossings) - 1)
+
+        return {
+            "samples": self.count,
+            "mean_speed": self.sum_speed / self.count,
+            "mean_angle": math.degrees(math.atan2(self.sum_sin, self.sum_cos)) % 360,
+            "circular_variance": 1 - resultant,
+            "max_speed": history.sample(self.maxes[0])[1],
+            "min_speed": history.sample(self.mins[0])[1],
+            "shift_period": shift_period
+        }
+
+
+class WindHistory:
+    """A fixed size ring buffer of timestamped wind samples.
+
+    Each sample is added to a set of rolling windows (e.g. the last 30 s, 2 min
+    and 10 min), which keep their statistics up to date incrementally. Angles
+    are stored as unit vectors so averages wrap correctly around north.
+    """
+
+    def __init__(self, size=1200, windows=(30, 120, 600)):
+        """Builds a new wind history.
+
+        Keyword arguments:
+        size -- The number of samples kept
+        windows -- The lengths of the rolling windows in seconds
+        """
+        self.size = size
+        self.times = [0.] * size
+        self.speeds = [0.] * size
+        self.cos = [0.] * size
+        self.sin = [0.] * size
+        self.angles = [0.] * size
+        self.count = 0      # number of samples ever added
+        self.windows = {length: WindWindow(length) for length in windows}
+
+    def __len__(self):
+        """Gets the number of samples held"""
+        return min(self.count, self.size)
+
+    @property
+    def oldest(self):
+        """Gets the sample number of the oldest sample held"""
+        return max(self.count - self.size, 0)
+
+    def add(self, t, speed, angle):
+        """Adds a wind sample.
+
+        Keyword arguments:
+        t -- The time of the sample in seconds
+        speed -- The wind speed
+        angle -- The wind angle in degrees
+        """
+        number = self.count
+        # the sample about to be overwritten may still be counted in a window,
+        # so drop it while its values can still be read
+        oldest = max(number + 1 - self.size, 0)
+        for window in self.windows.values():
+            window.expire(self, float("-inf"), oldest=oldest)
+
+        ii = number % self.size
+        rad = math.radians(angle)
+        self.times[ii] = t
+        self.speeds[ii] = speed
+        self.cos[ii] = math.cos(rad)
+        self.sin[ii] = math.sin(rad)
+        self.angles[ii] = angle
+        self.count += 1
+
+        for window in self.windows.values():
+            window.add(self, number)
+
+    def sample(self, number):
+        """Gets a sample as (time, speed, cos, sin) by its sample number"""
+        ii = number % self.size
+        return self.times[ii], self.speeds[ii], self.cos[ii], self.sin[ii]
+
+    def latest(self, n=None):
+        """Gets the newest samples, oldest first.
+
+        Keyword arguments:
+        n -- The number of samples, defaults to all held
+
+        Returns:
+        A list of (time, speed, angle) tuples
+        """
+        n = len(self) if n is None else min(n, len(self))
+        samples = []
+        for number in range(self.count - n, self.count):
+            ii = number % self.size
+            samples.append((self.times[ii], self.speeds[ii], self.angles[ii]))
+        return samples
+
+    def stats(self, window):
+        """Gets the statistics of a rolling window.
+
+        Keyword arguments:
+        window -- The length of the window in seconds, one of those given when
+        the history was built
+
+        Returns:
+        A dictionary of statistics (see WindWindow.stats), or None if no
+        samples are in the window.
+        """
+        return self.windows[window].stats(self)
+
+    def shift(self, window):
+        """Gets the newest angle relative to the window's mean angle.
+
+        Returns:
+        An angle between -180 and 180, positive if the wind has veered
+        (moved clockwise), or None if no samples are in the window.
+        """
+        stats = self.stats(window)
+        if stats is None:
+            return None
+        angle = self.angles[(self.count - 1) % self.size]
+        return (angle - stats["mean_angle"] + 180) % 360 - 180
+
+
+def _cross(x1, y1, x2, y2):
+    """Gets the z component of the cross product of two 2d vectors"""
+    return x1 * y2 - y1 * x2
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
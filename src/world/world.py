@@ -1,3 +1,4 @@
+from src.world.config_reader import read_solve_true_wind, read_wind_history
 from src.world.wind import Wind
 
 
@@ -8,5 +9,5 @@ class World:
 
         Defaults to large biomes world type. You may spawn in the middle of an ocean. Wave if you see Herobrine.
         """
-        self.wind = Wind()
+        self.wind = Wind(history=read_wind_history(), solve_true_wind=read_solve_true_wind())
         print("World ready")
@@ -0,0 +1,132 @@
+import calendar
+import unittest
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+from src.airmar.airmar_processor import AirmarProcessor
+from src.airmar.nmeaparser.nmea_parser import NmeaParser
+from src.broadcaster.broadcaster import BroadcasterType, make_broadcaster
+from src.utils.clock import SensorClock, SimulatedClock, set_clock
+from src.utils.time_in_millis import time_in_millis
+
+
+class AirmarProcessorTests(unittest.TestCase):
+    """ Tests airmar processor """
+
+    def setUp(self):
+        """ Initialize testing processor """
+        self.parser = NmeaParser()
+        self.broadcaster = make_broadcaster(broadcaster_type=BroadcasterType.Testable)
+        self.processor = AirmarProcessor(broadcaster=self.broadcaster, parser=self.parser)
+
+    def _process(self, sentence):
+        """ Helper function to process a sentence body """
+        sentence = "$" + sentence + "*{}\r\n".format(self.parser.checksum(sentence))
+        self.processor.update_airmar_data(nmea=self.parser.parse(sentence))
+        return self.broadcaster.data
+
+    def test_compass_heading(self):
+        """ Tests compass heading from true and magnetic heading sentences """
+        self.assertEqual(274.1, self._process("HCHDT,274.1,T")["compass heading"])
+        self.assertEqual(200.5, self._process("HCTHS,200.5,A")["compass heading"])
+
+        # invalid heading is ignored
+        self.assertEqual(200.5, self._process("HCTHS,10.0,V")["compass heading"])
+
+        # magnetic heading is corrected by deviation and variation
+        self.assertAlmostEqual(94.0, self._process("HCHDG,101.1,,,7.1,W")["compass heading"])
+        self.assertAlmostEqual(3.0, self._process("HCHDG,355.0,1.0,E,7.0,E")["compass heading"])
+
+        # unknown variation is ignored
+        self.assertAlmostEqual(3.0, self._process("HCHDG,101.1,,,,")["compass heading"])
+
+    def test_rate_of_turn(self):
+        """ Tests rate of turn is published only when valid """
+        self.assertEqual(-35.6, self._process("TIROT,-35.6,A")["rate of turn"])
+        self.assertEqual(-35.6, self._process("TIROT,12.0,V")["rate of turn"])
+
+    def test_attitude(self):
+        """ Tests pitch and heel from transducer measurements """
+        data = self._process("YXXDR,A,-1.2,D,PTCH,A,3.4,D,ROLL")
+        self.assertEqual(-1.2, data["boat pitch"])
+        self.assertEqual(3.4, data["boat heel"])
+
+        data = self._process("YXXDR,C,19.5,C,TEMP")
+        self.assertEqual(3.4, data["boat heel"])
+
+    def test_gps_time(self):
+        """ Tests gps time from GPZDA and GPRMC """
+        expected = calendar.timegm((2004, 3, 11, 16, 0, 12)) + 0.71
+        self.assertAlmostEqual(expected, self._process("GPZDA,160012.71,11,03,2004,,")["gps time"])
+
+        # 2 digit year is in 2000s
+        data = self._process("GPRMC,225446.33,A,4916.45,N,12311.12,W,000.5,054.7,191124,020.3,E,A")
+        self.assertAlmostEqual(calendar.timegm((2024, 11, 19, 22, 54, 46)) + 0.33, data["gps time"])
+
+        # no fix
+        data = self._process("GPRMC,101010.00,V,,,,,,,191124,,,N")
+        self.assertAlmostEqual(calendar.timegm((2024, 11, 19, 22, 54, 46)) + 0.33, data["gps time"])
+
+    def test_sensor_clock(self):
+        """ Tests installed sensor clock follows gps time """
+        clock = SensorClock()
+        prev_clock = set_clock(clock)
+        try:
+            before = time_in_millis()
+            self._process("GPZDA,160012.71,11,03,2004,,")
+            self.assertTrue(clock.synced)
+
+            # clock is slewed towards gps time, not stepped to it
+            expected = calendar.timegm((2004, 3, 11, 16, 0, 12)) + 0.71
+            self.assertAlmostEqual(expected, clock.time() + clock.error, delta=1)
+            self.assertAlmostEqual(before, time_in_millis(), delta=1000)
+        finally:
+            set_clock(prev_clock)
+
+    def test_publish_changed(self):
+        """ Tests only data changed by a sentence is published """
+        self.broadcaster.publish_dictionary = MagicMock(name='broadcaster.publish_dictionary')
+
+        self._process("GPGGA,,1,N,2,E,,,,,,,,,")
+        self.broadcaster.publish_dictionary.assert_called_once_with(
+            data={"boat latitude": 1., "boat longitude": 2.})
+
+        # only changed keys
+        self._process("GPGGA,,1,N,3,E,,,,,,,,,")
+        self.broadcaster.publish_dictionary.assert_called_with(data={"boat longitude": 3.})
+
+        # nothing changed
+        self._process("GPGGA,,1,N,3,E,,,,,,,,,")
+        self.assertEqual(2, self.broadcaster.publish_dictionary.call_count)
+
+    def test_publish_interval(self):
+        """ Tests data is merged over publish interval """
+        self.broadcaster.publish_dictionary = MagicMock(name='broadcaster.publish_dictionary')
+        self.processor.publish_interval = 1
+
+        clock = SimulatedClock(start=100.)
+        prev_clock = set_clock(clock)
+        try:
+            self._process("GPGGA,,1,N,2,E,,,,,,,,,")
+            self.assertEqual(1, self.broadcaster.publish_dictionary.call_count)
+
+            # burst within interval is merged
+            clock.advance(0.2)
+            self._process("HCHDT,274.1,T")
+            self._process("GPGGA,,1,N,3,E,,,,,,,,,")
+            self.processor.flush()
+            self.assertEqual(1, self.broadcaster.publish_dictionary.call_count)
+
+            clock.advance(0.8)
+            self.processor.flush()
+            self.broadcaster.publish_dictionary.assert_called_with(
+                data={"compass heading": 274.1, "boat longitude": 3.})
+
+            # forced flush ignores interval
+            self._process("HCHDT,270.0,T")
+            self.processor.flush(force=True)
+            self.assertEqual(3, self.broadcaster.publish_dictionary.call_count)
+        finally:
+            set_clock(prev_clock)
@@ -58,3 +58,35 @@ class AirmarReceiverTests(unittest.TestCase):
         self.receiver.parser.parse.return_value = ["test"] 
         self.receiver.send_airmar_data()
         self.assertEqual(2, self.receiver.processor.update_airmar_data.call_count)
+
+    def test_drain_airmar_data(self):
+        """ Tests every waiting sentence is sent in one drain """
+        self.receiver.processor.update_airmar_data = MagicMock(
+                name='receiver.processor.update_airmar_data')
+        serial.Serial.isOpen.return_value = True
+        serial.Serial.inWaiting.return_value = 0
+        serial.Serial.read.side_effect = [
+            b"$HCHDT,274.1,T*29\r\n$HCHDT,274.2,T*2A\r\n$HCHDT,2",
+            b"",
+            b"74.3,T*2B\r\n"]
+
+        self.assertEqual(2, self.receiver.drain_airmar_data())
+        self.assertEqual(2, self.receiver.processor.update_airmar_data.call_count)
+        self.assertEqual(8, self.receiver.metrics()["queue_bytes"])
+
+        self.assertEqual(0, self.receiver.drain_airmar_data())
+        self.assertEqual(1, self.receiver.drain_airmar_data())
+
+        metrics = self.receiver.metrics()
+        self.assertEqual(3, metrics["sentences"])
+        self.assertAlmostEqual(3 / 5., metrics["sentences_per_s"])
+        self.assertEqual(0, metrics["queue_bytes"])
+
+    def test_send_invalid_sentence(self):
+        """ Tests sentences that fail to parse are logged """
+        self.receiver.logger = MagicMock(name='logger')
+        self.receiver.port.read_line = MagicMock(
+            name='port.read_line', return_value="$HCHDT,274.1,T*00\r\n")
+        self.receiver.send_airmar_data()
+        self.receiver.logger.write_msg.assert_called_once_with(author="P9_26",
+            msg=r"WARNING Unable to parse \"$HCHDT,274.1,T*00" + "\r\n" + r"\"")
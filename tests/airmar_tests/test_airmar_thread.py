@@ -79,6 +79,8 @@ class AirmarIntegrationTests(unittest.TestCase):
         self.thread.receiver.send_airmar_data()
         self.assertAlmostEqual(9.998, self.broadcaster.data["wind speed true"], 2)
         self.assertAlmostEqual(0.599, self.broadcaster.data["wind angle true"], 2)
+        self.assertEqual((self.broadcaster.data["wind speed true"], self.broadcaster.data["wind angle true"]),
+            self.broadcaster.data["wind true"])
 
     def test_update_rel_wind(self):
         # WIVWR
@@ -149,3 +151,20 @@ class AirmarIntegrationTests(unittest.TestCase):
         self.thread.receiver.send_airmar_data()
         self.assertAlmostEqual(1, self.broadcaster.data["boat heading"], 2)
         self.assertAlmostEqual(2, self.broadcaster.data["boat speed"], 2)
+
+    def test_schedule(self):
+        """ Tests airmar is read from async runtime when port is readable """
+        runtime = MagicMock(name='runtime')
+        self.thread.receiver.start = MagicMock(name='receiver.start')
+        self.thread.receiver.drain_airmar_data = MagicMock(name='receiver.drain_airmar_data')
+
+        self.thread.schedule(runtime)
+        self.thread.receiver.start.assert_called_once_with()
+        runtime.on_stop.assert_any_call(self.thread.receiver.stop)
+        runtime.on_stop.assert_any_call(self.thread.broadcaster.close)
+
+        port, on_readable, poll_interval = runtime.watch_port.call_args[0]
+        self.assertIs(self.thread.receiver.port, port)
+        self.assertEqual(self.thread.read_interval, poll_interval())
+        on_readable()
+        self.thread.receiver.drain_airmar_data.assert_called_once_with()
@@ -5,7 +5,12 @@ try:
 except ImportError:
     from mock import MagicMock
 
+from src.airmar.config_reader import read_drain
+from src.airmar.config_reader import read_gps_clock
 from src.airmar.config_reader import read_interval
+from src.airmar.config_reader import read_publish_interval
+from src.airmar.config_reader import read_wind_filter
+from src.airmar.config_reader import read_file_writer
 from src.airmar.config_reader import read_pin_config
 from src.airmar.config_reader import read_port_config
 from tests.mock_bbio import Adafruit_BBIO
@@ -45,3 +50,24 @@ class ConfigReaderTests(unittest.TestCase):
         
         self.assertEqual(mock_port.port_name, "/dev/tty01")
         self.assertEqual(port.port_name, "/dev/tty01")
+
+    def test_read_publish_interval(self):
+        """ Tests publish interval read from config.yml """
+        self.assertEqual(read_publish_interval(path=self.path), 0)
+
+    def test_read_drain(self):
+        """ Tests drain read from config.yml """
+        self.assertTrue(read_drain(path=self.path))
+
+    def test_read_gps_clock(self):
+        """ Tests gps clock read from config.yml """
+        self.assertFalse(read_gps_clock(path=self.path))
+
+    def test_read_wind_filter(self):
+        """ Tests wind filter settings read from config.yml """
+        self.assertEqual({"weight": 0.3, "window": 10}, read_wind_filter(path=self.path))
+
+    def test_read_file_writer(self):
+        """ Tests file writer settings read from config.yml """
+        self.assertEqual({"buffered": True, "background_flush": True, "buffer_size": 65536,
+                          "flush_interval": 1., "fsync_interval": 10.}, read_file_writer(path=self.path))
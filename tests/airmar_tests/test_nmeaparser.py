@@ -1,7 +1,8 @@
 import unittest
 
-from src.airmar.airmar_exceptions import InvalidSentenceException
+from src.airmar.airmar_exceptions import InvalidSentenceException, UnsupportedIDException
 from src.airmar.nmeaparser.nmea_parser import NmeaParser
+from src.airmar.nmeaparser.nmea_sentence import Side, get_sentence_interface
 
 
 class NmeaTests(unittest.TestCase):
@@ -27,6 +28,23 @@ class NmeaTests(unittest.TestCase):
         expected = ["test", "1", "2", "3", None, "4"]
         self.assertEqual(self.parser.parse("$test,1,2,3,,4*3E\r\n"), expected)
 
+    def test_parse_invalid(self):
+        """ Tests that malformed sentences are rejected """
+        invalid = [
+            "test*16\r\n",        # no start
+            "$test*16",             # no terminator
+            "$test*16\n",          # wrong terminator
+            "$test16\r\n",        # no checksum delimiter
+            "$*00\r\n",           # empty body
+            "$test*\r\n",         # empty checksum
+            "$test*6\r\n",        # short checksum
+            "$test,1,2,3,,4*3e\r\n",  # lowercase checksum
+            "$test*16*16\r\n",    # checksum is not hex
+        ]
+        for sentence in invalid:
+            with self.assertRaises(InvalidSentenceException):
+                self.parser.parse(sentence)
+
     def test_toggle(self):
         """ Tests sentence id toggles """
         self.assertEqual(self.parser.toggle(sentence_ids=[]), [])
@@ -50,6 +68,9 @@ class NmeaTests(unittest.TestCase):
     def test_checksum(self):
         """ Tests checksum function """
         self.assertEqual(self.parser.checksum("test"), "16")
+        self.assertEqual(self.parser.checksum(""), "00")
+        self.assertEqual(self.parser.checksum("PAMTC,EN,ERST"), "50")
+        self.assertEqual(self.parser.checksum("GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,"), "47")
 
     def _make_nmea_sentence(self, sentence):
         """ Helper function to create custom nmea sentences 
@@ -194,35 +215,148 @@ class NmeaTests(unittest.TestCase):
 
         self.assertEqual(data, expected)
 
+    def _update(self, sentence):
+        """ Helper function to package a sentence body into a new map """
+        data = {}
+        fields = self.parser.parse(sentence=self._make_nmea_sentence(sentence))
+        self.parser.update_data(data=data, fields=fields)
+        return data
+
+    def _decode(self, sentence):
+        """ Helper function to decode a sentence body into a new record """
+        fields = self.parser.parse(sentence=self._make_nmea_sentence(sentence))
+        return self.parser.decode(records={}, fields=fields)
+
     def test_update_sentence_gpgll(self):
-        self.parser.update_data(fields=["GPGLL"], data=None)
+        data = self._update("GPGLL,4916.45,N,12311.12,W,225444.50,A,A")
+        self.assertEqual("4916.45", data["GPGLL"]["latitude"])
+        self.assertEqual("225444.50", data["GPGLL"]["utc_time"])
+
+        record = self._decode("GPGLL,4916.45,N,12311.12,W,225444.50,A,A")
+        self.assertEqual(12311.12, record["longitude"])
+        self.assertAlmostEqual(22 * 3600 + 54 * 60 + 44.5, record["utc_time"])
+        self.assertEqual("A", record["status"])
 
     def test_update_sentence_gpgsa(self):
-        self.parser.update_data(fields=["GPGSA"], data=None)
+        record = self._decode("GPGSA,A,3,04,05,,09,12,,,24,,,,,2.5,1.3,2.1")
+        self.assertEqual("A", record["mode"])
+        self.assertEqual(3, record["fix_type"])
+        self.assertEqual(4, record["satellite_id_1"])
+        self.assertIsNone(record["satellite_id_3"])
+        self.assertEqual(24, record["satellite_id_8"])
+        self.assertEqual((2.5, 1.3, 2.1), (record["pdop"], record["hdop"], record["vdop"]))
 
     def test_update_sentence_gpgsv(self):
-        self.parser.update_data(fields=["GPGSV"], data=None)
+        # last sentence of a sequence lists fewer satellites
+        record = self._decode("GPGSV,3,3,10,22,42,067,42,24,14,311,")
+        self.assertEqual((3, 3, 10), (record["total_messages"], record["message_number"],
+            record["satellites_in_view"]))
+        self.assertEqual((22, 42., 67., 42.), (record["satellite_1_prn"], record["satellite_1_elevation"],
+            record["satellite_1_azimuth"], record["satellite_1_snr"]))
+        self.assertEqual(24, record["satellite_2_prn"])
+        self.assertIsNone(record["satellite_2_snr"])
+        self.assertIsNone(record["satellite_4_prn"])
+
+    def test_update_sentence_hchdg(self):
+        record = self._decode("HCHDG,101.1,,,7.1,W")
+        self.assertEqual(101.1, record["heading_magnetic"])
+        self.assertIsNone(record["magnetic_deviation"])
+        self.assertEqual(7.1, record["magnetic_variation"])
+        self.assertEqual("W", record["magnetic_variation_direction"])
 
     def test_update_sentence_hchdt(self):
-        self.parser.update_data(fields=["HCHDT"], data=None)
+        self.assertEqual({"HCHDT": {"heading_true": "274.1"}}, self._update("HCHDT,274.1,T"))
+        self.assertEqual(274.1, self._decode("HCHDT,274.1,T")["heading_true"])
 
     def test_update_sentence_wimda(self):
-        self.parser.update_data(fields=["WIMDA"], data=None)
+        record = self._decode("WIMDA,30.2477,I,1.0243,B,17.7,C,,,43.3,,5.0,C,131.5,T,124.5,M,0.1,N,0.1,M")
+        self.assertEqual(1.0243, record["barometric_pressure_bars"])
+        self.assertEqual(17.7, record["air_temperature"])
+        self.assertIsNone(record["water_temperature"])
+        self.assertEqual(43.3, record["relative_humidity"])
+        self.assertEqual(131.5, record["wind_direction_true"])
+        self.assertEqual(0.1, record["wind_speed_mps"])
 
     def test_update_sentence_wimwv(self):
-        self.parser.update_data(fields=["WIMWV"], data=None)
+        record = self._decode("WIMWV,214.8,R,0.1,K,A")
+        self.assertEqual((214.8, "R", 0.1, "K", "A"), (record["wind_angle"], record["reference"],
+            record["wind_speed"], record["wind_speed_units"], record["status"]))
 
     def test_update_sentence_gprmc(self):
-        self.parser.update_data(fields=["GPRMC"], data=None)
+        record = self._decode("GPRMC,225446.33,A,4916.45,N,12311.12,W,000.5,054.7,191194,020.3,E,A")
+        self.assertAlmostEqual(22 * 3600 + 54 * 60 + 46.33, record["utc_time"])
+        self.assertEqual("A", record["status"])
+        self.assertEqual(0.5, record["speed_over_ground_knots"])
+        self.assertEqual("191194", record["date"])
+        self.assertEqual(20.3, record["magnetic_variation"])
 
     def test_update_sentence_tirot(self):
-        self.parser.update_data(fields=["TIROT"], data=None)
+        record = self._decode("TIROT,-35.6,A")
+        self.assertEqual(-35.6, record["rate_of_turn"])
+        self.assertEqual("A", record["status"])
 
     def test_update_sentence_hchts(self):
-        self.parser.update_data(fields=["HCTHS"], data=None)
+        record = self._decode("HCTHS,274.1,A")
+        self.assertEqual(274.1, record["heading_true"])
+        self.assertEqual("A", record["mode_indicator"])
 
     def test_update_sentence_yxxdr(self):
-        self.parser.update_data(fields=["YXXDR"], data=None)
+        sentence = "YXXDR,A,-1.2,D,PTCH,A,3.4,D,ROLL"
+        expected = {
+            "YXXDR": {
+                "PTCH": {"type": "A", "value": "-1.2", "units": "D"},
+                "ROLL": {"type": "A", "value": "3.4", "units": "D"}
+            }
+        }
+        self.assertEqual(expected, self._update(sentence))
+        self.assertEqual({"PTCH": -1.2, "ROLL": 3.4}, self._decode(sentence))
 
     def test_update_sentence_gpzda(self):
-        self.parser.update_data(fields=["GPZDA"], data=None)
\ No newline at end of file
+        record = self._decode("GPZDA,160012.71,11,03,2004,-1,00")
+        self.assertAlmostEqual(16 * 3600 + 12.71, record["utc_time"])
+        self.assertEqual((11, 3, 2004), (record["day"], record["month"], record["year"]))
+        self.assertEqual((-1, 0), (record["local_zone_hours"], record["local_zone_minutes"]))
+
+    def test_decode(self):
+        """ Tests typed decoding into reused records """
+        records = {}
+        sentence = self._make_nmea_sentence("WIVWR,010.1,L,020.2,N,10.1,M,,K")
+        record = self.parser.decode(records=records, fields=self.parser.parse(sentence))
+
+        expected = {
+            "wind_angle_degree": 10.1,
+            "wind_angle_direction": Side.LEFT,
+            "wind_speed_knots": 20.2,
+            "wind_speed_mps": 10.1,
+            "wind_speed_kph": None
+        }
+        self.assertEqual(record, expected)
+        self.assertIs(records["WIVWR"], record)
+
+        # record is reused for next sentence
+        sentence = self._make_nmea_sentence("WIVWR,5,R,1,N,2,M,3,K")
+        self.assertIs(self.parser.decode(records=records, fields=self.parser.parse(sentence)), record)
+        self.assertEqual(Side.RIGHT, record["wind_angle_direction"])
+        self.assertEqual(3., record["wind_speed_kph"])
+
+        sentence = "$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47\r\n"
+        record = self.parser.decode(records=records, fields=self.parser.parse(sentence))
+        self.assertEqual(8, record["number_satelites"])
+        self.assertEqual(4807.038, record["latitude"])
+        self.assertEqual("123519", record["utc_position"])
+
+    def test_decode_invalid(self):
+        """ Tests decoding unsupported and malformed sentences """
+        with self.assertRaises(UnsupportedIDException):
+            self.parser.decode(records={}, fields=["XXXXX", "1"])
+        with self.assertRaises(InvalidSentenceException):
+            self.parser.decode(records={}, fields=["WIVWR", "1", "X", "2", "N", "3", "M", "4", "K"])
+        with self.assertRaises(InvalidSentenceException):
+            self.parser.decode(records={}, fields=["GPVTG", "abc", "T"])
+
+    def test_get_sentence_interface(self):
+        """ Tests registry returns shared interfaces """
+        self.assertIs(get_sentence_interface("GPGGA"), get_sentence_interface("GPGGA"))
+        self.assertIsNone(get_sentence_interface("XXXXX"))
+        self.assertIsNone(get_sentence_interface(None))
+        self.assertIsNone(get_sentence_interface(["GPGGA"]))
@@ -0,0 +1,71 @@
+import math
+import unittest
+
+from src.airmar.wind_filter import WindFilter
+
+
+class WindFilterTests(unittest.TestCase):
+    """ Tests wind filter """
+
+    def test_update(self):
+        """ Tests fixed weight moving average """
+        wind_filter = WindFilter(weight=0.3)
+        self.assertEqual((10, 0), wind_filter.update(10, 0))
+        speed, angle = wind_filter.update(10, 2)
+        self.assertAlmostEqual(9.998, speed, 2)
+        self.assertAlmostEqual(0.5997, angle, 3)
+        self.assertIsNone(wind_filter.stats())
+
+    def test_wrap_around(self):
+        """ Tests angles either side of 0 average to 0 """
+        wind_filter = WindFilter(weight=0.5)
+        wind_filter.update(10, 359)
+        speed, angle = wind_filter.update(10, 1)
+        self.assertAlmostEqual(0, (angle + 180) % 360 - 180)
+
+        # opposite quadrants
+        wind_filter = WindFilter(weight=0.5)
+        wind_filter.update(10, 170)
+        self.assertAlmostEqual(180, wind_filter.update(10, 190)[1])
+
+    def test_time_constant(self):
+        """ Tests weight follows time between readings """
+        wind_filter = WindFilter(time_constant=2.)
+        wind_filter.update(10, 90, time=0.)
+        speed, _ = wind_filter.update(20, 90, time=2.)
+        self.assertAlmostEqual(10 + 10 * (1 - math.exp(-1)), speed)
+
+        # no time passed, no change
+        self.assertAlmostEqual(speed, wind_filter.update(0, 90, time=2.)[0])
+
+    def test_stats(self):
+        """ Tests window statistics """
+        wind_filter = WindFilter(weight=1., window=10.)
+        for time, speed, angle in [(0, 5, 350), (4, 9, 10), (8, 6, 0), (12, 4, 30)]:
+            wind_filter.update(speed, angle, time=time)
+
+        # first reading has left window
+        stats = wind_filter.stats()
+        self.assertEqual(3, stats["samples"])
+        self.assertAlmostEqual(19 / 3., stats["mean_speed"])
+        self.assertEqual(9, stats["gust"])
+        self.assertEqual(4, stats["lull"])
+        self.assertAlmostEqual(9 / (19 / 3.), stats["gust_factor"])
+        self.assertAlmostEqual(13.28, stats["mean_angle"], 1)
+        self.assertAlmostEqual(30 - stats["mean_angle"], stats["shift"])
+        self.assertGreater(stats["circular_variance"], 0)
+        self.assertLess(stats["angle_std"], 30)
+
+        # gust leaves window
+        wind_filter.update(4, 30, time=15)
+        self.assertEqual(6, wind_filter.stats()["gust"])
+
+    def test_steady(self):
+        """ Tests a steady wind has no variance or shift """
+        wind_filter = WindFilter(window=5.)
+        for time in range(10):
+            wind_filter.update(7, 225, time=time)
+        stats = wind_filter.stats()
+        self.assertAlmostEqual(0, stats["circular_variance"])
+        self.assertAlmostEqual(0, stats["shift"])
+        self.assertAlmostEqual(1, stats["gust_factor"])
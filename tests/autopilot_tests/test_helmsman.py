@@ -4,6 +4,8 @@ try:
 except ImportError:
     from mock import patch, MagicMock
 
+from pubsub import pub
+
 from src.autopilot.helmsman import Helmsman
 
 
@@ -33,3 +35,12 @@ class HelmsmanTests(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+    def test_config_changed(self):
+        """Tests that rudder gain changed in config is picked up"""
+        pub.sendMessage("config changed", module="autopilot", key="rudder gain", value=-2.5)
+        self.assertEqual(-2.5, self.helm.rudder_gain)
+
+        # other values are ignored
+        pub.sendMessage("config changed", module="nav", key="rudder gain", value=7)
+        self.assertEqual(-2.5, self.helm.rudder_gain)
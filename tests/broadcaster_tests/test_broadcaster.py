@@ -7,7 +7,7 @@ try:
 except ImportError:
     from mock import patch
 
-from src.broadcaster.broadcaster import BroadcasterType, make_broadcaster
+from src.broadcaster.broadcaster import BroadcasterType, FileWriter, make_broadcaster
 
 
 class BroadcasterTests(unittest.TestCase):
@@ -59,4 +59,70 @@ class BroadcasterTests(unittest.TestCase):
         for line in lines:
             parsed = parse.parse(line_format, line)
             res_dict[parsed[1]] = parsed[2]
-        self.assertEqual(self.data, res_dict)
\ No newline at end of file
+        self.assertEqual(self.data, res_dict)
+
+    def read_lines(self):
+        """ Reads lines of the test log (none if it was not written) """
+        try:
+            with open(self.path + "/broadcast_test.log", "r") as f:
+                return f.readlines()
+        except FileNotFoundError:
+            return []
+
+    @patch('src.broadcaster.broadcaster.monotonic', return_value=0.)
+    def test_buffered(self, mock_monotonic):
+        """ Tests buffered file writer batches lines until size or interval """
+        writer = make_broadcaster(broadcaster_type=BroadcasterType.FileWriter,
+            filename=self.path + "/broadcast_test.log",
+            file_writer={"buffered": True, "buffer_size": 1024, "flush_interval": 1.})
+
+        writer.publish_dictionary(self.data)
+        self.assertEqual([], self.read_lines())
+        self.assertEqual(3, writer.stats()["batched_lines"])
+
+        # flush interval passed
+        mock_monotonic.return_value = 1.
+        writer.publish_dictionary({"4": "test4"})
+        self.assertEqual(4, len(self.read_lines()))
+        self.assertEqual(1, writer.stats()["flushes"])
+
+        # batch reached buffer size
+        writer.publish_dictionary({str(key): "x" * 100 for key in range(10)})
+        self.assertEqual(14, len(self.read_lines()))
+
+        writer.publish_dictionary({"5": "test5"})
+        writer.close()
+        self.assertEqual(15, len(self.read_lines()))
+        self.assertEqual({"lines_written": 15, "flushes": 3, "fsyncs": 0, "batched_lines": 0}, writer.stats())
+
+    @patch('src.broadcaster.broadcaster.os.fsync')
+    @patch('src.broadcaster.broadcaster.monotonic', return_value=0.)
+    def test_fsync_interval(self, mock_monotonic, mock_fsync):
+        """ Tests writes are synced at most every fsync interval """
+        writer = FileWriter(self.path + "/broadcast_test.log", buffered=True,
+            flush_interval=0., fsync_interval=5.)
+
+        for now in [0., 1., 2., 6.]:
+            mock_monotonic.return_value = now
+            writer.publish_dictionary(self.data)
+        self.assertEqual(4, writer.stats()["flushes"])
+        self.assertEqual(2, mock_fsync.call_count)
+
+        writer.close()
+        self.assertEqual(3, mock_fsync.call_count)
+
+    def test_background_flush(self):
+        """ Tests background thread writes batched lines """
+        writer = FileWriter(self.path + "/broadcast_test.log", buffered=True,
+            flush_interval=0.01, background_flush=True)
+        writer.publish_dictionary(self.data)
+
+        for _ in range(100):
+            if writer.stats()["flushes"] > 0:
+                break
+            writer.stopped.wait(0.01)
+        self.assertEqual(3, len(self.read_lines()))
+
+        writer.close()
+        self.assertFalse(writer.flush_thread.is_alive())
+
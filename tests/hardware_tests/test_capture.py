@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.hardware.capture import CaptureWriter, ReplayDevice, read_capture
+from src.hardware.port import make_port
+from src.utils.clock import SimulatedClock, set_clock
+
+
+class CaptureTests(unittest.TestCase):
+    """ Tests capture, replay and record ports. """
+
+    def setUp(self):
+        """ Create testing fields """
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "airmar.cap")
+        self.clock = SimulatedClock(start=100.)
+        self.prev_clock = set_clock(self.clock)
+
+        writer = CaptureWriter(self.path)
+        writer.write(b"$HCHDT,274.1,T*29\r\n$HCHDT,2", timestamp=10.)
+        writer.write(b"", timestamp=10.5)
+        writer.write(b"74.2,T*2A\r\n", timestamp=11.)
+        writer.write(b"$HCHDT,274.3,T*2B\r\n", timestamp=12.5)
+        writer.close()
+
+    def tearDown(self):
+        """ Remove testing fields """
+        set_clock(self.prev_clock)
+        shutil.rmtree(self.dir)
+
+    def _replay_port(self, speed):
+        return make_port({
+            "port_type": "REPLAY",
+            "port_name": "replay",
+            "capture_file": self.path,
+            "replay_speed": speed,
+            "encoding": "UTF-8"
+        })
+
+    def test_read_capture(self):
+        """ Tests capture records are timestamped from start of capture """
+        records = read_capture(self.path)
+        self.assertEqual([0., 1., 2.5], [timestamp for timestamp, _ in records])
+        self.assertEqual(b"74.2,T*2A\r\n", records[1][1])
+
+        with open(self.path, "wb") as capture:
+            capture.write(b"not a capture")
+        with self.assertRaises(ValueError):
+            read_capture(self.path)
+
+    def test_replay_timing(self):
+        """ Tests replay returns bytes at their (scaled) original times """
+        port = self._replay_port(speed=2)
+        port.open()
+
+        self.assertEqual(["$HCHDT,274.1,T*29\r\n"], port.read_lines(terminator="\r\n"))
+        self.assertEqual([], port.read_lines(terminator="\r\n"))
+
+        # 1s of capture at twice real time
+        self.clock.advance(0.5)
+        self.assertEqual(["$HCHDT,274.2,T*2A\r\n"], port.read_lines(terminator="\r\n"))
+
+        self.clock.advance(0.7)
+        self.assertEqual(0, port.bytes_waiting())
+        self.clock.advance(0.1)
+        self.assertEqual(19, port.bytes_waiting())
+        self.assertEqual("$HCHDT,274.3,T*2B\r\n", port.read_line(terminator="\r\n"))
+        self.assertTrue(port.port.finished)
+
+    def test_replay_fast(self):
+        """ Tests replay at speed 0 returns one recorded read per read """
+        port = self._replay_port(speed=0)
+        port.open()
+
+        self.assertEqual(["$HCHDT,274.1,T*29\r\n"], port.read_lines(terminator="\r\n"))
+        self.assertEqual(["$HCHDT,274.2,T*2A\r\n"], port.read_lines(terminator="\r\n"))
+        self.assertEqual(["$HCHDT,274.3,T*2B\r\n"], port.read_lines(terminator="\r\n"))
+        self.assertEqual([], port.read_lines(terminator="\r\n"))
+
+        # writes are discarded
+        port.write(b"$PAMTX,1*4D\r\n")
+        self.assertEqual(13, port.port.bytes_written)
+
+    def test_record(self):
+        """ Tests record port tees everything read to capture file """
+        device = ReplayDevice(self.path, speed=0)
+        path = os.path.join(self.dir, "recorded.cap")
+        port = make_port({
+            "port_type": "RECORD",
+            "port_name": "record",
+            "baudrate": 4800,
+            "timeout": 0,
+            "capture_file": path,
+            "encoding": "UTF-8"
+        }, mock_port=device)
+        port.open()
+
+        lines = []
+        for _ in range(4):
+            self.clock.advance(0.25)
+            lines.extend(port.read_lines(terminator="\r\n"))
+        port.close()
+
+        self.assertEqual(3, len(lines))
+        records = read_capture(path)
+        self.assertEqual([0., 0.25, 0.5], [timestamp for timestamp, _ in records])
+        self.assertEqual([data for _, data in read_capture(self.path)], [data for _, data in records])
+        self.assertTrue(port.port.writer.closed)
+
+    def test_record_reopen(self):
+        """ Tests record port closes capture file when closed, and appends to it when reopened """
+        device = ReplayDevice(self.path, speed=0)
+        path = os.path.join(self.dir, "recorded.cap")
+        port = make_port({
+            "port_type": "RECORD",
+            "port_name": "record",
+            "baudrate": 4800,
+            "timeout": 0,
+            "capture_file": path,
+            "encoding": "UTF-8"
+        }, mock_port=device)
+        port.open()
+        self.clock.advance(0.25)
+        port.read_lines(terminator="\r\n")
+        port.close()
+        self.assertTrue(port.port.writer.closed)
+        self.assertFalse(device.isOpen())
+
+        port.open()
+        self.clock.advance(0.25)
+        port.read_lines(terminator="\r\n")
+        port.close()
+
+        self.assertEqual([0., 0.25], [timestamp for timestamp, _ in read_capture(path)])
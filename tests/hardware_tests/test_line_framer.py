@@ -0,0 +1,72 @@
+import unittest
+
+from src.hardware.line_framer import LineFramer
+
+
+class LineFramerTests(unittest.TestCase):
+    """ Tests LineFramer methods. """
+
+    def setUp(self):
+        """ Create testing fields """
+        self.framer = LineFramer(terminator=b"\r\n", max_line_length=16)
+
+    def test_next_line(self):
+        """ Tests that lines are framed however the stream is chunked. """
+        stream = b"$A,1*00\r\n$B,2*00\r\n$C,3*00\r\n"
+        # one byte at a time (terminator split across feeds)
+        lines = []
+        for ii in range(len(stream)):
+            self.framer.feed(stream[ii:ii + 1])
+            lines.extend(self.framer.lines())
+
+        self.assertEqual([b"$A,1*00\r\n", b"$B,2*00\r\n", b"$C,3*00\r\n"], lines)
+        self.assertEqual(0, len(self.framer))
+        self.assertEqual(3, self.framer.stats()['lines_framed'])
+
+    def test_partial_line(self):
+        """ Tests that unterminated input is kept until terminated. """
+        self.framer.feed(b"$A,1*00\r\n$B,")
+        self.assertEqual(b"$A,1*00\r\n", self.framer.next_line())
+        self.assertIsNone(self.framer.next_line())
+        self.assertEqual(b"$B,", self.framer.pending())
+
+        self.framer.feed(b"2*00\r")
+        self.assertIsNone(self.framer.next_line())
+        self.framer.feed(b"\n")
+        self.assertEqual(b"$B,2*00\r\n", self.framer.next_line())
+
+    def test_drop_partial(self):
+        """ Tests that overlong partial lines are dropped and counted. """
+        self.framer.feed(b"x" * 20)
+        self.assertIsNone(self.framer.next_line())
+        self.assertEqual(0, len(self.framer))
+
+        # framing resumes with next line
+        self.framer.feed(b"xx\r\n$A\r\n")
+        self.assertEqual(b"xx\r\n", self.framer.next_line())
+        self.assertEqual(b"$A\r\n", self.framer.next_line())
+
+        stats = self.framer.stats()
+        self.assertEqual(1, stats['partial_frames'])
+        self.assertEqual(20, stats['bytes_dropped'])
+
+    def test_compact(self):
+        """ Tests that consumed bytes are removed from buffer. """
+        framer = LineFramer(terminator=b"\n")
+        line = b"a" * 99 + b"\n"
+        for ii in range(100):
+            framer.feed(line)
+        framer.feed(b"tail")
+
+        self.assertEqual(100, len(list(framer.lines())))
+        self.assertEqual(b"tail", framer.pending())
+        self.assertLess(len(framer.buffer), 5000)
+
+    def test_set_terminator(self):
+        """ Tests that changing terminator searches buffered bytes again. """
+        framer = LineFramer(terminator=b"\r\n")
+        framer.feed(b"a\nb\n")
+        self.assertIsNone(framer.next_line())
+
+        framer.set_terminator(b"\n")
+        self.assertEqual([b"a\n", b"b\n"], list(framer.lines()))
@@ -56,3 +56,27 @@ class PortTests(unittest.TestCase):
         # serial port not open
         serial.Serial.isOpen.return_value = False
         self.assertEqual(self.port.read_line(terminator="\r\n"), None)
+
+    def test_serial_read_lines(self):
+        """ Tests that serial port reads every waiting line. """
+        self.port.read = MagicMock(name="serial.Serial.read")
+        self.port.read.side_effect = itertools.chain(
+            [b"test\r\ntest2\r\ntest", b"3\r\n"],
+            itertools.repeat(b'')
+        )
+        self.assertEqual(self.port.read_lines(terminator="\r\n"), ["test\r\n", "test2\r\n"])
+        self.assertEqual(self.port.read_lines(terminator="\r\n"), ["test3\r\n"])
+        self.assertEqual(self.port.read_lines(terminator="\r\n"), [])
+        self.assertEqual(3, self.port.framer_stats()['lines_framed'])
+
+    def test_serial_undecodable_lines(self):
+        """ Tests that lines that can not be decoded are skipped and counted. """
+        self.port.read = MagicMock(name="serial.Serial.read")
+        self.port.read.side_effect = itertools.chain(
+            [b"test\r\n\xff\xfe\r\ntest2\r\n", b"\x80\r\ntest3\r\n"],
+            itertools.repeat(b'')
+        )
+        self.assertEqual(self.port.read_lines(terminator="\r\n"), ["test\r\n", "test2\r\n"])
+        self.assertEqual(self.port.read_line(terminator="\r\n"), "test3\r\n")
+        self.assertEqual(2, self.port.framer_stats()['undecodable_lines'])
+        self.assertEqual(5, self.port.framer_stats()['lines_framed'])
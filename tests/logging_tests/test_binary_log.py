@@ -0,0 +1,142 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.logging.binary_log import BinaryLogReader, BinaryLogWriter, INDEX_SUFFIX, LOG_DATETIME_FORMAT, \
+    convert_json_log, ns_from_datetime
+from src.logging.log_reader import logReader
+from src.logging.logger import Logger
+
+
+class BinaryLogTests(unittest.TestCase):
+    """Tests binary log writer and reader"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "test.blog")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_log(self, block_size=4):
+        """Writes 20 messages, one every 0.1 s, alternating between authors a and b"""
+        writer = BinaryLogWriter(self.path, header={'file_name': 'test'}, configs={'src/config.yml': {'x': 1}},
+                                 block_size=block_size, start_time_ns=10 ** 18)
+        for ii in range(20):
+            writer.write('a' if ii % 2 == 0 else 'b', ii, t_ns=writer.start_ns + ii * 10 ** 8)
+        return writer
+
+    def test_payloads(self):
+        """Tests messages of every payload type read back unchanged"""
+        msgs = [None, True, False, -3, 2.5, "text", {'pin': 'P9_26', 'state': [1, 2]}, 2 ** 70]
+        writer = BinaryLogWriter(self.path)
+        for msg in msgs:
+            writer.write('test', msg)
+        writer.close()
+
+        logs = list(BinaryLogReader(self.path).read_log())
+        self.assertEqual(msgs, [log['msg'] for log in logs])
+        self.assertEqual(['test'] * len(msgs), [log['author'] for log in logs])
+        times = [log['time'] for log in logs]
+        self.assertEqual(sorted(times), times)
+
+    def test_header(self):
+        """Tests header, config files and record times"""
+        self.write_log().close()
+        reader = BinaryLogReader(self.path)
+        self.assertEqual('test', reader.header['file_name'])
+        self.assertEqual({'src/config.yml': {'x': 1}}, reader.config_dict)
+
+        logs = list(reader.read_log())
+        self.assertEqual(20, len(logs))
+        self.assertAlmostEqual(0.3, logs[3]['time'])
+        self.assertEqual(5, len(reader.blocks))
+
+    def test_seek(self):
+        """Tests reads of a time range or author only read blocks that can match"""
+        self.write_log().close()
+        reader = BinaryLogReader(self.path)
+
+        logs = list(reader.read_log(start=0.75, end=1.2))
+        self.assertEqual([8, 9, 10, 11, 12], [log['msg'] for log in logs])
+        ranges = list(reader._ranges(int(0.75e9), int(1.2e9), None))
+        self.assertEqual(2, len([count for _, count in ranges if count is not None]))
+
+        logs = list(reader.read_log(author='b', end=0.5))
+        self.assertEqual([1, 3, 5], [log['msg'] for log in logs])
+        self.assertEqual(list(range(0, 20, 2)), [log['msg'] for log in reader.read_log(author=['a'])])
+
+    def test_no_index(self):
+        """Tests log is scanned without an index, and unindexed messages are read"""
+        writer = self.write_log()
+        writer.flush()
+
+        # last block not yet indexed
+        logs = list(BinaryLogReader(self.path).read_log(start=1.5))
+        self.assertEqual([15, 16, 17, 18, 19], [log['msg'] for log in logs])
+
+        writer.close()
+        os.remove(self.path + INDEX_SUFFIX)
+        reader = BinaryLogReader(self.path)
+        self.assertIsNone(reader.blocks)
+        self.assertEqual([1, 3], [log['msg'] for log in reader.read_log(author='b', end=0.3)])
+
+    def test_convert_json_log(self):
+        """Tests JSON logs convert to binary logs"""
+        json_path = os.path.join(self.dir, "test.log")
+        with open(json_path, 'w') as outfile:
+            outfile.write(json.dumps({'file_name': json_path, 'num_config_files': 1}) + '\n')
+            outfile.write(json.dumps({'src/config.yml': {'x': 1}}) + '\n')
+            for second, author, msg in [(0, 'a', 1), (0, 'b', 'two'), (2, 'a', [3])]:
+                outfile.write(json.dumps({'datetime': '2019-06-01 // 12:00:0%d' % second,
+                                          'author': author, 'msg': msg}) + '\n')
+
+        reader = logReader(convert_json_log(json_path))
+        self.assertEqual({'src/config.yml': {'x': 1}}, reader.config_dict)
+        logs = list(reader.read_log())
+        self.assertEqual([1, 'two', [3]], [log['msg'] for log in logs])
+        self.assertEqual([0, 0, 2], [log['time'] for log in logs])
+        self.assertEqual('2019-06-01 // 12:00:02.000000', logs[2]['datetime'])
+
+        # JSON log filters read the same records
+        self.assertEqual([[3]], [log['msg'] for log in logReader(json_path).read_log(start=1)])
+        self.assertEqual(['two'], [log['msg'] for log in logReader(json_path).read_log(author='b')])
+
+    def test_convert_round_trip(self):
+        """Tests a JSON log and its binary conversion read the same records for the same start and end"""
+        start = datetime.datetime(2019, 6, 1, 12, 0, 0, 250000)
+        json_path = os.path.join(self.dir, "test.log")
+        with open(json_path, 'w') as outfile:
+            outfile.write(json.dumps({'file_name': json_path, 'num_config_files': 0,
+                                      'start_time_ns': ns_from_datetime(start)}) + '\n')
+            for ii, offset in enumerate([0.05, 0.65, 0.65, 1., 1.75, 2.5]):
+                timestamp = start + datetime.timedelta(seconds=offset)
+                outfile.write(json.dumps({'datetime': timestamp.strftime(LOG_DATETIME_FORMAT),
+                                          'author': 'a' if ii % 2 == 0 else 'b', 'msg': ii}) + '\n')
+
+        json_reader = logReader(json_path)
+        binary_reader = logReader(convert_json_log(json_path))
+        for window in [{}, {'start': 0.5}, {'end': 1}, {'start': 0.65, 'end': 1.75}, {'start': 3}, {'author': 'b'}]:
+            json_logs = list(json_reader.read_log(**window))
+            binary_logs = [{key: log[key] for key in ('datetime', 'author', 'msg')}
+                           for log in binary_reader.read_log(**window)]
+            self.assertEqual(json_logs, binary_logs)
+        self.assertEqual([1, 2, 3], [log['msg'] for log in json_reader.read_log(start=0.5, end=1)])
+        json_reader.close()
+
+    def test_logger(self):
+        """Tests logger writes binary logs"""
+        logger = Logger(binary=True)
+        logger.write_msg(author='test', msg=1.5)
+        logger.write_msg(author='test', msg='testing')
+        logger.close()
+
+        reader = logReader(logger.outfile_name)
+        self.assertTrue(logger.outfile_name.endswith('.blog'))
+        self.assertEqual([1.5, 'testing'], [log['msg'] for log in reader.read_log(author='test')])
+        self.assertEqual(reader.header['num_config_files'], len(reader.config_dict))
+        os.remove(logger.outfile_name)
+        os.remove(logger.outfile_name + INDEX_SUFFIX)
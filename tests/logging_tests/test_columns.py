@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.logging.binary_log import BinaryLogWriter
+from src.logging.columns import export_columns, load_columns, log_columns, resample
+
+
+class ColumnsTests(unittest.TestCase):
+    """Tests log export to columns"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.logs = os.path.join(self.dir, "logs")
+        os.makedirs(self.logs)
+
+        # JSON log: rudder pin every 2 s, airmar sentences, pwm dicts
+        with open(os.path.join(self.logs, "2019_06_01_1.log"), 'w') as outfile:
+            outfile.write(json.dumps({'file_name': 'test', 'num_config_files': 0}) + '\n')
+            for ii in range(5):
+                records = [('P9_26', 'rudder', 2 * ii, 0.5 * ii),
+                           ('P9_24', 'airmar', 2 * ii + 1, '$WIVWR,1*00' if ii % 2 else None),
+                           ('P8_13', 'pwm', 2 * ii, {'duty': ii, 'state': 'on'})]
+                for _, author, second, msg in records:
+                    log = {'datetime': '2019-06-01 // 12:00:%02d' % second, 'author': author, 'msg': msg}
+                    outfile.write(json.dumps(log) + '\n')
+
+        # binary log written later in the day
+        self.start = 1559400000.
+        writer = BinaryLogWriter(os.path.join(self.logs, "2019_06_01_2.blog"), start_time_ns=int(self.start * 1e9))
+        for ii in range(4):
+            writer.write('rudder', 10. + ii, t_ns=writer.start_ns + ii * 5 * 10 ** 8)
+        writer.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_log_columns(self):
+        """Tests logs are read into per author arrays"""
+        columns = log_columns(self.logs)
+        self.assertEqual({'rudder', 'airmar', 'pwm'}, set(columns))
+
+        rudder = columns['rudder']
+        self.assertEqual(('time', 'value'), rudder.dtype.names)
+        np.testing.assert_allclose([0, 0.5, 1, 1.5, 2, 10, 11, 12, 13], rudder['value'])
+        np.testing.assert_allclose([0, 2, 4, 6, 8], rudder['time'][:5] - rudder['time'][0])
+        np.testing.assert_allclose(self.start + 0.5 * np.arange(4), rudder['time'][5:])
+
+        airmar = columns['airmar']
+        self.assertEqual('U', airmar.dtype['value'].kind)
+        self.assertEqual(['', '$WIVWR,1*00'], list(airmar['value'][:2]))
+
+        pwm = columns['pwm']
+        self.assertEqual(('time', 'duty', 'state'), pwm.dtype.names)
+        np.testing.assert_allclose(range(5), pwm['duty'])
+
+        # filters (times relative to first log of each file) and worker processes
+        columns = log_columns(self.logs, processes=2, author='rudder', start=1)
+        self.assertEqual(['rudder'], list(columns))
+        self.assertEqual(6, len(columns['rudder']))
+
+    def test_export(self):
+        """Tests exported columns load memory-mapped"""
+        out = os.path.join(self.dir, "columns")
+        index = export_columns(self.logs, out)
+        self.assertEqual('rudder.npy', index['rudder'])
+
+        columns = load_columns(out)
+        self.assertIsInstance(columns['rudder'], np.memmap)
+        np.testing.assert_array_equal(log_columns(self.logs)['pwm'], columns['pwm'])
+        self.assertEqual(['airmar'], list(load_columns(out, authors=['airmar'])))
+
+    def test_resample(self):
+        """Tests columns are aligned on one time grid"""
+        columns = {
+            'a': np.array([(0., 1.), (2., 3.)], dtype=[('time', 'f8'), ('value', 'f8')]),
+            'b': np.array([(1., 10.), (3., 30.)], dtype=[('time', 'f8'), ('value', 'f8')]),
+            'c': np.array([(0., 'x')], dtype=[('time', 'f8'), ('value', 'U1')])
+        }
+
+        resampled = resample(columns, period=1.)
+        self.assertEqual(('time', 'a', 'b'), resampled.dtype.names)
+        np.testing.assert_allclose([0, 1, 2, 3], resampled['time'])
+        np.testing.assert_allclose([1, 1, 3, 3], resampled['a'])
+        np.testing.assert_allclose([np.nan, 10, 10, 30], resampled['b'])
+
+        resampled = resample(columns, times=[0.5, 2.5], method='linear')
+        np.testing.assert_allclose([1.5, np.nan], resampled['a'])
+        np.testing.assert_allclose([np.nan, 25], resampled['b'])
+
+        with self.assertRaises(ValueError):
+            resample(columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from src.logging.binary_log import convert_json_log
+from src.logging.log_reader import logReader, scan_logs
+
+
+def is_even(log):
+    return log['msg'] % 2 == 0
+
+
+def count(logs):
+    return sum(1 for _ in logs)
+
+
+class LogReaderTests(unittest.TestCase):
+    """Tests methods in logReader"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = self.write_log("test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_log(self, name, num_logs=10):
+        """Writes a JSON log with one log a second, alternating between authors a and b"""
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as outfile:
+            outfile.write(json.dumps({'file_name': path, 'num_config_files': 1}) + '\n')
+            outfile.write(json.dumps({'src/config.yml': {'x': 1}}) + '\n')
+            for ii in range(num_logs):
+                log = {'datetime': '2019-06-01 // 12:00:%02d' % ii, 'author': 'a' if ii % 2 == 0 else 'b', 'msg': ii}
+                outfile.write(json.dumps(log) + '\n')
+            # log from c that mentions author b
+            log = {'datetime': '2019-06-01 // 12:01:00', 'author': 'c', 'msg': {'author': 'b'}}
+            outfile.write(json.dumps(log) + '\n')
+        return path
+
+    def test_read_log(self):
+        """Tests every log is read, from a file or an mmap"""
+        for use_mmap in [False, True]:
+            reader = logReader(self.path, use_mmap=use_mmap)
+            self.assertEqual({'src/config.yml': {'x': 1}}, reader.config_dict)
+            logs = list(reader.read_log())
+            self.assertEqual(11, len(logs))
+            self.assertEqual(list(range(10)), [log['msg'] for log in logs[:10]])
+
+            # logs can be read again
+            self.assertEqual(11, len(list(reader.read_log())))
+            reader.close()
+
+    def test_filters(self):
+        """Tests author, time and predicate filters"""
+        for use_mmap in [False, True]:
+            reader = logReader(self.path, use_mmap=use_mmap)
+            self.assertEqual([1, 3, 5, 7, 9], [log['msg'] for log in reader.read_log(author='b')])
+            self.assertEqual([3, 4, 5], [log['msg'] for log in reader.read_log(start=3, end=5)])
+            self.assertEqual([4, 6], [log['msg'] for log in reader.read_log(start=3, end=7, author=['a'],
+                                                                             predicate=lambda log: log['msg'] > 2)])
+            reader.close()
+
+    @patch('src.logging.log_reader.json.loads', side_effect=json.loads)
+    def test_pushdown(self, mock_loads):
+        """Tests lines that can not match are not decoded"""
+        reader = logReader(self.path)
+        mock_loads.reset_mock()
+
+        list(reader.read_log(author='b'))
+        # 5 logs from b, and the log that mentions b
+        self.assertEqual(6, mock_loads.call_count)
+
+        mock_loads.reset_mock()
+        list(reader.read_log(start=8))
+        self.assertEqual(3, mock_loads.call_count)
+
+    def test_binary(self):
+        """Tests filters on binary logs, from a file or an mmap"""
+        binary_path = convert_json_log(self.path)
+        for use_mmap in [False, True]:
+            reader = logReader(binary_path, use_mmap=use_mmap)
+            self.assertEqual([0, 2, 4, 6, 8], [log['msg'] for log in reader.read_log(author='a')])
+            self.assertEqual([2, 4], [log['msg'] for log in reader.read_log(start=1, end=5, predicate=is_even)])
+
+    def test_scan_logs(self):
+        """Tests logs are read in worker processes"""
+        paths = [self.path, self.write_log("test2.log", num_logs=4), convert_json_log(self.path)]
+        self.assertEqual({paths[0]: 11, paths[1]: 5, paths[2]: 11}, scan_logs(paths, func=count, processes=2))
+
+        results = scan_logs(paths[:2], author='a', predicate=is_even, processes=2)
+        self.assertEqual([0, 2], [log['msg'] for log in results[paths[1]]])
+        self.assertEqual(5, len(results[paths[0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
+import gc
+import json
 import unittest
+import weakref
 from pubsub import pub
 
-from src.logging.logger import Logger
+from src.logging.logger import DropPolicy, Logger
 
 
 class LoggerTests(unittest.TestCase):
@@ -11,6 +14,16 @@ class LoggerTests(unittest.TestCase):
         """Create Logger object"""
         self.logger = Logger()
 
+    def tearDown(self):
+        self.logger.close()
+
+    def read_records(self, logger):
+        """Reads log records (lines after header and config files) written by logger"""
+        with open(logger.outfile_name, 'r') as infile:
+            lines = infile.readlines()
+        num_config_files = json.loads(lines[0])['num_config_files']
+        return [json.loads(line) for line in lines[1 + num_config_files:]]
+
     def test_write_msg(self):
         """Tests that logger receives messages correctly"""
 
@@ -18,3 +31,69 @@ class LoggerTests(unittest.TestCase):
         log_dict = self.logger.log_dict
         assert(log_dict['author'] == 'test')
         assert(log_dict['msg'] == 'testing')
+
+    def test_writer_thread(self):
+        """Tests that queued messages are written by the writer thread"""
+        for ii in range(1000):
+            self.logger.write_msg(author='test', msg=ii)
+        self.assertTrue(self.logger.flush(timeout=5))
+
+        records = self.read_records(self.logger)
+        self.assertEqual(list(range(1000)), [record['msg'] for record in records])
+        stats = self.logger.stats()
+        self.assertEqual(1000, stats['written'])
+        self.assertEqual(0, stats['dropped'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_write_errors(self):
+        """Tests that records the writer thread can not write are counted and do not stop it"""
+        self.logger.write_msg(author='test', msg=1)
+        self.logger.write_msg(author='test', msg=object())
+        self.logger.write_msg(author='test', msg=3)
+        self.assertTrue(self.logger.flush(timeout=5))
+
+        self.logger.write_msg(author='test', msg=4)
+        self.assertTrue(self.logger.flush(timeout=5))
+        self.assertTrue(self.logger.writer.is_alive())
+
+        self.assertEqual([1, 3, 4], [record['msg'] for record in self.read_records(self.logger)])
+        stats = self.logger.stats()
+        self.assertEqual(3, stats['written'])
+        self.assertEqual(1, stats['errors'])
+        self.assertIsInstance(self.logger.last_error, TypeError)
+
+    def test_synchronous(self):
+        """Tests that a synchronous logger writes each message as it is logged"""
+        logger = Logger(asynchronous=False)
+        logger.write_msg(author='test', msg='testing')
+        self.assertEqual([{'datetime': logger.log_dict['datetime'], 'author': 'test', 'msg': 'testing'}],
+                         self.read_records(logger))
+        self.assertTrue(logger.flush())
+
+    def test_drop_policy(self):
+        """Tests which records are dropped when the queue is full"""
+        for policy, kept in [(DropPolicy.NEWEST, [0, 1]), (DropPolicy.OLDEST, [2, 3]), (DropPolicy.BLOCK, [0, 1])]:
+            logger = Logger(queue_size=2, drop_policy=policy, block_timeout=0.01)
+            # stop writer thread taking records
+            logger.close()
+
+            for ii in range(4):
+                logger._enqueue({'author': 'test', 'msg': ii})
+            self.assertEqual(kept, [record['msg'] for record in logger.queue])
+            self.assertEqual(2, logger.stats()['dropped'])
+            self.assertEqual(2, logger.stats()['max_queue_depth'])
+
+    def test_closed_logger(self):
+        """Tests that a closed logger stops logging and is released, while a new logger logs"""
+        self.logger.close()
+        pub.sendMessage('write msg', author='test', msg='closed')
+        self.assertEqual(0, self.logger.stats()['enqueued'])
+
+        ref = weakref.ref(self.logger)
+        self.logger = Logger()
+        gc.collect()
+        self.assertIsNone(ref())
+
+        pub.sendMessage('write msg', author='test', msg='testing')
+        self.assertTrue(self.logger.flush(timeout=5))
+        self.assertEqual(['testing'], [record['msg'] for record in self.read_records(self.logger)])
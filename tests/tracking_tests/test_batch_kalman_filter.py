@@ -0,0 +1,111 @@
+import unittest
+try:
+    from unittest.mock import patch, MagicMock
+except ImportError:
+    from mock import patch, MagicMock
+
+from src.tracking.batch_kalman_filter import BatchKalmanFilter
+from src.tracking.kalman_filter import KalmanFilter
+
+import numpy as np
+
+class BatchKalmanFilterTests(unittest.TestCase):
+    """Tests the methods in BatchKalmanFilter"""
+    def setUp(self):
+        """Sets up the objects needed for testing"""
+        self.batch = BatchKalmanFilter(capacity=2)
+
+        # arbitrary track states
+        self.states = [([10., 45.], [1., -2.]),
+                       ([25., 179.], [-0.5, 3.]),
+                       ([4., -20.], [0., 0.])]
+
+    def _make_filters(self):
+        """Creates kalman filters for test states (with arbitrary last time changed)"""
+        filters = [KalmanFilter(np.array(pos), np.array(vel)) for pos, vel in self.states]
+        for ii, kalman in enumerate(filters):
+            kalman.last_time_changed = 1000 * ii
+        return filters
+
+    def test_add_remove(self):
+        """Tests add and remove methods of batch kalman filter"""
+        # add more tracks than capacity
+        slots = [self.batch.add(np.append(pos, vel), np.eye(4)) for pos, vel in self.states]
+
+        self.assertEqual([0, 1, 2], slots)
+        self.assertEqual(3, len(self.batch))
+        for slot, (pos, vel) in zip(slots, self.states):
+            np.testing.assert_allclose(np.append(pos, vel), self.batch.states[slot])
+
+        # remove track and check that slot is reused
+        self.batch.remove(1)
+        self.assertEqual(2, len(self.batch))
+        np.testing.assert_array_equal([0, 2], self.batch.active_slots())
+        self.assertEqual(1, self.batch.add(np.zeros(4), np.eye(4)))
+
+    @patch('src.tracking.kalman_filter.time_in_millis', return_value=2500)
+    @patch('src.tracking.batch_kalman_filter.time_in_millis', return_value=2500)
+    def test_predict(self, mock_batch_time, mock_time):
+        """Tests that batched predict matches per-track kalman filter predict"""
+        filters = self._make_filters()
+        truth_filters = self._make_filters()
+
+        for kalman in filters:
+            kalman.attach(self.batch)
+
+        # call predict
+        self.batch.predict()
+        for kalman in truth_filters:
+            kalman.predict()
+
+        # check for correct behavior
+        for kalman, truth_kalman in zip(filters, truth_filters):
+            np.testing.assert_allclose(truth_kalman.state, kalman.state, rtol=1e-5)
+            np.testing.assert_allclose(truth_kalman.covar, kalman.covar, rtol=1e-5)
+            self.assertAlmostEqual(truth_kalman.delta_t, kalman.delta_t)
+            self.assertEqual(2500, kalman.last_time_changed)
+
+    def test_update(self):
+        """Tests that batched update matches per-track kalman filter update"""
+        filters = self._make_filters()
+        truth_filters = self._make_filters()
+
+        for kalman in filters:
+            kalman.attach(self.batch)
+
+        # arbitrary measurements
+        measurements = np.array([[11, 44, 1, -1],
+                                 [24, 178, 0, 2],
+                                 [5, -21, 1, 1]])
+
+        # update only first and last tracks
+        self.batch.update([filters[0].slot, filters[2].slot], measurements[[0, 2]])
+        truth_filters[0].update(measurements[0, 0:2], measurements[0, 2:4])
+        truth_filters[2].update(measurements[2, 0:2], measurements[2, 2:4])
+
+        # check for correct behavior
+        for kalman, truth_kalman in zip(filters, truth_filters):
+            np.testing.assert_allclose(truth_kalman.state, kalman.state, rtol=1e-5)
+            np.testing.assert_allclose(truth_kalman.covar, kalman.covar, rtol=1e-5)
+
+    def test_attach_detach(self):
+        """Tests attach and detach methods of kalman filter"""
+        kalman = KalmanFilter(np.array([3., 4.]), np.array([0., 0.]))
+        state, covar = kalman.state.copy(), kalman.covar.copy()
+
+        # attach to batch filter
+        kalman.attach(self.batch)
+        self.assertIs(self.batch, kalman.batch)
+        np.testing.assert_allclose(state, self.batch.states[kalman.slot])
+        np.testing.assert_allclose(covar, self.batch.covars[kalman.slot])
+
+        # writes go to batch filter
+        kalman.state[0] = 7.
+        self.assertEqual(7., self.batch.states[kalman.slot][0])
+
+        # detach from batch filter
+        slot = kalman.slot
+        kalman.detach()
+        self.assertIsNone(kalman.batch)
+        self.assertFalse(self.batch.active[slot])
+        self.assertEqual(7., kalman.state[0])
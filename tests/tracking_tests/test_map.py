@@ -5,6 +5,7 @@ except ImportError:
     from mock import MagicMock, patch
 
 from src.tracking.map import Map
+from src.tracking.map_snapshot import MapSnapshot
 from src.tracking.object import Object
 from src.tracking.classification_types import ObjectType
 
@@ -51,6 +52,20 @@ class MapTests(unittest.TestCase):
         self.map.clear_objects(timeSinceLastSeen=0)         # should only clear all objects
         self.assertTrue(len(self.map.object_list) == 0)                 # assert that length of list is zero
 
+    def test_set_object_list(self):
+        """Tests that replacing object list releases kalman filters of objects no longer tracked"""
+        objs = [Object(bearing, 10, time_in_millis(), objectType = ObjectType.BUOY) for bearing in [-20, 0, 20]]
+        self.map.object_list = objs
+        self.map.update_map()
+        self.assertEqual(3, len(self.map.batch_kalman))
+
+        self.map.object_list = objs[1:]
+        self.assertEqual(2, len(self.map.batch_kalman))
+        self.assertIsNone(objs[0].kalman.batch)
+        for obj in objs[1:]:
+            self.assertIs(self.map.batch_kalman, obj.kalman.batch)
+        self.assertEqual(objs[1:], self.map.object_list)
+
     def test_return_objects(self):
         """Tests return objects method of map"""
         # set up objects to add to map
@@ -125,8 +140,9 @@ class MapTests(unittest.TestCase):
             self.assertAlmostEqual(obj[1], returned_objects[jj].bearing)
             self.assertEqual(obj[2], returned_objects[jj].objectType)
 
+    @patch('src.tracking.map.BatchKalmanFilter.predict')
     @patch('src.tracking.map.Object.predict')
-    def test_update_map(self, mock_predict):
+    def test_update_map(self, mock_predict, mock_batch_predict):
         """Tests update map method"""
         # add objects to list 
         num_objects = 2
@@ -143,6 +159,12 @@ class MapTests(unittest.TestCase):
         
         # check if predict was called for all objects in object_list
         self.assertEqual(mock_predict.call_count, num_objects)
+        mock_predict.assert_called_with(filtered=True)
+
+        # check that kalman filters were predicted in one batch
+        mock_batch_predict.assert_called_once_with()
+        for obj in self.map.object_list:
+            self.assertIs(self.map.batch_kalman, obj.kalman.batch)
 
     def test_smooth_frame(self):
         """Tests smooth frame method"""
@@ -164,11 +186,12 @@ class MapTests(unittest.TestCase):
         truth_update_vals = [(12, -21), (44, 80), None]
         truth_dets_used = [1, 1, 0]
 
-        with patch('src.tracking.map.joint_pdaf') as mock_pdaf, \
+        with patch('src.tracking.map.batch_joint_pdaf') as mock_pdaf, \
              patch('src.tracking.map.Object.update') as mock_update, \
-             patch('src.tracking.map.Map._generate_obj_gate', return_value = 0), \
+             patch('src.tracking.map.BatchKalmanFilter.update') as mock_batch_update, \
              patch('src.tracking.map.Object.__init__', return_value = None) as mock_obj_init, \
              patch('src.tracking.map.Map._return_full_objects', return_value = self.map.object_list), \
+             patch('src.tracking.map.Map._publish_snapshot') as mock_publish, \
              patch('src.tracking.map.time_in_millis', return_value = 1):
 
             # set mock joint pdaf return value
@@ -177,15 +200,23 @@ class MapTests(unittest.TestCase):
             # call smooth_frame
             self.map.smooth_frame(epoch_frame, [0, 0])
 
-            # check that first two objects are correctly updated
-            for update_vals in filter(None, truth_update_vals):
-                mock_update.assert_any_call(*update_vals)
+            # check that first two objects are correctly updated (in one batched kalman update)
+            self.assertEqual(1, mock_batch_update.call_count)
+            slots, measurements = mock_batch_update.call_args[0]
+            self.assertEqual([obj.kalman.slot for obj in self.map.object_list[0:2]], list(slots))
+            for update_vals, measurement in zip(filter(None, truth_update_vals), measurements):
+                self.assertEqual(update_vals, tuple(measurement[0:2]))
+                mock_update.assert_any_call(*update_vals, filtered=True)
+            mock_update.assert_any_call(None, None)
 
             # check that new object is created for final detection
             new_obj_idx = 2
             self.assertEqual((epoch_frame[new_obj_idx][1], epoch_frame[new_obj_idx][0], 1), mock_obj_init.call_args[0])
             self.assertEqual({'objectType': epoch_frame[new_obj_idx][2]}, mock_obj_init.call_args[1])
 
+            # check that snapshot is published once for frame
+            mock_publish.assert_called_once_with()
+
     def test_prune_objects(self):
         """Tests prune objects method"""
         # create objects to add to map
@@ -215,32 +246,6 @@ class MapTests(unittest.TestCase):
         # ensure that only the first two objects remain in the object list
         self.assertEqual(truth_obj_list, self.map.object_list)
 
-    def test_generate_obj_gate(self):
-        """Tests generate obj gate method"""
-        # generate test object parameters 
-        num_objects = 3
-        rng_list, bearing_list, obj_type_list = [5, 12, 40], [45, 0, -20], [ObjectType.BOAT, ObjectType.NONE, ObjectType.BUOY]
-        obj_list = [0] * num_objects
-
-        # initialize truthed gates
-        truth_rng_gates = [0] * num_objects
-        truth_bearing_gates = [0] * num_objects
-        truth_type_gates = [0] * num_objects
-
-        # create objects and set up truth gates
-        for ii in range(num_objects):
-            obj_list[ii] = Object(bearing_list[ii], rng_list[ii], time_in_millis(), objectType=obj_type_list[ii])
-            obj_list[ii].kalman.covar = np.eye(4)
-            truth_rng_gates[ii] = (rng_list[ii] - 1, rng_list[ii] + 1)
-            truth_bearing_gates[ii] = (bearing_list[ii] - 1, bearing_list[ii] + 1)
-            truth_type_gates[ii] = (ObjectType.NONE, obj_type_list[ii])
-
-        # compare truth gates to generated gates
-        truth_gates = [*zip(truth_rng_gates, truth_bearing_gates, truth_type_gates)]
-        for jj, obj in enumerate(obj_list):
-            gate = self.map._generate_obj_gate(obj)
-            self.assertEqual(truth_gates[jj], gate)
-
     def test_get_buoys(self):
         """Tests get buoys method"""
         # create objects to add to map
@@ -271,6 +276,51 @@ class MapTests(unittest.TestCase):
             self.assertAlmostEqual(obj[1], returned_objects[jj][1])
             self.assertEqual(obj[2], returned_objects[jj][2])
 
+    def test_snapshot(self):
+        """Tests that readers use published snapshot without waiting on writers"""
+        obj = Object(10, 20, time_in_millis(), objectType = ObjectType.BUOY)
+        self.map.object_list.append(obj)
+
+        # snapshot is republished when object list is changed directly
+        self.assertEqual([(20, 10, ObjectType.BUOY)], [record[0:3] for record in self.map.return_objects()])
+
+        # readers return last snapshot while a writer holds lock
+        self.map.lock.acquire()
+        self.map.object_list.append(Object(-10, 15, time_in_millis(), objectType = ObjectType.BUOY))
+        self.assertEqual(1, len(self.map.return_objects()))
+        self.assertEqual(1, len(self.map.get_buoys()))
+        self.map.lock.release()
+
+        self.assertEqual(2, len(self.map.get_buoys()))
+
+        # snapshot is not changed by later writes
+        snapshot = self.map.snapshot
+        self.map.clear_objects(timeSinceLastSeen=-1)
+        self.assertEqual(2, len(snapshot.records))
+        self.assertEqual([], self.map.return_objects())
+
+    def test_snapshot_published_on_change(self):
+        """Tests that a snapshot is published once per update cycle, and only when the map changed"""
+        self.map.object_list.append(Object(10, 20, time_in_millis(), objectType = ObjectType.BUOY))
+
+        with patch('src.tracking.map.MapSnapshot.publish', wraps=MapSnapshot.publish) as mock_publish:
+            # update cycle of run
+            self.map.update_map(publish=False)
+            self.map.prune_objects()
+            self.assertEqual(1, mock_publish.call_count)
+
+            # nothing changed since
+            snapshot = self.map.snapshot
+            self.map.prune_objects()
+            self.map.clear_objects(timeSinceLastSeen=10000)
+            self.assertEqual(1, mock_publish.call_count)
+            self.assertIs(snapshot, self.map.snapshot)
+
+            # predicted tracks are published
+            self.map.update_map()
+            self.assertEqual(2, mock_publish.call_count)
+            self.assertEqual(1, len(self.map.snapshot.records))
+
     def test_enable_update(self):
         """Tests enable update method"""
         self.map.enable_update()
@@ -323,5 +373,8 @@ class MapTests(unittest.TestCase):
         self.assertEqual(True, mock_update.called)
         self.assertEqual(True, mock_prune_objects.called)
 
+        # ensure that snapshot is published once per cycle (by prune)
+        mock_update.assert_called_with(publish=False)
+
         # ensure that sleep was called
         self.assertEqual(True, mock_sleep.called)
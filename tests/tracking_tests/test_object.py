@@ -102,8 +102,8 @@ class ObjectTests(unittest.TestCase):
         mock_kalman_update.assert_called_with([rng, bearing], [rngRate, bearingRate])
 
         mock_set_obj_state.assert_called_once_with()
-        mock_find_rngRate.assert_called_once_with()
-        mock_find_bearingRate.assert_called_once_with()
+        mock_find_rngRate.assert_called_once_with(time_in_millis_val)
+        mock_find_bearingRate.assert_called_once_with(time_in_millis_val)
 
         self.assertEqual(time_in_millis_val, self.object.lastSeen)
         
@@ -137,8 +137,8 @@ class ObjectTests(unittest.TestCase):
         mock_kalman_update.assert_called_with([rng, bearing], [rngRate, bearingRate])
 
         mock_set_obj_state.assert_called_once_with()
-        mock_find_rngRate.assert_called_once_with()
-        mock_find_bearingRate.assert_called_once_with()
+        mock_find_rngRate.assert_called_once_with(time_in_millis_val)
+        mock_find_bearingRate.assert_called_once_with(time_in_millis_val)
 
         self.assertEqual(time_in_millis_val, self.object.lastSeen)
 
@@ -207,6 +207,32 @@ class ObjectTests(unittest.TestCase):
             # check for correct behavior
             self.assertAlmostEqual(truth_hist_score, self.object.histScore)
 
+    @patch('src.tracking.object.Object._set_object_state')
+    @patch('src.tracking.object.KalmanFilter.update')
+    def test_update_hist(self, mock_kalman_update, mock_set_obj_state):
+        """Tests that update history ring matches list rotation over many updates"""
+        # arbitrary pattern of updates (longer than history)
+        updates = [1, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0, 1]
+
+        truth_hist = [None] * self.object.histLength
+        for ii, updated in enumerate(updates):
+            self.object.lastSeen = -1000        # keep rate calculations away from divide by zero
+            self.object.update(*((ii, ii) if updated else (None, None)))
+
+            truth_hist = [updated] + truth_hist[0:-1]
+            self.assertEqual(truth_hist, self.object.updateHist)
+
+            # score from running counts matches score from list
+            self.object._calc_hist_score()
+            num_nones = sum(el is None for el in truth_hist)
+            truth_hist_score = (sum(filter(None, truth_hist)) + (0.5 * num_nones)) / self.object.histLength
+            self.assertAlmostEqual(truth_hist_score, self.object.histScore)
+
+    def test_slots(self):
+        """Tests that objects and kalman filters have no per-instance dict"""
+        self.assertFalse(hasattr(self.object, '__dict__'))
+        self.assertFalse(hasattr(self.object.kalman, '__dict__'))
+
     @patch('src.tracking.object.np.sum')
     def test_calc_confidence(self, mock_sum):
         """Tests calc confidence method"""
@@ -4,7 +4,7 @@ try:
 except ImportError:
     from mock import patch, MagicMock
 
-from src.tracking.pdaf import joint_pdaf, pdaf, gate_detections, mahalanobis, normalize_distances
+from src.tracking.pdaf import joint_pdaf, pdaf, gate_detections, mahalanobis, normalize_distances, batch_joint_pdaf
 from src.tracking.classification_types import ObjectType
 
 import numpy as np
@@ -177,3 +177,93 @@ class PDAFTests(unittest.TestCase):
                     self.assertAlmostEqual(truth_val, val)
 
             self.assertEqual(truth_dets_used, dets_used)
+
+    def _make_batch_test_objects(self, num_objects, num_detects, seed=0):
+        """Creates random objects (with kalman covariances) and detections for batch joint pdaf tests"""
+        rand = np.random.RandomState(seed)
+        types = [ObjectType.NONE, ObjectType.BUOY, ObjectType.BOAT]
+
+        obj_list = [0] * num_objects
+        for ii in range(num_objects):
+            covar = np.diag(np.append(rand.uniform(1, 10, 2), rand.uniform(1, 3, 2)))
+            kalman = MagicMock(covar=covar, measurement_covar=np.eye(4), batch=None)
+            obj_list[ii] = MagicMock(rng=rand.uniform(0, 100), bearing=rand.uniform(-180, 180),
+                                     objectType=types[rand.randint(0, 3)], kalman=kalman)
+
+        epoch_frame = [(rand.uniform(0, 100), rand.uniform(-180, 180), types[rand.randint(0, 3)])
+                       for _ in range(num_detects)]
+
+        # put detections near some objects so that gates are hit
+        for ii, obj in enumerate(obj_list[0:num_detects // 2]):
+            epoch_frame[ii] = (obj.rng + rand.uniform(-1, 1), obj.bearing + rand.uniform(-1, 1), obj.objectType)
+
+        return obj_list, epoch_frame
+
+    def test_batch_joint_pdaf(self):
+        """Tests batch joint pdaf method against a per track - detection pair calculation"""
+        obj_list, epoch_frame = self._make_batch_test_objects(25, 100)
+
+        # calculate truth using per pair gating and likelihood weights
+        weights = np.zeros((len(obj_list), len(epoch_frame)))
+        truth_dets_used = [0] * len(epoch_frame)
+        for ii, obj in enumerate(obj_list):
+            covar = obj.kalman.covar
+            gate = ((obj.rng - covar[0, 0], obj.rng + covar[0, 0]),
+                    (obj.bearing - covar[1, 1], obj.bearing + covar[1, 1]),
+                    (ObjectType.NONE, obj.objectType))
+            gated_frame, dets_used = gate_detections(gate, epoch_frame)
+            truth_dets_used = [sum(uses) for uses in zip(truth_dets_used, dets_used)]
+
+            innov_covar_inv = np.linalg.inv(covar[0:2, 0:2] + np.eye(2))
+            for jj, det in enumerate(gated_frame):
+                if det != 0:
+                    resid = np.array([det[0] - obj.rng, (det[1] - obj.bearing + 180) % 360 - 180])
+                    weights[ii, jj] = np.exp(-0.5 * resid.dot(innov_covar_inv).dot(resid))
+
+        weights = np.where(weights < np.amax(weights, 0), 0, weights)
+
+        # call batch joint pdaf
+        update_list, dets_used = batch_joint_pdaf(obj_list, epoch_frame)
+
+        # check for correct behavior
+        self.assertEqual(truth_dets_used, dets_used)
+        self.assertTrue(any(update is not None for update in update_list))
+        for ii, update in enumerate(update_list):
+            if np.sum(weights[ii]) == 0:
+                self.assertIsNone(update)
+            else:
+                norm_weights = weights[ii] / np.sum(weights[ii])
+                self.assertAlmostEqual(sum(det[0] * w for det, w in zip(epoch_frame, norm_weights)), update[0])
+                self.assertAlmostEqual(sum(det[1] * w for det, w in zip(epoch_frame, norm_weights)), update[1])
+
+    def test_batch_joint_pdaf_shared_detection(self):
+        """Tests that batch joint pdaf gives detections shared by objects to closest object"""
+        kalman = MagicMock(covar=np.eye(4) * 10, measurement_covar=np.eye(4), batch=None)
+        obj_list = [MagicMock(rng=10, bearing=0, objectType=ObjectType.BUOY, kalman=kalman),
+                    MagicMock(rng=14, bearing=0, objectType=ObjectType.BUOY, kalman=kalman)]
+        epoch_frame = [(11, 0, ObjectType.BUOY), (30, 30, ObjectType.NONE)]
+
+        # call batch joint pdaf
+        update_list, dets_used = batch_joint_pdaf(obj_list, epoch_frame)
+
+        # check for correct behavior
+        self.assertEqual([2, 0], dets_used)
+        self.assertAlmostEqual(11, update_list[0][0])
+        self.assertAlmostEqual(0, update_list[0][1])
+        self.assertIsNone(update_list[1])
+
+        # check detection far into a wide gate still updates object (likelihood underflows to 0)
+        kalman = MagicMock(covar=np.eye(4) * 3000, measurement_covar=np.eye(4), batch=None)
+        obj = MagicMock(rng=10, bearing=0, objectType=ObjectType.BUOY, kalman=kalman)
+        update_list, dets_used = batch_joint_pdaf([obj], [(2910, 0, ObjectType.BUOY)])
+        self.assertEqual([1], dets_used)
+        self.assertAlmostEqual(2910, update_list[0][0])
+
+        # check gated detection with weight underflowing next to object's best detection is still used
+        update_list, dets_used = batch_joint_pdaf([obj], [(11, 0, ObjectType.BUOY), (2910, 0, ObjectType.BUOY)])
+        self.assertEqual([1, 1], dets_used)
+        self.assertAlmostEqual(11, update_list[0][0])
+
+        # check empty object list and epoch frame
+        self.assertEqual(([], [0, 0]), batch_joint_pdaf([], epoch_frame))
+        self.assertEqual(([None, None], []), batch_joint_pdaf(obj_list, []))
@@ -0,0 +1,113 @@
+import unittest
+try:
+    from unittest.mock import patch, MagicMock
+except ImportError:
+    from mock import patch, MagicMock
+
+from src.tracking.polar_index import PolarIndex, IndexedList
+from src.tracking.classification_types import ObjectType
+
+class PolarIndexTests(unittest.TestCase):
+    """Tests the methods in PolarIndex"""
+    def setUp(self):
+        """Sets up the objects needed for testing"""
+        self.index = PolarIndex(rng_bin=10., bearing_bin=10.)
+
+    def _make_obj(self, rng, bearing, obj_type=ObjectType.NONE):
+        """Creates mock object with given range, bearing, and type"""
+        obj = MagicMock()
+        obj.rng, obj.bearing, obj.objectType = rng, bearing, obj_type
+        return obj
+
+    def test_query(self):
+        """Tests query method of polar index"""
+        objs = [self._make_obj(5, 0), self._make_obj(25, 15), self._make_obj(45, -40),
+                self._make_obj(15, 29.9), self._make_obj(60, 170)]
+        for obj in objs:
+            self.index.insert(obj)
+
+        # window covering some objects
+        self.assertEqual([objs[0], objs[1], objs[3]], self.index.query([0, 30], [-30, 30]))
+
+        # window covering every object
+        inf = float('inf')
+        self.assertEqual(objs, self.index.query([-inf, inf], [-180, 180]))
+
+        # max objs
+        self.assertEqual(objs[0:2], self.index.query([0, 100], [-180, 180], max_objs=2))
+
+        # empty window
+        self.assertEqual([], self.index.query([30, 0], [-30, 30]))
+
+    def test_move(self):
+        """Tests move method of polar index"""
+        obj = self._make_obj(5, 0)
+        self.index.insert(obj)
+        self.assertEqual([obj], self.index.query([0, 10], [-10, 10]))
+
+        # change range and bearing of object
+        obj.rng, obj.bearing = 55, -95
+        self.index.move(obj)
+        self.assertEqual([], self.index.query([0, 10], [-10, 10]))
+        self.assertEqual([obj], self.index.query([50, 60], [-100, -90]))
+
+        # change type of object
+        obj.objectType = ObjectType.BUOY
+        self.index.move(obj)
+        self.assertEqual([], self.index.of_type(ObjectType.NONE))
+        self.assertEqual([obj], self.index.of_type(ObjectType.BUOY))
+
+    def test_of_type(self):
+        """Tests of_type method of polar index"""
+        buoys = [self._make_obj(ii, ii, ObjectType.BUOY) for ii in range(15)]
+        boat = self._make_obj(5, 5, ObjectType.BOAT)
+        for obj in buoys + [boat]:
+            self.index.insert(obj)
+
+        self.assertEqual(buoys[0:10], self.index.of_type(ObjectType.BUOY, max_objs=10))
+        self.assertEqual([boat], self.index.of_type(ObjectType.BOAT))
+        self.assertEqual([], self.index.of_type(ObjectType.NONE))
+
+    def test_remove(self):
+        """Tests remove and clear methods of polar index"""
+        objs = [self._make_obj(5, 0), self._make_obj(25, 15)]
+        for obj in objs:
+            self.index.insert(obj)
+        self.index.query([0, 10], [-10, 10])        # bucket first object
+
+        # remove both bucketed and pending objects
+        self.index.remove(objs[0])
+        self.index.remove(objs[1])
+        self.assertEqual(0, len(self.index))
+        self.assertEqual({}, self.index.buckets)
+
+        # clear
+        self.index.insert(objs[0])
+        self.index.clear()
+        self.assertEqual(0, len(self.index))
+
+    def test_indexed_list(self):
+        """Tests that indexed list keeps polar index in sync"""
+        objs = [self._make_obj(5 * ii, 0) for ii in range(6)]
+        indexed_list = IndexedList(self.index, objs[0:2])
+        self.assertEqual(2, len(self.index))
+
+        indexed_list.append(objs[2])
+        indexed_list.extend(objs[3:5])
+        indexed_list += [objs[5]]
+        self.assertEqual(6, len(self.index))
+
+        del indexed_list[0]
+        indexed_list.remove(objs[1])
+        indexed_list.pop()
+        self.assertEqual(objs[2:5], self.index.query([0, 100], [-10, 10]))
+
+        indexed_list[0] = objs[0]
+        self.assertNotIn(objs[2], self.index)
+        self.assertIn(objs[0], self.index)
+
+        indexed_list[:] = [objs[0]]
+        self.assertEqual([objs[0]], self.index.query([0, 100], [-10, 10]))
+
+        indexed_list.clear()
+        self.assertEqual(0, len(self.index))
@@ -0,0 +1,88 @@
+import os
+import unittest
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+from src.utils.async_runtime import AsyncRuntime
+
+class AsyncRuntimeTests(unittest.TestCase):
+    """Tests the methods in async runtime"""
+    def setUp(self):
+        """Creates runtime to test"""
+        self.runtime = AsyncRuntime()
+        self.runtime.loop.call_later(5, self.runtime.loop.stop)     # never hang test
+
+    def tearDown(self):
+        """Closes runtime loop"""
+        if not self.runtime.loop.is_closed():
+            self.runtime.loop.close()
+
+    def _stop_after(self, runs, name):
+        """Returns callback that stops runtime after it has run runs times"""
+        def callback():
+            if self.runtime.stats[name]['runs'] >= runs:
+                self.runtime._shutdown()
+        return callback
+
+    def test_every(self):
+        """Tests that periodic tasks run on fixed deadlines"""
+        times = []
+        def tick():
+            times.append(self.runtime.loop.time())
+            if len(times) == 5:
+                self.runtime._shutdown()
+
+        interval = MagicMock(name='interval', return_value=0.01)
+        self.runtime.every(interval, tick, name="tick")
+        self.runtime.run()
+
+        self.assertEqual(5, len(times))
+        self.assertEqual(5, self.runtime.stats["tick"]['runs'])
+        self.assertEqual(5, interval.call_count)
+        self.assertAlmostEqual(0.04, times[-1] - times[0], delta=0.03)
+
+    def test_errors(self):
+        """Tests that a failing task keeps running and counts errors"""
+        self.runtime.every(0, MagicMock(side_effect=ValueError("bad read")), name="fail")
+        self.runtime.every(0, lambda: None, name="fail")
+        self.runtime.every(0, self._stop_after(3, "fail 2"), name="stop")
+        self.runtime.run()
+
+        self.assertGreaterEqual(self.runtime.stats["fail"]['errors'], 2)
+        self.assertEqual(0, self.runtime.stats["fail 2"]['errors'])
+
+    def test_watch_port(self):
+        """Tests that ports with a file descriptor are read when data is waiting"""
+        read_fd, write_fd = os.pipe()
+        port = MagicMock(name='port')
+        port.fileno.return_value = read_fd
+        read = []
+        def on_readable():
+            read.append(os.read(read_fd, 1024))
+            self.runtime._shutdown()
+
+        on_stop = MagicMock(name='on_stop')
+        self.runtime.on_stop(on_stop)
+        self.runtime.watch_port(port, on_readable, 1, name="reader")
+        self.runtime.loop.call_later(0.01, os.write, write_fd, b"$HCHDT,274.1,T*29\r\n")
+        try:
+            self.runtime.run()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        self.assertEqual([b"$HCHDT,274.1,T*29\r\n"], read)
+        self.assertEqual([], self.runtime.readers)
+        on_stop.assert_called_once_with()
+
+    def test_watch_port_poll(self):
+        """Tests that ports without a file descriptor are polled"""
+        port = MagicMock(name='port')
+        port.fileno.side_effect = AttributeError
+        self.runtime.watch_port(port, self._stop_after(2, "poll"), 0.001, name="poll")
+        self.runtime.run()
+
+        self.assertEqual(2, self.runtime.stats["poll"]['runs'])
+        self.assertEqual([], self.runtime.readers)
@@ -0,0 +1,127 @@
+import unittest
+from threading import Thread
+try:
+    from unittest.mock import patch, MagicMock
+except ImportError:
+    from mock import patch, MagicMock
+
+from src.utils.clock import SensorClock, SimulatedClock, SystemClock, get_clock, set_clock, sleep
+from src.utils.time_in_millis import time_in_millis
+from src.tracking.object import Object
+
+import numpy as np
+
+class ClockTests(unittest.TestCase):
+    """Tests the clocks in clock"""
+    def setUp(self):
+        """Sets up the objects needed for testing"""
+        self.clock = SimulatedClock(start=10.)
+        self.prev_clock = set_clock(self.clock)
+
+    def tearDown(self):
+        """Restores clock used by other tests"""
+        set_clock(self.prev_clock)
+
+    def test_simulated_clock(self):
+        """Tests that simulated clock only moves when advanced"""
+        self.assertEqual(10000, time_in_millis())
+        self.assertEqual(10000, time_in_millis())
+
+        self.clock.advance(1.5)
+        self.assertEqual(11500, time_in_millis())
+
+        self.clock.set_time(20)
+        self.assertEqual(20000, time_in_millis())
+
+        # sleeping advances clock without blocking
+        sleep(3600)
+        self.assertEqual(3620000, time_in_millis())
+
+    def test_simulated_clock_sleepers(self):
+        """Tests that threads sleeping on simulated clock each wake after the time they slept"""
+        clock = SimulatedClock(start=0., sleepers=2)
+        wakes = {'a': [], 'b': []}
+
+        def sleeper(name, secs, times):
+            for _ in range(times):
+                clock.sleep(secs)
+                wakes[name].append(clock.time())
+
+        threads = [Thread(target=sleeper, args=('a', 1., 3)), Thread(target=sleeper, args=('b', 1.5, 2))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertEqual([1., 2., 3.], wakes['a'])
+        self.assertEqual([1.5, 3.], wakes['b'])
+        self.assertEqual(3., clock.time())
+
+        # without sleepers, sleeping waits for clock to be advanced
+        clock = SimulatedClock(start=0., sleepers=0)
+        thread = Thread(target=sleeper, args=('a', 2., 1))
+        thread.start()
+        clock.advance(1)
+        thread.join(timeout=0.05)
+        self.assertTrue(thread.is_alive())
+        clock.advance(1)
+        thread.join(timeout=5)
+        self.assertEqual(2., wakes['a'][-1])
+
+    def test_set_clock(self):
+        """Tests set clock and get clock"""
+        self.assertIs(self.clock, get_clock())
+
+        prev_clock = set_clock(None)
+        self.assertIs(self.clock, prev_clock)
+        self.assertIsInstance(get_clock(), SystemClock)
+
+    def test_tracking_uses_clock(self):
+        """Tests that tracking sees time deltas from installed clock"""
+        obj = Object(0, 10)
+        self.assertEqual(10000, obj.lastSeen)
+
+        # one measurement 2s later at 12m (previous range starts at 0, so range rate is 6 m/s)
+        self.clock.advance(2)
+        obj.kalman.state = np.array([12., 0, 0, 0])
+        with patch('src.tracking.object.KalmanFilter.update'):
+            obj.update(12, 0)
+
+        self.assertEqual(12000, obj.lastSeen)
+        self.assertAlmostEqual(1000 * 12 / 2000., obj.rngRate)
+
+        # predict sees simulated delta
+        self.clock.advance(0.5)
+        obj.kalman.last_time_changed = 12000
+        obj.predict()
+        self.assertAlmostEqual(0.5, obj.kalman.delta_t)
+
+    def test_sensor_clock(self):
+        """Tests that sensor clock slews towards reported sensor time without stepping or going backwards"""
+        with patch('src.utils.clock.time.monotonic', return_value=40.), \
+             patch('src.utils.clock.time.time', return_value=991.):
+            clock = SensorClock(slew_rate=0.05)
+        self.assertFalse(clock.synced)
+
+        # sensor time is 1 s behind system time
+        with patch('src.utils.clock.time.monotonic', return_value=50.):
+            self.assertEqual(1001., clock.time())
+            clock.sync(1000.)
+            self.assertTrue(clock.synced)
+            self.assertEqual(1001., clock.time())
+            self.assertAlmostEqual(-1., clock.error)
+
+        # time advances with local clock, slowed by slew rate until it meets sensor time
+        with patch('src.utils.clock.time.monotonic', return_value=52.):
+            self.assertAlmostEqual(1002.9, clock.time())
+        with patch('src.utils.clock.time.monotonic', return_value=80.):
+            self.assertAlmostEqual(1030., clock.time())
+            self.assertAlmostEqual(0., clock.error)
+
+        # a late report never takes time backwards, even slewing faster than time passes
+        clock.slew_rate = 2.
+        with patch('src.utils.clock.time.monotonic', return_value=80.):
+            clock.sync(1020.)
+        with patch('src.utils.clock.time.monotonic', return_value=81.):
+            self.assertEqual(1030., clock.time())
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+try:
+    from unittest.mock import patch, MagicMock
+except ImportError:
+    from mock import patch, MagicMock
+
+from src.utils import config_cache
+from src.utils.config_cache import load_config, reload_config, set_check_interval
+
+class ConfigCacheTests(unittest.TestCase):
+    """Tests the methods in config cache"""
+    def setUp(self):
+        """Creates config file to read"""
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "config.yml")
+        self._write("interval: 0.5\n")
+        self.prev_interval = config_cache._check_interval
+
+    def tearDown(self):
+        """Removes config file and restores check interval"""
+        reload_config(self.path)
+        set_check_interval(self.prev_interval)
+        shutil.rmtree(self.dir)
+
+    def _write(self, text):
+        with open(self.path, "w") as yml:
+            yml.write(text)
+
+    def test_load_config(self):
+        """Tests that config is parsed once and then served from cache"""
+        conf = load_config(self.path)
+        self.assertEqual({'interval': 0.5}, conf)
+
+        with patch('src.utils.config_cache.yaml.full_load') as mock_load:
+            self.assertIs(conf, load_config(self.path))
+            mock_load.assert_not_called()
+
+    def test_invalidation(self):
+        """Tests that changed files are parsed again once check interval has passed"""
+        set_check_interval(3600)
+        load_config(self.path)
+
+        # change is not seen within check interval
+        self._write("interval: 0.25\nextra: 1\n")
+        self.assertEqual({'interval': 0.5}, load_config(self.path))
+
+        # change is seen when checking every read
+        set_check_interval(0)
+        self.assertEqual({'interval': 0.25, 'extra': 1}, load_config(self.path))
+
+    def test_reload_config(self):
+        """Tests that reload config drops cached config"""
+        set_check_interval(3600)
+        conf = load_config(self.path)
+
+        self._write("interval: 2\n")
+        reload_config(self.path)
+        self.assertEqual({'interval': 2}, load_config(self.path))
+
+        reload_config()
+        self.assertIsNot(conf, load_config(self.path))
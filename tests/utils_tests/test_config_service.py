@@ -0,0 +1,82 @@
+import unittest
+try:
+    from unittest.mock import patch, MagicMock
+except ImportError:
+    from mock import patch, MagicMock
+
+from pubsub import pub
+
+from src.utils.config_service import ConfigService, parse_expression, parse_config_value
+
+class ParseExpressionTests(unittest.TestCase):
+    """Tests the config expression parser"""
+    def test_parse_expression(self):
+        """Tests that arithmetic expressions are evaluated"""
+        self.assertEqual(0.05, parse_expression("50 / 1000"))
+        self.assertEqual(-0.5, parse_expression("-0.5"))
+        self.assertEqual(14, parse_expression("2 * (3 + 4)"))
+        self.assertEqual(1024, parse_expression("2 ** 10"))
+        self.assertEqual(3, parse_expression(3))
+
+    def test_reject_expression(self):
+        """Tests that anything other than arithmetic is rejected"""
+        bad_exprs = ["__import__('os').system('ls')", "open('config.yml')", "x + 1", "'text'", "[1, 2]",
+                     "1 if 1 else 2", "2 ** 1000000", "1 / 0", "50 /", None, True]
+        for expr in bad_exprs:
+            with self.assertRaises(ValueError):
+                parse_expression(expr)
+
+    def test_parse_config_value(self):
+        """Tests that parsed values are checked against type"""
+        self.assertIsInstance(parse_config_value("5"), float)
+        self.assertEqual(5, parse_config_value("10 / 2", int))
+        with self.assertRaises(ValueError):
+            parse_config_value("5 / 2", int)
+
+
+class ConfigServiceTests(unittest.TestCase):
+    """Tests the methods in ConfigService"""
+    def setUp(self):
+        """Sets up the objects needed for testing"""
+        self.service = ConfigService(poll_interval=0)
+        self.changes = []
+        pub.subscribe(self.on_config_changed, "config changed")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_config_changed, "config changed")
+
+    def on_config_changed(self, module, key, value):
+        self.changes.append((module, key, value))
+
+    def test_poll(self):
+        """Tests that only changed values are published"""
+        gain_reader = MagicMock(side_effect=[-0.5, -0.5, -1.5])
+        interval_reader = MagicMock(side_effect=[0.25, 0.5, 0.5])
+
+        self.assertEqual(-0.5, self.service.watch("autopilot", "rudder gain", gain_reader))
+        self.service.watch("autopilot", "autohelm interval", interval_reader)
+
+        self.assertEqual([("autopilot", "autohelm interval", 0.5)], self.service.poll())
+        self.assertEqual([("autopilot", "rudder gain", -1.5)], self.service.poll())
+        self.assertEqual([("autopilot", "autohelm interval", 0.5), ("autopilot", "rudder gain", -1.5)],
+                         self.changes)
+        self.assertEqual(-1.5, self.service.get("autopilot", "rudder gain"))
+
+    def test_invalid_value(self):
+        """Tests that invalid values keep the old value"""
+        reader = MagicMock(side_effect=[0.25, ValueError("bad value"), 0.3])
+        self.service.watch("nav", "nav interval", reader)
+
+        with patch('builtins.print'):
+            self.assertEqual([], self.service.poll())
+        self.assertEqual(0.25, self.service.get("nav", "nav interval"))
+
+        self.assertEqual([("nav", "nav interval", 0.3)], self.service.poll())
+
+    @patch('src.utils.config_service.reload_config')
+    def test_reload(self, mock_reload_config):
+        """Tests that reload drops cached config and polls"""
+        self.service.watch("nav", "nav interval", MagicMock(side_effect=[5, 6]))
+
+        self.assertEqual([("nav", "nav interval", 6)], self.service.reload())
+        mock_reload_config.assert_called_once_with()
@@ -0,0 +1,14 @@
+import math
+import unittest
+
+from src.utils.vec import Vec2
+
+class VecTests(unittest.TestCase):
+    """Tests the methods in vec"""
+    def test_angle(self):
+        """Tests that angle is correct in every quadrant and on axes"""
+        for degrees in [0, 45, 90, 135, 180, -135, -90, -45]:
+            vec = Vec2.build_from(magnitude=2, angle=math.radians(degrees))
+            self.assertAlmostEqual(math.radians(degrees), vec.angle())
+
+        self.assertEqual(0, Vec2(0, 0).angle())
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from src.world.true_wind import solve_true_wind, TrueWindSolver
+
+
+class TrueWindTests(unittest.TestCase):
+    """Tests the methods in true_wind"""
+
+    def test_solve_true_wind(self):
+        """Tests true wind for single samples"""
+        test_inputs = [
+            (10, 45, 0, 0, 0),          # boat stopped, true wind is apparent wind
+            (5, 0, 5, 0, 0),            # motoring north in no wind
+            (10, 0, 5, 0, 0),           # motoring into a 5 m/s headwind
+            (5 * 2 ** 0.5, 45, 5, 90, 90),  # heading east, wind from the south
+            (10, 350, 0, 30, 30)        # angles wrap around north
+        ]
+        expected_outputs = [(10, 45, 45), (0, None, None), (5, 0, 0), (5, 90, 180), (10, 350, 20)]
+
+        for test_input, expected_output in zip(test_inputs, expected_outputs):
+            speed, angle, direction = solve_true_wind(*test_input)
+            self.assertAlmostEqual(expected_output[0], speed)
+            if expected_output[1] is not None:
+                self.assertAlmostEqual(expected_output[1], angle)
+                self.assertAlmostEqual(expected_output[2], direction)
+
+    def test_vectorized(self):
+        """Tests arrays of samples are solved element-wise"""
+        speed, angle, direction = solve_true_wind(np.array([10, 10]), np.array([45, 0]), np.array([0, 5]),
+                                                  np.array([0, 0]), np.array([0, 0]))
+        np.testing.assert_allclose([10, 5], speed)
+        np.testing.assert_allclose([45, 0], angle)
+
+    def test_solver(self):
+        """Tests samples are solved once, on read"""
+        solved = []
+        solver = TrueWindSolver(size=3, on_solved=solved.append)
+        self.assertIsNone(solver.latest)
+
+        solver.add(0, 10, 45, 0, 0, 0)
+        solver.add(1, 10, 0, 5, 0, 0)
+        self.assertEqual([], solved)
+
+        self.assertEqual(1, solver.latest[0])
+        self.assertAlmostEqual(5, solver.latest[1])
+        self.assertEqual(1, len(solved))
+        self.assertEqual(2, len(solved[0]))
+
+        # full buffer is solved without a read
+        for t in range(2, 5):
+            solver.add(t, 10, 45, 0, 0, 0)
+        self.assertEqual(2, len(solved))
+        self.assertEqual(0, len(solver.pending))
+
+
+if __name__ == "__main__":
+    unittest.main()
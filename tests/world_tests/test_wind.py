@@ -37,6 +37,70 @@ class WindTests(unittest.TestCase):
             w.true_wind_angle = test_input[2]
             self.assertAlmostEqual(scaled_output, w.distance_upwind(a, b))
 
+    def test_history(self):
+        """Tests that each true wind reading adds one direction sample to the history"""
+        w = Wind(history={"size": 10, "windows": (60,)})
+
+        # readings are not added until heading is known
+        w.update_true_wind((8, 90))
+        self.assertEqual(0, len(w.history))
+        self.assertEqual((8, 90), (w.true_wind_speed, w.true_wind_angle))
+
+        w.update_course(0)
+        w.update_true_wind((10, 90))
+        w.update_true_wind_speed(12)
+        w.update_true_wind_angle(80)
+        w.update_apparent_wind_angle(45)
+        w.update_true_wind((12, 80))
+
+        # turning the boat changes the wind angle, not its direction
+        w.update_heading(90)
+        w.update_true_wind((12, 0))
+
+        self.assertEqual([(10, 90), (12, 80), (12, 90)], [sample[1:] for sample in w.history.latest()])
+        self.assertAlmostEqual(34 / 3., w.history.stats(60)["mean_speed"])
+        self.assertEqual((12, 0), (w.true_wind_speed, w.true_wind_angle))
+        self.assertEqual(90, w.true_wind_direction)
+
+    def test_solve_true_wind(self):
+        """Tests that true wind is solved from apparent wind and boat velocity"""
+        w = Wind(history={"size": 10, "windows": (60,)}, solve_true_wind=True)
+        w.update_boat_speed(18)     # 5 m/s
+        w.update_course(90)
+        w.update_apparent_wind((5 * math.sqrt(2), 45))
+
+        # course is used as heading until a compass heading is read
+        self.assertAlmostEqual(5, w.true_wind_speed)
+        self.assertAlmostEqual(90, w.true_wind_angle)
+        self.assertAlmostEqual(180, w.true_wind_direction)
+        self.assertEqual(0, len(w.solver.pending))
+        self.assertAlmostEqual(180, w.history.latest()[-1][2])
+
+        # same wind seen from a bow turned 10 degrees to starboard
+        w.update_heading(100)
+        w.update_apparent_wind((5 * math.sqrt(2), 35))
+        self.assertAlmostEqual(80, w.true_wind_angle)
+        self.assertAlmostEqual(180, w.true_wind_direction)
+
+    def test_solve_one_sample_per_reading(self):
+        """Tests that each apparent wind reading is solved into one true wind sample"""
+        w = Wind(history={"size": 10, "windows": (60,)}, solve_true_wind=True)
+        w.update_boat_speed(18)
+        w.update_course(90)
+        w.update_apparent_wind_speed(4)
+        w.update_apparent_wind_angle(30)
+        self.assertEqual(0, len(w.solver.pending))
+
+        w.update_apparent_wind((5 * math.sqrt(2), 45))
+        w.update_apparent_wind((5 * math.sqrt(2), 45))
+        w.solve()
+
+        self.assertEqual(2, len(w.solver.solved))
+        self.assertEqual(2, len(w.history))
+        for _, speed, direction in w.history.latest():
+            self.assertAlmostEqual(5, speed)
+            self.assertAlmostEqual(180, direction)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import math
+import unittest
+
+from src.world.wind_history import WindHistory
+
+
+class WindHistoryTests(unittest.TestCase):
+    """Tests the methods in WindHistory"""
+
+    def test_stats(self):
+        """Tests rolling mean, min and max over a window"""
+        history = WindHistory(size=100, windows=(10,))
+        for t, speed, angle in [(0, 5, 350), (4, 9, 10), (8, 6, 0), (12, 4, 30)]:
+            history.add(t, speed, angle)
+
+        # first sample has left the window
+        stats = history.stats(10)
+        self.assertEqual(3, stats["samples"])
+        self.assertAlmostEqual(19 / 3., stats["mean_speed"])
+        self.assertEqual(9, stats["max_speed"])
+        self.assertEqual(4, stats["min_speed"])
+        self.assertGreater(stats["circular_variance"], 0)
+        self.assertAlmostEqual(30 - stats["mean_angle"], history.shift(10))
+
+        history.add(15, 4, 30)
+        self.assertEqual(6, history.stats(10)["max_speed"])
+
+    def test_wrap_around(self):
+        """Tests angles either side of north average to north"""
+        history = WindHistory(size=10, windows=(60,))
+        history.add(0, 10, 355)
+        history.add(1, 10, 5)
+        mean_angle = history.stats(60)["mean_angle"]
+        self.assertAlmostEqual(0, (mean_angle + 180) % 360 - 180)
+
+    def test_ring_buffer(self):
+        """Tests overwritten samples leave every window"""
+        history = WindHistory(size=4, windows=(5, 100))
+        for t in range(10):
+            history.add(t, t, 90)
+
+        self.assertEqual(4, len(history))
+        self.assertEqual([(6, 6, 90), (7, 7, 90), (8, 8, 90), (9, 9, 90)], history.latest())
+        self.assertEqual([(9, 9, 90)], history.latest(1))
+        self.assertEqual(4, history.stats(100)["samples"])
+        self.assertEqual(6, history.stats(100)["min_speed"])
+        self.assertEqual(4, history.stats(5)["samples"])
+        self.assertAlmostEqual(7.5, history.stats(100)["mean_speed"])
+        self.assertAlmostEqual(90, history.stats(100)["mean_angle"])
+        self.assertAlmostEqual(0, history.stats(100)["circular_variance"])
+
+        # windows only hold samples still in the buffer
+        history = WindHistory(size=3, windows=(600,))
+        for t, (speed, angle) in enumerate([(1, 0), (2, 0), (3, 90), (10, 90)]):
+            history.add(t, speed, angle)
+        stats = history.stats(600)
+        self.assertAlmostEqual(5, stats["mean_speed"])
+        self.assertAlmostEqual(90 - math.degrees(math.atan2(1, 2)), stats["mean_angle"])
+        self.assertAlmostEqual(1 - math.sqrt(5) / 3, stats["circular_variance"])
+        self.assertEqual(2, stats["min_speed"])
+        self.assertEqual(10, stats["max_speed"])
+
+    def test_shift_period(self):
+        """Tests shift period of an oscillating wind"""
+        history = WindHistory(size=1000, windows=(600,))
+        for t in range(600):
+            history.add(t, 10, 180 + 10 * math.sin(2 * math.pi * t / 120.))
+
+        stats = history.stats(600)
+        self.assertAlmostEqual(120, stats["shift_period"], delta=5)
+        self.assertAlmostEqual(180, stats["mean_angle"], delta=1)
+
+        # steady wind never crosses its mean
+        history = WindHistory(size=100, windows=(60,))
+        for t in range(60):
+            history.add(t, 10, 180)
+        self.assertIsNone(history.stats(60)["shift_period"])
+        self.assertAlmostEqual(0, history.shift(60))
+
+    def test_empty(self):
+        """Tests an empty history has no statistics"""
+        history = WindHistory(windows=(30,))
+        self.assertIsNone(history.stats(30))
+        self.assertIsNone(history.shift(30))
+        self.assertEqual([], history.latest())
+
+
+if __name__ == "__main__":
+    unittest.main()